@@ -1,10 +1,12 @@
+import random
+
+import numpy as np
 import torch
 import torch.nn as nn
-from pathlib import Path
-import random
+from names import first_names, last_names
 
 class UnoAgent(nn.Module):
-    def __init__(self, agent_id: str, parent_id: str | None, input_size=1347, hidden_size=64, output_size=61):
+    def __init__(self, agent_id: str, parent_id: str | None, input_size=1347, hidden_size=64, output_size=61, seed: int | None = None):
         super().__init__()
         self.net = nn.Sequential(
             nn.Linear(input_size, hidden_size),
@@ -18,47 +20,85 @@ class UnoAgent(nn.Module):
         self.games_played = 0
         self.wins = 0
 
+        # Initialization seed of a root agent, mutation seed of a child: with the parent
+        # chain this is enough to rebuild the weights (see game_records.py)
+        self.seed = seed
+        if seed is not None:
+            self.reset_parameters(seed)
+
+    def reset_parameters(self, seed: int):
+        """ The default initialization, drawn from `seed` instead of torch's global generator """
+        with torch.random.fork_rng(devices=[]):
+            torch.manual_seed(seed)
+            for layer in self.net:
+                if isinstance(layer, nn.Linear):
+                    layer.reset_parameters()
+
     def forward(self, x):
         return self.net(x)
 
     def decide(self, state_tensor, legal_action_indices):
+        if isinstance(state_tensor, np.ndarray):
+            state_tensor = torch.from_numpy(state_tensor)
         with torch.no_grad():
             logits = self(state_tensor)  # shape: [action_space_size]
+        return self._best_legal(logits, legal_action_indices)
+
+    def decide_sparse(self, indices, values, legal_action_indices):
+        """ decide() from input_encoding.build_state_features; the first layer only reads the active columns """
+        indices = torch.as_tensor(indices)
+        values = torch.as_tensor(values)
+        with torch.no_grad():
+            hidden = torch.relu(self.sparse_first_layer(indices, values))
+            logits = self.net[2](hidden)
+        return self._best_legal(logits, legal_action_indices)
+
+    @property
+    def sparse_first_layer(self) -> "SparseLinear":
+        """
+        The first Linear as a SparseLinear sharing its weights, so mutate() and
+        load_state_dict() are seen without converting again. Kept out of the
+        module's parameters (they would be counted twice) and out of pickles.
+        """
+        layer = self.__dict__.get("_sparse_first")
+        if layer is None:
+            layer = self.__dict__["_sparse_first"] = SparseLinear.from_linear(self.net[0], share=True)
+        return layer
 
-            # Create mask full of False (-inf for logits)
-            mask = torch.full_like(logits, float('-inf'))
+    def __getstate__(self):
+        state = dict(super().__getstate__())
+        state.pop("_sparse_first", None)  # A copy of the view would no longer follow the weights
+        return state
 
-            # Copy logits for legal actions
-            mask[legal_action_indices] = logits[legal_action_indices]
+    @staticmethod
+    def _best_legal(logits, legal_action_indices):
+        # Create mask full of False (-inf for logits)
+        mask = torch.full_like(logits, float('-inf'))
 
-            # Pick the highest scoring legal action
-            action = torch.argmax(mask).item()
+        # Copy logits for legal actions
+        mask[legal_action_indices] = logits[legal_action_indices]
 
-        return action
+        # Pick the highest scoring legal action
+        return torch.argmax(mask).item()
 
 
-    def mutate(self, mutation_rate=0.1):
+    def mutate(self, mutation_rate=0.1, seed: int | None = None):
+        # The noise comes from its own seeded generator, so a mutation can be replayed from self.seed
+        self.seed = seed if seed is not None else random.getrandbits(63)
+        generator = torch.Generator().manual_seed(self.seed)
         with torch.no_grad():
             for param in self.parameters():
-                param += mutation_rate * torch.randn_like(param)
+                param += mutation_rate * torch.randn(param.shape, generator=generator)
     
     def create_name(self, parent_last_name: str | None) -> None:
-        names_dir = Path(__file__).parent.parent / "names"
-        first_names_file = names_dir / "first-names.txt"
-        last_names_file = names_dir / "last-names.txt"
+        # Name tables are memory-mapped once per process (see names.py)
+        self.first_name = first_names().sample()
 
-        # Load first name
-        with open(first_names_file, "r", encoding="utf-8") as f:
-            first_names = [line.strip() for line in f if line.strip()]
-        self.first_name = random.choice(first_names)
-
-        # Load last name only if parent_last_name not given
+        # Pick a new last name only if parent_last_name not given
         if parent_last_name:
             self.last_name = parent_last_name
         else:
-            with open(last_names_file, "r", encoding="utf-8") as f:
-                last_names = [line.strip() for line in f if line.strip()]
-            self.last_name = random.choice(last_names)
+            self.last_name = last_names().sample()
     
     def metadata(self) -> dict:
         return {
@@ -71,4 +111,43 @@ class UnoAgent(nn.Module):
         }
 
     def serialize_weights(self) -> dict:
-        return {k: v.tolist() for k, v in self.state_dict().items()}
\ No newline at end of file
+        return {k: v.tolist() for k, v in self.state_dict().items()}
+
+class SparseLinear(nn.Module):
+    """
+    Embedding-bag form of an nn.Linear for sparse inputs: the output for a state
+    given as (indices, values) is the bias plus the values-weighted sum of the
+    weight rows at those indices, equal to the Linear applied to the dense vector.
+    Holds the Linear's weight transposed ([in, out]) so every input is one row.
+    """
+
+    def __init__(self, in_features: int, out_features: int):
+        super().__init__()
+        self.weight = nn.Parameter(torch.zeros(in_features, out_features))
+        self.bias = nn.Parameter(torch.zeros(out_features))
+
+    @classmethod
+    def from_linear(cls, linear: nn.Linear, share: bool = False) -> "SparseLinear":
+        """ Converted copy of linear, or with share a view of its (frozen) weights that follows later changes """
+        layer = cls(0, 0)
+        if share:
+            layer.weight = nn.Parameter(linear.weight.detach().t(), requires_grad=False)
+            layer.bias = nn.Parameter(linear.bias.detach(), requires_grad=False)
+            return layer
+        layer.weight = nn.Parameter(linear.weight.detach().t().clone())
+        layer.bias = nn.Parameter(linear.bias.detach().clone())
+        return layer
+
+    def to_linear(self) -> nn.Linear:
+        linear = nn.Linear(self.weight.shape[0], self.weight.shape[1])
+        with torch.no_grad():
+            linear.weight.copy_(self.weight.t())
+            linear.bias.copy_(self.bias)
+        return linear
+
+    def forward(self, indices, values, offsets=None):
+        """ One state, or a batch concatenated with offsets marking where each state starts """
+        if offsets is None:
+            return self.bias + values @ self.weight[indices]
+        bags = nn.functional.embedding_bag(indices, self.weight, offsets, mode="sum", per_sample_weights=values)
+        return bags + self.bias
@@ -0,0 +1,150 @@
+"""
+Read-side queries over the agent database.
+
+Lineage and name lookups go through the indexed agents table rather than
+parsing agent_snapshots.metadata_json, and trends read the per-round
+aggregate tables (round_stats, family_round_stats), so none of these queries
+touch the games table. Their cost depends on the number of agents and rounds,
+not on how many games have been recorded.
+
+Databases written before these tables existed can be filled in once with
+backfill().
+"""
+from db_utils import safe_execute, safe_fetchall, refresh_round_aggregates
+
+# --- agents and lineage ---
+
+AGENT_COLUMNS = ("agent_id", "parent_id", "first_name", "last_name", "wins", "games", "first_round", "last_round")
+
+def _agent_rows(rows: list[tuple]) -> list[dict]:
+    return [dict(zip(AGENT_COLUMNS, row)) for row in rows]
+
+def get_agent(agent_id: str) -> dict | None:
+    rows = safe_fetchall(f"SELECT {', '.join(AGENT_COLUMNS)} FROM agents WHERE agent_id = ?", (agent_id,))
+    return _agent_rows(rows)[0] if rows else None
+
+def get_ancestors(agent_id: str) -> list[dict]:
+    """ The agent followed by its parent, grandparent, ... up to the root agent """
+    rows = safe_fetchall(f"""
+        WITH RECURSIVE lineage(agent_id, depth) AS (
+            SELECT ?, 0
+            UNION ALL
+            SELECT a.parent_id, l.depth + 1
+            FROM agents a JOIN lineage l ON a.agent_id = l.agent_id
+            WHERE a.parent_id IS NOT NULL
+        )
+        SELECT {', '.join('a.' + c for c in AGENT_COLUMNS)}
+        FROM lineage l JOIN agents a ON a.agent_id = l.agent_id
+        ORDER BY l.depth
+    """, (agent_id,))
+    return _agent_rows(rows)
+
+def get_descendants(agent_id: str, max_depth: int | None = None) -> list[dict]:
+    """ Every descendant of an agent, breadth first, each with a depth (1 = child) """
+    rows = safe_fetchall(f"""
+        WITH RECURSIVE tree(agent_id, depth) AS (
+            SELECT ?, 0
+            UNION ALL
+            SELECT a.agent_id, t.depth + 1
+            FROM agents a JOIN tree t ON a.parent_id = t.agent_id
+            WHERE ? IS NULL OR t.depth < ?
+        )
+        SELECT {', '.join('a.' + c for c in AGENT_COLUMNS)}, t.depth
+        FROM tree t JOIN agents a ON a.agent_id = t.agent_id
+        WHERE t.depth > 0
+        ORDER BY t.depth
+    """, (agent_id, max_depth, max_depth))
+    return [dict(zip(AGENT_COLUMNS + ("depth",), row)) for row in rows]
+
+def get_family(last_name: str) -> list[dict]:
+    rows = safe_fetchall(f"""
+        SELECT {', '.join(AGENT_COLUMNS)} FROM agents
+        WHERE last_name = ?
+        ORDER BY wins DESC
+    """, (last_name,))
+    return _agent_rows(rows)
+
+# --- trends ---
+
+def population_trend(first_round: int = 0, last_round: int | None = None) -> list[dict]:
+    """ Per-round games, decided games, top/mean score and top win rate """
+    columns = ("round_num", "games", "decided_games", "agents", "top_score", "mean_score", "top_win_rate")
+    rows = safe_fetchall(f"""
+        SELECT {', '.join(columns)} FROM round_stats
+        WHERE round_num >= ? AND (? IS NULL OR round_num <= ?)
+        ORDER BY round_num
+    """, (first_round, last_round, last_round))
+    return [dict(zip(columns, row)) for row in rows]
+
+def agent_win_rate_trend(agent_id: str) -> list[tuple[int, float | None]]:
+    """ (round_num, win rate) for every round the agent was scored in """
+    return safe_fetchall("""
+        SELECT round_num, CAST(score AS REAL) / NULLIF(games, 0)
+        FROM agent_scores
+        WHERE agent_id = ?
+        ORDER BY round_num
+    """, (agent_id,))
+
+def lineage_win_rate_trend(agent_id: str) -> list[tuple[int, str, float | None]]:
+    """ (round_num, agent_id, win rate) along the agent's ancestry, oldest round first """
+    ancestor_ids = [a["agent_id"] for a in get_ancestors(agent_id)]
+    if not ancestor_ids:
+        return []
+    placeholders = ", ".join("?" * len(ancestor_ids))
+    return safe_fetchall(f"""
+        SELECT round_num, agent_id, CAST(score AS REAL) / NULLIF(games, 0)
+        FROM agent_scores
+        WHERE agent_id IN ({placeholders})
+        ORDER BY round_num, agent_id
+    """, tuple(ancestor_ids))
+
+def family_win_rate_trend(last_name: str) -> list[tuple[int, int, int, float | None]]:
+    """ (round_num, agents, wins, win rate) for one family """
+    return safe_fetchall("""
+        SELECT round_num, agents, wins, CAST(wins AS REAL) / NULLIF(games, 0)
+        FROM family_round_stats
+        WHERE last_name = ?
+        ORDER BY round_num
+    """, (last_name,))
+
+def top_families(limit: int = 10) -> list[tuple[str, int, int]]:
+    """ (last_name, total wins, agent-rounds) for the families with the most wins """
+    return safe_fetchall("""
+        SELECT last_name, SUM(wins) AS total_wins, SUM(agents)
+        FROM family_round_stats
+        GROUP BY last_name
+        ORDER BY total_wins DESC
+        LIMIT ?
+    """, (limit,))
+
+# --- backfill for databases written before the analytics tables ---
+
+def backfill() -> None:
+    """
+    Fill agents from existing snapshot metadata and compute aggregates for every
+    scored round. Scans agent_snapshots once; only needed for old databases.
+    """
+    safe_execute("""
+        INSERT INTO agents (
+            agent_id, parent_id, first_name, last_name, wins, games, first_round, last_round
+        )
+        SELECT
+            agent_id,
+            json_extract(metadata_json, '$.parent_id'),
+            json_extract(metadata_json, '$.first_name'),
+            json_extract(metadata_json, '$.last_name'),
+            json_extract(metadata_json, '$.num_wins'),
+            json_extract(metadata_json, '$.num_games'),
+            round_num,
+            round_num
+        FROM agent_snapshots
+        WHERE true
+        ORDER BY round_num
+        ON CONFLICT(agent_id) DO UPDATE SET
+            wins = excluded.wins,
+            games = excluded.games,
+            last_round = excluded.last_round
+    """, ())
+
+    for (round_num,) in safe_fetchall("SELECT DISTINCT round_num FROM agent_scores ORDER BY round_num", ()):
+        refresh_round_aggregates(round_num)
@@ -0,0 +1,48 @@
+"""
+Regenerates action_table.py from config/config.yaml.
+
+The action space is read on every import of input_encoding, so it is compiled
+into a plain Python module instead of parsing YAML at import time. Run this
+after editing the ACTIONS list in the config:
+
+    python AI/src/build_action_table.py
+"""
+import sys
+from pathlib import Path
+
+CONFIG_PATH = Path(__file__).resolve().parent.parent / "config" / "config.yaml"
+OUTPUT_PATH = Path(__file__).resolve().parent / "action_table.py"
+
+HEADER = "# Generated by build_action_table.py from AI/config/config.yaml. Do not edit by hand.\n"
+
+def render_action_table(actions: list[str]) -> str:
+    lines = [HEADER, "ACTION_SPACE: tuple[str, ...] = ("]
+    lines += [f'    "{action}",' for action in actions]
+    lines.append(")")
+    return "\n".join(lines) + "\n"
+
+def build_action_table(check: bool = False) -> bool:
+    """ Writes the action table, or with check=True only reports if it is stale """
+    import yaml
+
+    with open(CONFIG_PATH) as f:
+        config = yaml.safe_load(f)
+
+    source = render_action_table(config["ACTIONS"])
+    current = OUTPUT_PATH.read_text(encoding="utf-8") if OUTPUT_PATH.exists() else None
+
+    if check:
+        return current == source
+
+    if current != source:
+        OUTPUT_PATH.write_text(source, encoding="utf-8")
+    return True
+
+if __name__ == "__main__":
+    if "--check" in sys.argv:
+        up_to_date = build_action_table(check=True)
+        print("action_table.py is up to date" if up_to_date else "action_table.py is stale")
+        sys.exit(0 if up_to_date else 1)
+
+    build_action_table()
+    print(f"Wrote {OUTPUT_PATH}")
@@ -0,0 +1,573 @@
+"""
+Play a round's games on worker processes on any number of machines over TCP.
+
+The coordinator (inside evolve_agents, or anything with a schedule) listens on
+a port; workers connect and pull chunks of games:
+
+    coordinator -> worker   chunk: game ids, seat lists of agent ids, deal seeds,
+                            plus the weights of agents this worker hasn't seen
+    worker -> coordinator   result: winner seat and seconds per game
+
+Workers play with numpy_agent.NumpyAgent and main.play_game, so they only need
+numpy and the uno engine. Every game carries its own deal seed and agents
+decide deterministically, so the winners do not depend on which worker played
+which game: play() returns exactly what play_local() returns for the same
+schedule in one process. That guarantee is between NumPy players only. A torch
+UnoAgent with the same weights chooses the same actions up to float rounding
+(numpy_agent.verify measures it), or less closely at reduced precision, so a
+game played here can rarely end differently from the same game in main.py.
+
+Game lengths vary a lot (hoarded hands, long deck-outs), so a static split of
+the schedule leaves workers idle at the end of a round. Instead:
+
+  - each worker connected at the start of a round gets an equal share of the
+    games in its own queue, but they are streamed to it in chunks;
+  - a chunk holds about CHUNK_SECONDS of play, judged from the worker's recent
+    per-game time (EWMA), and never more than 1/TAIL_SHARE of the games left
+    per worker, so chunks shrink towards the end of the round;
+  - a worker whose queue is empty steals half of the longest other queue
+    (from its far end); once every queue is empty, it re-plays a chunk still
+    running elsewhere and the first result for a game wins;
+  - a worker that disconnects or times out has its queue and its unfinished
+    chunk handed to whoever asks next;
+  - if no worker is left for NO_WORKER_GRACE seconds, play() warns and plays
+    the remaining games itself, a chunk at a time, until a worker is back.
+
+Each play() call leaves a RoundStats in coordinator.rounds with per-game
+latency percentiles, chunk sizes, steals and worker utilization.
+
+    python cluster.py worker --connect 10.0.0.5:50600     # on every machine, one per core
+    python cluster.py demo --workers 3                     # localhost: static vs adaptive, checked against play_local()
+"""
+from __future__ import annotations
+
+import json
+import math
+import socket
+import struct
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+DEFAULT_PORT = 50600
+CHUNK_SECONDS = 1.0        # Play time a chunk should take once per-game times are known
+MIN_CHUNK = 1              # Games in a chunk before anything has been measured, and at the end of a round
+TAIL_SHARE = 2             # A chunk is at most 1/TAIL_SHARE of the games left per worker
+EWMA_WEIGHT = 0.2          # Weight of the newest game in the per-game time averages
+WORKER_TIMEOUT = 300.0     # Seconds without an answer before a worker is considered lost
+NO_WORKER_GRACE = 30.0     # Seconds play() waits for a worker to (re)connect before playing games itself
+
+# --- framing: 4-byte header length, JSON header, then the raw blobs it lists ---
+
+def send_message(sock: socket.socket, header: dict, blobs: dict[str, bytes] | None = None) -> None:
+    blobs = blobs or {}
+    header = {**header, "blobs": [[name, len(data)] for name, data in blobs.items()]}
+    encoded = json.dumps(header).encode()
+    sock.sendall(struct.pack("!I", len(encoded)) + encoded + b"".join(blobs.values()))
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError("Connection closed")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+def recv_message(sock: socket.socket) -> tuple[dict, dict[str, bytes]]:
+    (length,) = struct.unpack("!I", _recv_exact(sock, 4))
+    header = json.loads(_recv_exact(sock, length))
+    blobs = {name: _recv_exact(sock, size) for name, size in header.pop("blobs")}
+    return header, blobs
+
+# --- playing ---
+
+def play_games(games: list[list], agents: dict) -> list[list]:
+    """ [[game_id, winner seat, seconds]] for [[game_id, [agent ids by seat], deal seed]] using agents by id """
+    from main import play_game
+
+    results = []
+    for game_id, seats, deal_seed in games:
+        start = time.perf_counter()
+        winner = play_game([agents[agent_id] for agent_id in seats], game_id, round_num=-1, deal_seed=deal_seed)
+        results.append([game_id, winner, time.perf_counter() - start])
+    return results
+
+def play_local(weights: dict[str, bytes], games: list[list]) -> dict[int, int | None]:
+    """ The single-process reference for Coordinator.play """
+    from numpy_agent import NumpyAgent
+
+    agents = {agent_id: NumpyAgent.from_bytes(data, agent_id) for agent_id, data in weights.items()}
+    return {game_id: winner for game_id, winner, _ in play_games(games, agents)}
+
+def run_worker(host: str, port: int = DEFAULT_PORT, retry_seconds: float = 30.0) -> None:
+    """ Connect to a coordinator and play chunks until told to stop """
+    from numpy_agent import NumpyAgent
+
+    deadline = time.monotonic() + retry_seconds
+    while True:
+        try:
+            sock = socket.create_connection((host, port))
+            break
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.5)
+
+    agents: dict[str, NumpyAgent] = {}
+    with sock:
+        send_message(sock, {"type": "hello", "host": socket.gethostname()})
+        while True:
+            try:
+                header, blobs = recv_message(sock)
+            except ConnectionError:
+                return  # Coordinator gone
+            if header["type"] == "stop":
+                return
+            if header["type"] == "retain":
+                # New round: drop the agents that did not survive
+                agents = {agent_id: agents[agent_id] for agent_id in header["agents"] if agent_id in agents}
+                continue
+            for agent_id, data in blobs.items():
+                agents[agent_id] = NumpyAgent.from_bytes(data, agent_id)
+            results = play_games(header["games"], agents)
+            send_message(sock, {"type": "result", "chunk": header["chunk"], "results": results})
+
+# --- coordinator ---
+
+def _percentile(values: list[float], q: float) -> float:
+    """ Nearest-rank percentile of sorted values """
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, math.ceil(q * len(values)) - 1))]
+
+class RoundStats:
+    """ Timing of one Coordinator.play call """
+
+    def __init__(self, games: int) -> None:
+        self.games = games
+        self.start = time.perf_counter()
+        self.end: float | None = None
+        self.game_seconds: list[float] = []
+        self.chunk_sizes: list[int] = []
+        self.stolen = 0          # Games taken from another worker's queue
+        self.duplicated = 0      # Chunks re-played because every queue was empty
+        self.redispatched = 0    # Games handed on from a lost worker
+        self.played_here = 0     # Games the coordinator played itself while no worker was connected
+        self.drained: float | None = None  # First time every game had been handed out (all queues and orphans empty)
+        self.busy_seconds = 0.0       # Worker time on games whose result was used (the first one in)
+        self.duplicate_seconds = 0.0  # Worker time on results that came in second, from duplicated chunks
+        self._attached: dict[str, float] = {}
+        self._available_seconds = 0.0
+
+    def attach(self, worker: str) -> None:
+        self._attached[worker] = time.perf_counter()
+
+    def detach(self, worker: str) -> None:
+        if worker in self._attached:
+            self._available_seconds += time.perf_counter() - self._attached.pop(worker)
+
+    def finish(self) -> None:
+        for worker in list(self._attached):
+            self.detach(worker)
+        self.end = time.perf_counter()
+        self.game_seconds.sort()
+
+    @property
+    def seconds(self) -> float:
+        return (self.end or time.perf_counter()) - self.start
+
+    @property
+    def utilization(self) -> float:
+        """ Time workers spent on results that were used over the time they were connected during the round """
+        return self.busy_seconds / self._available_seconds if self._available_seconds else 0.0
+
+    @property
+    def tail(self) -> float:
+        """ Seconds from the last queued game being handed out to the end of the round """
+        return self.seconds - (self.drained - self.start) if self.drained is not None else 0.0
+
+    def summary(self) -> str:
+        latencies = self.game_seconds
+        chunks = self.chunk_sizes
+        return (
+            f"{self.games} games in {self.seconds:.1f}s; per game p50 {_percentile(latencies, 0.5) * 1000:.0f}ms "
+            f"p95 {_percentile(latencies, 0.95) * 1000:.0f}ms p99 {_percentile(latencies, 0.99) * 1000:.0f}ms "
+            f"max {(latencies[-1] if latencies else 0) * 1000:.0f}ms; {len(chunks)} chunks of "
+            f"{min(chunks, default=0)}-{max(chunks, default=0)} games; {self.stolen} games stolen, "
+            f"{self.duplicated} chunks duplicated, {self.redispatched} games re-dispatched, "
+            f"{self.played_here} played by the coordinator; "
+            f"utilization {self.utilization:.0%} (+{self.duplicate_seconds:.1f}s on duplicates), tail {self.tail:.1f}s"
+        )
+
+class _Worker:
+    def __init__(self, sock: socket.socket, address) -> None:
+        self.sock = sock
+        self.address = address
+        self.name = f"{address[0]}:{address[1]}"
+        self.known: set[str] = set()  # Agent ids whose weights this worker holds
+        self.retain = False  # Tell the worker which agents to keep before its next chunk
+        self.queue: deque[list] = deque()  # This round's games not yet sent anywhere
+        self.game_seconds: float | None = None  # EWMA of this worker's time per game
+        self.games_played = 0
+
+class Coordinator:
+    def __init__(
+        self,
+        host: str = "0.0.0.0",
+        port: int = DEFAULT_PORT,
+        adaptive: bool = True,
+        chunk_seconds: float = CHUNK_SECONDS,
+        worker_timeout: float = WORKER_TIMEOUT,
+        no_worker_grace: float = NO_WORKER_GRACE,
+    ) -> None:
+        """ adaptive=False sends each worker its whole share at once and never steals (the static split, for comparison) """
+        self.adaptive = adaptive
+        self.chunk_seconds = chunk_seconds
+        self.worker_timeout = worker_timeout
+        self.no_worker_grace = no_worker_grace
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind((host, port))
+        self._server.listen()
+        self.address: tuple[str, int] = self._server.getsockname()
+
+        self._lock = threading.Condition()
+        self._workers: list[_Worker] = []
+        self._processes: list[subprocess.Popen] = []
+        self._closed = False
+        self._game_seconds: float | None = None  # EWMA over all workers, for workers without their own yet
+        self.rounds: list[RoundStats] = []
+
+        # Current round
+        self._weights: dict[str, bytes] = {}
+        self._orphans: deque[list] = deque()      # Games of lost workers, or of a round started without workers
+        self._chunks: dict[int, list[list]] = {}  # Chunk id -> games; ids are never reused across rounds
+        self._running: dict[int, int] = {}        # Chunk id -> workers currently playing it
+        self._next_chunk_id = 0
+        self._results: dict[int, int | None] = {}
+        self._pending_games = 0
+        self._stats: RoundStats | None = None
+
+        threading.Thread(target=self._accept_loop, name="Coordinator", daemon=True).start()
+
+    @property
+    def workers(self) -> int:
+        with self._lock:
+            return len(self._workers)
+
+    def spawn_local_workers(self, count: int) -> None:
+        """ Start worker processes on this machine; close() stops them """
+        here = Path(__file__).resolve()
+        host, port = self.address
+        host = "127.0.0.1" if host == "0.0.0.0" else host
+        self._processes += [
+            subprocess.Popen([sys.executable, str(here), "worker", "--connect", f"{host}:{port}"], cwd=here.parent)
+            for _ in range(count)
+        ]
+
+    def wait_for_workers(self, count: int, timeout: float | None = None) -> bool:
+        with self._lock:
+            return self._lock.wait_for(lambda: len(self._workers) >= count, timeout)
+
+    def play(self, weights: dict[str, bytes], games: list[list]) -> dict[int, int | None]:
+        """
+        Winner seat by game id for [[game_id, [agent ids by seat], deal seed]].
+        weights maps every agent id in the schedule to numpy_agent.weights_to_bytes output;
+        an agent id must always stand for the same weights, workers keep them across rounds.
+        Games left while no worker is connected are played here after no_worker_grace seconds.
+        """
+        with self._lock:
+            self._weights = weights
+            self._chunks = {}
+            self._running = {}
+            self._results = {}
+            self._pending_games = len(games)
+            self._stats = RoundStats(len(games))
+            self._orphans = deque()
+            if self._workers:
+                share = math.ceil(len(games) / len(self._workers))
+                for i, worker in enumerate(self._workers):
+                    worker.queue = deque(games[i * share:(i + 1) * share])
+            else:
+                self._orphans.extend(games)
+            for worker in self._workers:
+                worker.known &= weights.keys()
+                worker.retain = True
+                self._stats.attach(worker.name)
+            self._lock.notify_all()
+
+            agents: dict = {}  # NumpyAgents for games played here, made when first needed
+            while self._pending_games and not self._closed:
+                if self._workers or not self._orphans:
+                    self._lock.wait()
+                elif not self._lock.wait_for(lambda: self._workers or self._closed, self.no_worker_grace):
+                    self._play_orphans(agents)
+            if self._closed:
+                raise RuntimeError("Coordinator closed during play()")
+            self._stats.finish()
+            self.rounds.append(self._stats)
+            self._stats = None
+            self._chunks = {}  # Duplicates still running are ignored when they finish
+            self._running = {}
+            return dict(self._results)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._lock.notify_all()  # Each worker is sent a stop once its current chunk is in
+        self._server.close()
+        for process in self._processes:
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    def report(self) -> str:
+        """ The last round's stats """
+        with self._lock:
+            workers = len(self._workers)
+        if not self.rounds:
+            return f"{workers} workers, no rounds played"
+        return f"{workers} workers; {self.rounds[-1].summary()}"
+
+    def _play_orphans(self, agents: dict) -> None:
+        """ Play one chunk of orphaned games in this thread; called with the lock held, releases it meanwhile """
+        from numpy_agent import NumpyAgent
+
+        if not self._stats.played_here:
+            print(f"[cluster] no worker connected for {self.no_worker_grace:.0f}s, playing the {len(self._orphans)} games left here")
+        by_time = int(self.chunk_seconds / self._game_seconds) if self._game_seconds else MIN_CHUNK
+        games = [self._orphans.popleft() for _ in range(min(max(MIN_CHUNK, by_time), len(self._orphans)))]
+        self._note_drained()
+        for _, seats, _ in games:
+            for agent_id in seats:
+                if agent_id not in agents:
+                    agents[agent_id] = NumpyAgent.from_bytes(self._weights[agent_id], agent_id)
+
+        self._lock.release()  # Workers may connect meanwhile and take the orphans still queued
+        try:
+            results = play_games(games, agents)
+        finally:
+            self._lock.acquire()
+        for game_id, winner, seconds in results:
+            if game_id not in self._results:
+                self._results[game_id] = winner
+                self._pending_games -= 1
+                self._stats.game_seconds.append(seconds)
+                self._stats.played_here += 1
+
+    # --- scheduling (called with the lock held) ---
+
+    def _chunk_size(self, worker: _Worker) -> int:
+        if not self.adaptive:
+            return len(worker.queue) or self._pending_games
+        game_seconds = worker.game_seconds or self._game_seconds
+        by_time = int(self.chunk_seconds / game_seconds) if game_seconds else MIN_CHUNK
+        by_share = math.ceil(self._pending_games / (TAIL_SHARE * max(1, len(self._workers))))
+        return max(MIN_CHUNK, min(by_time, by_share))
+
+    def _take(self, worker: _Worker) -> int | None:
+        """ Chunk id for this worker to play; waits while there is nothing to do, None once closed """
+        while not self._closed:
+            chunk_id = self._find_chunk(worker) if self._stats else None
+            if chunk_id is not None:
+                self._running[chunk_id] = self._running.get(chunk_id, 0) + 1
+                return chunk_id
+            self._lock.wait()
+        return None
+
+    def _find_chunk(self, worker: _Worker) -> int | None:
+        """ New games from the worker's queue, orphans or a steal; else a running chunk to duplicate """
+        size = self._chunk_size(worker)
+        games = None
+        for source in (worker.queue, self._orphans):
+            if source:
+                games = [source.popleft() for _ in range(min(size, len(source)))]
+                break
+        else:
+            victim = max(self._workers, key=lambda other: len(other.queue), default=None)
+            if self.adaptive and victim is not None and victim.queue:
+                # Half of the victim's queue, from the end it would reach last
+                count = min(size, math.ceil(len(victim.queue) / 2))
+                games = [victim.queue.pop() for _ in range(count)][::-1]
+                self._stats.stolen += count
+
+        if games:
+            self._note_drained()
+            chunk_id = self._next_chunk_id
+            self._next_chunk_id += 1
+            self._chunks[chunk_id] = games
+            self._stats.chunk_sizes.append(len(games))
+            return chunk_id
+
+        unfinished = [chunk_id for chunk_id, copies in self._running.items() if copies and self._chunk_open(chunk_id)]
+        if self.adaptive and unfinished:
+            self._stats.duplicated += 1
+            return min(unfinished, key=lambda chunk_id: self._running[chunk_id])
+        return None
+
+    def _note_drained(self) -> None:
+        if self._stats.drained is None and not self._orphans and not any(worker.queue for worker in self._workers):
+            self._stats.drained = time.perf_counter()
+
+    def _chunk_open(self, chunk_id: int) -> bool:
+        return any(game_id not in self._results for game_id, _, _ in self._chunks[chunk_id])
+
+    def _record(self, worker: _Worker, chunk_id: int, results: list[list]) -> None:
+        for game_id, winner, seconds in results:
+            worker.game_seconds = seconds if worker.game_seconds is None else (
+                (1 - EWMA_WEIGHT) * worker.game_seconds + EWMA_WEIGHT * seconds
+            )
+            self._game_seconds = seconds if self._game_seconds is None else (
+                (1 - EWMA_WEIGHT) * self._game_seconds + EWMA_WEIGHT * seconds
+            )
+        if chunk_id not in self._chunks:
+            return  # A duplicate from an earlier round finishing late
+        self._running[chunk_id] -= 1
+        for game_id, winner, seconds in results:
+            if game_id in self._results:
+                self._stats.duplicate_seconds += seconds
+            else:
+                self._stats.busy_seconds += seconds
+                self._results[game_id] = winner
+                self._pending_games -= 1
+                self._stats.game_seconds.append(seconds)
+                worker.games_played += 1
+
+    # --- threads ---
+
+    def _accept_loop(self) -> None:
+        while not self._closed:
+            try:
+                sock, address = self._server.accept()
+            except OSError:
+                return
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.settimeout(self.worker_timeout)
+            worker = _Worker(sock, address)
+            threading.Thread(target=self._serve, args=(worker,), name=f"worker {worker.name}", daemon=True).start()
+
+    def _serve(self, worker: _Worker) -> None:
+        chunk_id = None
+        try:
+            header, _ = recv_message(worker.sock)
+            if header.get("type") != "hello":
+                raise ConnectionError("Expected hello")
+            with self._lock:
+                self._workers.append(worker)
+                worker.retain = True
+                if self._stats:
+                    self._stats.attach(worker.name)
+                self._lock.notify_all()
+
+            while True:
+                with self._lock:
+                    chunk_id = self._take(worker)
+                    if chunk_id is not None:
+                        games = self._chunks[chunk_id]
+                        retain = sorted(worker.known) if worker.retain else None
+                        worker.retain = False
+                        needed = {agent_id for _, seats, _ in games for agent_id in seats} - worker.known
+                        blobs = {agent_id: self._weights[agent_id] for agent_id in needed}
+                        worker.known |= needed
+
+                if chunk_id is None:
+                    send_message(worker.sock, {"type": "stop"})
+                    return
+                if retain is not None:
+                    send_message(worker.sock, {"type": "retain", "agents": retain})
+                send_message(worker.sock, {"type": "chunk", "chunk": chunk_id, "games": games}, blobs)
+                header, _ = recv_message(worker.sock)
+
+                with self._lock:
+                    self._record(worker, chunk_id, header["results"])
+                    chunk_id = None
+                    self._lock.notify_all()
+        except (OSError, ConnectionError, ValueError):
+            pass  # Lost worker: its games go to the orphans below
+        finally:
+            with self._lock:
+                if worker in self._workers:
+                    self._workers.remove(worker)
+                if self._stats:
+                    self._stats.detach(worker.name)
+                    lost = list(worker.queue)
+                    if chunk_id in self._chunks:
+                        self._running[chunk_id] -= 1
+                        if not self._running[chunk_id]:
+                            lost = [game for game in self._chunks[chunk_id] if game[0] not in self._results] + lost
+                    self._orphans.extendleft(reversed(lost))
+                    self._stats.redispatched += len(lost)
+                worker.queue = deque()
+                self._lock.notify_all()
+            worker.sock.close()
+
+def demo(workers: int = 3, games: int = 60, seed: int = 0, kill_one: bool = True) -> bool:
+    """
+    Play one schedule of fresh agents on local workers with the static split
+    and with adaptive chunks (killing one worker mid-round), print both
+    rounds' stats and check the winners against play_local()
+    """
+    import random
+
+    import numpy as np
+
+    from input_encoding import state_vector_size, NUM_CARD_TYPES
+    from main import RULES
+    from numpy_agent import weights_to_bytes
+
+    rng = np.random.default_rng(seed)
+    size = state_vector_size(RULES.player_count)
+    agent_ids = [f"agent-{i}" for i in range(RULES.player_count * 3)]
+    weights = {
+        agent_id: weights_to_bytes({
+            "net.0.weight": rng.normal(0, 0.1, (64, size)).astype(np.float32),
+            "net.0.bias": rng.normal(0, 0.1, 64).astype(np.float32),
+            "net.2.weight": rng.normal(0, 0.1, (NUM_CARD_TYPES, 64)).astype(np.float32),
+            "net.2.bias": rng.normal(0, 0.1, NUM_CARD_TYPES).astype(np.float32),
+        })
+        for agent_id in agent_ids
+    }
+    shuffler = random.Random(seed)
+    schedule = [[game_id, shuffler.sample(agent_ids, RULES.player_count), shuffler.getrandbits(63)] for game_id in range(games)]
+    local = play_local(weights, schedule)
+
+    same = True
+    for adaptive in (False, True):
+        coordinator = Coordinator("127.0.0.1", 0, adaptive=adaptive)
+        coordinator.spawn_local_workers(workers)
+        try:
+            coordinator.wait_for_workers(workers, timeout=60)
+            if kill_one and adaptive:
+                threading.Timer(1.0, coordinator._processes[0].kill).start()
+            distributed = coordinator.play(weights, schedule)
+            print(f"[cluster] {'adaptive' if adaptive else 'static'}: {coordinator.report()}")
+        finally:
+            coordinator.close()
+        same = same and distributed == local
+    print(f"[cluster] results {'identical to' if same else 'DIFFERENT from'} the single-process run")
+    return same
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Distributed game workers.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    worker_parser = sub.add_parser("worker", help="connect to a coordinator and play games")
+    worker_parser.add_argument("--connect", default=f"127.0.0.1:{DEFAULT_PORT}", help="coordinator host:port")
+    demo_parser = sub.add_parser("demo", help="static vs adaptive scheduling on local workers, checked against one process")
+    demo_parser.add_argument("--workers", type=int, default=3)
+    demo_parser.add_argument("--games", type=int, default=60)
+    demo_parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.command == "worker":
+        host, _, port = args.connect.rpartition(":")
+        run_worker(host, int(port))
+    else:
+        raise SystemExit(0 if demo(args.workers, args.games, args.seed) else 1)
@@ -1,7 +1,6 @@
 import sqlite3
 import json
 from pathlib import Path
-import torch
 import time
 
 DB_PATH = Path("uno_agents.db")
@@ -21,6 +20,22 @@ def safe_execute(statement, params, retries=5, delay=0.1):
             else:
                 raise
 
+def safe_fetchall(statement, params, retries=5, delay=0.1) -> list[tuple]:
+    for attempt in range(retries):
+        try:
+            with sqlite3.connect(DB_PATH) as conn:
+                conn.execute("PRAGMA journal_mode=WAL;")
+                conn.execute("PRAGMA synchronous=NORMAL;")
+                c = conn.cursor()
+                c.execute(statement, params)
+                return c.fetchall()
+        except sqlite3.OperationalError as e:
+            if "database is locked" in str(e) and attempt < retries - 1:
+                time.sleep(delay * (2 ** attempt))  # exponential backoff
+            else:
+                raise
+    return []
+
 def init_db():
     """Initialize the SQLite database with necessary tables."""
     with sqlite3.connect(DB_PATH) as conn:
@@ -57,55 +72,304 @@ def init_db():
         );
         """)
 
+        # Older databases were created before agent_scores recorded games played
+        columns = {row[1] for row in c.execute("PRAGMA table_info(agent_scores)")}
+        if "games" not in columns:
+            c.execute("ALTER TABLE agent_scores ADD COLUMN games INTEGER")
+
+        # One row per agent with the lineage/name fields as real (indexable) columns,
+        # kept up to date from each snapshot's metadata
+        c.execute("""
+        CREATE TABLE IF NOT EXISTS agents (
+            agent_id TEXT PRIMARY KEY,
+            parent_id TEXT,
+            first_name TEXT,
+            last_name TEXT,
+            wins INTEGER,
+            games INTEGER,
+            first_round INTEGER,
+            last_round INTEGER
+        );
+        """)
+
+        # Per-round aggregates, filled in once a round's results are written
+        c.execute("""
+        CREATE TABLE IF NOT EXISTS round_stats (
+            round_num INTEGER PRIMARY KEY,
+            games INTEGER,
+            decided_games INTEGER,
+            agents INTEGER,
+            top_score INTEGER,
+            mean_score REAL,
+            top_win_rate REAL
+        );
+        """)
+
+        c.execute("""
+        CREATE TABLE IF NOT EXISTS family_round_stats (
+            round_num INTEGER,
+            last_name TEXT,
+            agents INTEGER,
+            wins INTEGER,
+            games INTEGER,
+            PRIMARY KEY(round_num, last_name)
+        );
+        """)
+
+        # Current rating per agent plus its value at the end of every round it played
+        c.execute("""
+        CREATE TABLE IF NOT EXISTS agent_ratings (
+            agent_id TEXT PRIMARY KEY,
+            mu REAL,
+            sigma REAL,
+            games INTEGER,
+            round_num INTEGER
+        );
+        """)
+
+        c.execute("""
+        CREATE TABLE IF NOT EXISTS rating_history (
+            agent_id TEXT,
+            round_num INTEGER,
+            mu REAL,
+            sigma REAL,
+            games INTEGER,
+            PRIMARY KEY(agent_id, round_num)
+        );
+        """)
+
+        # Frozen champion weights and cached matchups against them (see hall_of_fame.py)
+        c.execute("""
+        CREATE TABLE IF NOT EXISTS hall_of_fame (
+            agent_id TEXT PRIMARY KEY,
+            round_num INTEGER,
+            first_name TEXT,
+            last_name TEXT,
+            input_size INTEGER,
+            weights BLOB
+        );
+        """)
+
+        c.execute("""
+        CREATE TABLE IF NOT EXISTS hof_results (
+            agent_id TEXT,
+            champion_id TEXT,
+            seed_set TEXT,
+            games INTEGER,
+            wins INTEGER,
+            champion_wins INTEGER,
+            PRIMARY KEY(agent_id, champion_id, seed_set)
+        );
+        """)
+
+        c.execute("""
+        CREATE TABLE IF NOT EXISTS hof_evaluations (
+            round_num INTEGER,
+            agent_id TEXT,
+            PRIMARY KEY(round_num, agent_id)
+        );
+        """)
+
+        # Compact game records: seeds and agent genomes instead of decks and moves (see game_records.py)
+        c.execute("""
+        CREATE TABLE IF NOT EXISTS agent_genomes (
+            agent_id TEXT PRIMARY KEY,
+            parent_id TEXT,
+            seed INTEGER,
+            mutation_rate REAL
+        );
+        """)
+
+        c.execute("""
+        CREATE TABLE IF NOT EXISTS record_rounds (
+            round_num INTEGER PRIMARY KEY,
+            settings TEXT,
+            version INTEGER
+        );
+        """)
+
+        c.execute("""
+        CREATE TABLE IF NOT EXISTS round_rosters (
+            round_num INTEGER,
+            position INTEGER,
+            agent_id TEXT,
+            PRIMARY KEY(round_num, position)
+        );
+        """)
+
+        c.execute("""
+        CREATE TABLE IF NOT EXISTS game_records (
+            round_num INTEGER,
+            game_id INTEGER,
+            deal_seed INTEGER,
+            seats BLOB,
+            winner INTEGER,
+            fingerprint INTEGER,
+            PRIMARY KEY(round_num, game_id)
+        );
+        """)
+
+        c.execute("CREATE INDEX IF NOT EXISTS idx_games_round ON games(round_num);")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_games_winner ON games(winner_agent_id);")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_agent_scores_round ON agent_scores(round_num, score);")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_agents_parent ON agents(parent_id);")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_agents_first_name ON agents(first_name);")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_agents_last_name ON agents(last_name);")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_agents_wins ON agents(wins);")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_family_round_stats_name ON family_round_stats(last_name);")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_rating_history_round ON rating_history(round_num);")
+
 def serialize_state_dict(state_dict: dict) -> dict:
     """Convert PyTorch state dict to JSON-serializable format."""
-    return {k: v.tolist() if isinstance(v, torch.Tensor) else v for k, v in state_dict.items()}
+    # Tensors (and numpy arrays) expose tolist(), checking for it avoids importing torch here
+    return {k: v.tolist() if hasattr(v, "tolist") else v for k, v in state_dict.items()}
+
+GAME_RESULT_SQL = """
+    INSERT INTO games (round_num, game_id, winner_agent_id)
+    VALUES (?, ?, ?)
+"""
+
+AGENT_SCORE_SQL = """
+    INSERT OR REPLACE INTO agent_scores (agent_id, round_num, score, games)
+    VALUES (?, ?, ?, ?)
+"""
+
+AGENT_SNAPSHOT_SQL = """
+    INSERT OR REPLACE INTO agent_snapshots (
+        agent_id, round_num, weights_json, metadata_json
+    ) VALUES (?, ?, ?, ?)
+"""
+
+AGENT_UPSERT_SQL = """
+    INSERT INTO agents (
+        agent_id, parent_id, first_name, last_name, wins, games, first_round, last_round
+    ) VALUES (
+        :agent_id, :parent_id, :first_name, :last_name, :num_wins, :num_games, :round_num, :round_num
+    )
+    ON CONFLICT(agent_id) DO UPDATE SET
+        wins = excluded.wins,
+        games = excluded.games,
+        last_round = excluded.last_round
+"""
+
+AGENT_RATING_SQL = """
+    INSERT OR REPLACE INTO agent_ratings (agent_id, mu, sigma, games, round_num)
+    VALUES (:agent_id, :mu, :sigma, :games, :round_num)
+"""
+
+RATING_HISTORY_SQL = """
+    INSERT OR REPLACE INTO rating_history (agent_id, round_num, mu, sigma, games)
+    VALUES (:agent_id, :round_num, :mu, :sigma, :games)
+"""
+
+HOF_CHAMPION_SQL = """
+    INSERT OR IGNORE INTO hall_of_fame (agent_id, round_num, first_name, last_name, input_size, weights)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+HOF_RESULT_SQL = """
+    INSERT OR REPLACE INTO hof_results (agent_id, champion_id, seed_set, games, wins, champion_wins)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+HOF_EVALUATION_SQL = """
+    INSERT OR IGNORE INTO hof_evaluations (round_num, agent_id) VALUES (?, ?)
+"""
+
+AGENT_GENOME_SQL = """
+    INSERT OR IGNORE INTO agent_genomes (agent_id, parent_id, seed, mutation_rate)
+    VALUES (?, ?, ?, ?)
+"""
+
+RECORD_ROUND_SQL = """
+    INSERT OR REPLACE INTO record_rounds (round_num, settings, version) VALUES (?, ?, ?)
+"""
+
+ROUND_ROSTER_SQL = """
+    INSERT OR REPLACE INTO round_rosters (round_num, position, agent_id) VALUES (?, ?, ?)
+"""
+
+GAME_RECORD_SQL = """
+    INSERT OR REPLACE INTO game_records (round_num, game_id, deal_seed, seats, winner, fingerprint)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+ROUND_STATS_SQL = """
+    INSERT OR REPLACE INTO round_stats (
+        round_num, games, decided_games, agents, top_score, mean_score, top_win_rate
+    )
+    SELECT
+        :round_num,
+        (SELECT COUNT(*) FROM games WHERE round_num = :round_num),
+        (SELECT COUNT(*) FROM games WHERE round_num = :round_num AND winner_agent_id != 'None'),
+        COUNT(*),
+        MAX(score),
+        AVG(score),
+        MAX(CAST(score AS REAL) / NULLIF(games, 0))
+    FROM agent_scores
+    WHERE round_num = :round_num
+"""
+
+FAMILY_ROUND_STATS_SQL = """
+    INSERT OR REPLACE INTO family_round_stats (round_num, last_name, agents, wins, games)
+    SELECT s.round_num, a.last_name, COUNT(*), SUM(s.score), SUM(s.games)
+    FROM agent_scores s
+    JOIN agents a ON a.agent_id = s.agent_id
+    WHERE s.round_num = :round_num
+    GROUP BY a.last_name
+"""
+
+def agent_params(round_num: int, metadata_dict: dict) -> dict:
+    return {**metadata_dict, "round_num": round_num}
+
+def rating_params(agent_id: str, round_num: int, mu: float, sigma: float, games: int) -> dict:
+    return {"agent_id": agent_id, "round_num": round_num, "mu": mu, "sigma": sigma, "games": games}
+
+def snapshot_params(agent_id: str, round_num: int, weights_dict: dict, metadata_dict: dict) -> tuple:
+    serializable_weights = serialize_state_dict(weights_dict)
+    return (
+        agent_id,
+        round_num,
+        #json.dumps(serializable_weights), # Turned this off for now because it was a lot of storage
+        json.dumps({}),
+        json.dumps(metadata_dict)
+    )
 
 def save_game_result(round_num: int, game_id: int, winner_agent_id: str):
-    with sqlite3.connect(DB_PATH) as conn:
-        safe_execute("""
-            INSERT INTO games (round_num, game_id, winner_agent_id)
-            VALUES (?, ?, ?)
-        """, (round_num, game_id, winner_agent_id))
+    safe_execute(GAME_RESULT_SQL, (round_num, game_id, winner_agent_id))
 
-def save_agent_score(agent_id: str, round_num: int, score: int):
-    with sqlite3.connect(DB_PATH) as conn:
-        safe_execute("""
-            INSERT OR REPLACE INTO agent_scores (agent_id, round_num, score)
-            VALUES (?, ?, ?)
-        """, (agent_id, round_num, score))
+def save_agent_score(agent_id: str, round_num: int, score: int, games: int | None = None):
+    safe_execute(AGENT_SCORE_SQL, (agent_id, round_num, score, games))
 
 def save_agent_snapshot(agent_id: str, round_num: int, weights_dict: dict, metadata_dict: dict):
-    serializable_weights = serialize_state_dict(weights_dict)
-    with sqlite3.connect(DB_PATH) as conn:
-        safe_execute("""
-            INSERT OR REPLACE INTO agent_snapshots (
-                agent_id, round_num, weights_json, metadata_json
-            ) VALUES (?, ?, ?, ?)
-        """, (
-            agent_id,
-            round_num,
-            #json.dumps(serializable_weights), # Turned this off for now because it was a lot of storage
-            json.dumps({}),
-            json.dumps(metadata_dict)
-        ))
+    safe_execute(AGENT_SNAPSHOT_SQL, snapshot_params(agent_id, round_num, weights_dict, metadata_dict))
+    safe_execute(AGENT_UPSERT_SQL, agent_params(round_num, metadata_dict))
+
+def save_agent_rating(agent_id: str, round_num: int, mu: float, sigma: float, games: int):
+    params = rating_params(agent_id, round_num, mu, sigma, games)
+    safe_execute(AGENT_RATING_SQL, params)
+    safe_execute(RATING_HISTORY_SQL, params)
+
+def save_agent_genome(agent_id: str, parent_id: str | None, seed: int, mutation_rate: float | None):
+    safe_execute(AGENT_GENOME_SQL, (agent_id, parent_id, seed, mutation_rate))
+
+def save_round_roster(round_num: int, agent_ids: list[str], settings: str, version: int):
+    safe_execute(RECORD_ROUND_SQL, (round_num, settings, version))
+    for position, agent_id in enumerate(agent_ids):
+        safe_execute(ROUND_ROSTER_SQL, (round_num, position, agent_id))
+
+def save_game_record(round_num: int, game_id: int, deal_seed: int, seats: bytes, winner: int | None, fingerprint: int):
+    safe_execute(GAME_RECORD_SQL, (round_num, game_id, deal_seed, seats, winner, fingerprint))
+
+def refresh_round_aggregates(round_num: int):
+    """Recompute round_stats and family_round_stats for a round whose scores and snapshots are saved."""
+    safe_execute(ROUND_STATS_SQL, {"round_num": round_num})
+    safe_execute(FAMILY_ROUND_STATS_SQL, {"round_num": round_num})
 
 def get_top_agents(round_num: int, top_k: int):
-    for attempt in range(5):
-        try:
-            with sqlite3.connect(DB_PATH) as conn:
-                conn.execute("PRAGMA journal_mode=WAL;")
-                conn.execute("PRAGMA synchronous=NORMAL;")
-                c = conn.cursor()
-                c.execute("""
-                    SELECT agent_id, score FROM agent_scores
-                    WHERE round_num = ?
-                    ORDER BY score DESC
-                    LIMIT ?
-                """, (round_num, top_k))
-                return c.fetchall()
-        except sqlite3.OperationalError as e:
-            if "database is locked" in str(e) and attempt < 4:
-                time.sleep(0.1 * (2 ** attempt))
-            else:
-                raise
\ No newline at end of file
+    return safe_fetchall("""
+        SELECT agent_id, score FROM agent_scores
+        WHERE round_num = ?
+        ORDER BY score DESC
+        LIMIT ?
+    """, (round_num, top_k))
@@ -0,0 +1,134 @@
+"""
+Duplicate-deal scheduling: like duplicate bridge, a group of agents plays the
+same seeded deal once in every seat rotation, so each agent gets every hand
+and the luck of the deal cancels out within the group.
+
+Scores are relative: a win is worth 1 and every game an agent plays costs
+1/seats when somebody won it, i.e. score = wins - the agent's fair share. On
+a rotated deal a group's scores sum to zero, whatever the deal was like.
+
+Running this file plays a population both ways and reports how many fewer
+games the duplicate schedule needs for the same standard error of the scores.
+It uses simple rule-based players of graded skill, since freshly initialized
+networks almost never finish a game (the deck runs out first):
+
+    python duplicate.py --agents 12 --deals 30
+"""
+from __future__ import annotations
+
+import random
+
+def rotations(group: list[int]) -> list[list[int]]:
+    """ group in every seat rotation; each agent sits in each seat once """
+    return [group[r:] + group[:r] for r in range(len(group))]
+
+def duplicate_schedule(groups: list[list[int]], rng: random.Random) -> tuple[list[list[int]], list[int]]:
+    """ Every group played in all of its rotations on one deal; returns (schedule, deal seed per game) """
+    schedule: list[list[int]] = []
+    seeds: list[int] = []
+    for group in groups:
+        seed = rng.getrandbits(32)
+        for rotated in rotations(group):
+            schedule.append(rotated)
+            seeds.append(seed)
+    return schedule, seeds
+
+def relative_scores(scores: list[float], group: list[int], winner_seat: int | None) -> None:
+    """ Add one game's relative outcome to scores (indexed by agent) """
+    if winner_seat is None or winner_seat < 0:
+        return  # Deck ran out: nobody won, nobody owes a share
+    share = 1 / len(group)
+    for agent in group:
+        scores[agent] -= share
+    scores[group[winner_seat]] += 1
+
+# --- how many games does duplicate save? ---
+
+class _HeuristicAgent:
+    """ Plays a random playable card with probability `skill`, otherwise draws when allowed """
+
+    def __init__(self, skill: float, seed: int) -> None:
+        from ismcts import legal_moves
+
+        self.legal_moves = legal_moves
+        self.skill = skill
+        self.rng = random.Random(seed)
+        self.agent_id = f"heuristic-{skill:.2f}"
+        self.first_name, self.last_name = "Heuristic", f"{skill:.2f}"
+
+    def choose_action(self, game):
+        moves = self.legal_moves(game)
+        plays = [move for key, move in moves.items() if key is not None]
+        if plays and (None not in moves or self.rng.random() < self.skill):
+            index, color = self.rng.choice(plays)
+            return index, color
+        return -1, None
+
+def _per_game_variance(blocks: dict[int, list[float]], games_per_block: int) -> float:
+    """ Pooled within-agent variance of block scores, per game (skill differences between agents removed) """
+    total, count = 0.0, 0
+    for values in blocks.values():
+        if len(values) < 2:
+            continue
+        mean = sum(values) / len(values)
+        total += sum((v - mean) ** 2 for v in values)
+        count += len(values) - 1
+    return total / count / games_per_block if count else 0.0
+
+def compare(n_agents: int = 12, deals: int = 30, seed: int = 0) -> float:
+    """
+    Play the same agents on `deals` independent groups of games and on `deals`
+    rotated duplicate deals, and return the ratio of games needed
+    (duplicate / independent) for the same standard error.
+    """
+    from main import play_game, RULES
+
+    seats = RULES.player_count
+    if n_agents % seats:
+        raise ValueError(f"n_agents must be a multiple of {seats}")
+    rng = random.Random(seed)
+    agents = [_HeuristicAgent(0.5 + 0.5 * i / max(n_agents - 1, 1), seed + i) for i in range(n_agents)]
+
+    # Both schedules seat each agent in `seats` games per block
+    blocks_independent: dict[int, list[float]] = {i: [] for i in range(n_agents)}
+    blocks_duplicate: dict[int, list[float]] = {i: [] for i in range(n_agents)}
+    game_id = 0
+    for _ in range(deals):
+        order = list(range(n_agents))
+        rng.shuffle(order)
+        groups = [order[i:i + seats] for i in range(0, n_agents, seats)]
+
+        for group in groups:
+            scores = [0.0] * n_agents
+            for rotated in rotations(group):
+                winner = play_game([agents[i] for i in rotated], game_id, round_num=-1)  # Fresh shuffle each game
+                relative_scores(scores, rotated, winner)
+                game_id += 1
+            for i in group:
+                blocks_independent[i].append(scores[i])
+
+            scores = [0.0] * n_agents
+            deal_seed = rng.getrandbits(32)
+            for rotated in rotations(group):
+                winner = play_game([agents[i] for i in rotated], game_id, round_num=-1, deal_seed=deal_seed)
+                relative_scores(scores, rotated, winner)
+                game_id += 1
+            for i in group:
+                blocks_duplicate[i].append(scores[i])
+
+    var_independent = _per_game_variance(blocks_independent, seats)
+    var_duplicate = _per_game_variance(blocks_duplicate, seats)
+    ratio = var_duplicate / var_independent if var_independent else 1.0
+    print(f"[duplicate] {game_id} games, score variance per game: independent {var_independent:.4f}, duplicate {var_duplicate:.4f}")
+    print(f"[duplicate] same standard error with {ratio:.0%} of the games ({1 - ratio:.0%} fewer)")
+    return ratio
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Measure how many games duplicate deals save.")
+    parser.add_argument("--agents", type=int, default=12)
+    parser.add_argument("--deals", type=int, default=30, help="rotated blocks per group for each schedule")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    compare(args.agents, args.deals, args.seed)
@@ -0,0 +1,268 @@
+"""
+Compact game records: a few bytes per game instead of a deck and a move list.
+
+Agents pick moves by argmax, so a training game is fully determined by the deck
+order, the agents' weights and the rules. The deck comes from the game's deal
+seed (main.new_game) and the weights from the agent's genome: a root agent is
+its initialization seed, a child is its parent plus seeded mutation noise
+(UnoAgent.seed). So every game is stored as
+
+    game_records   round, game, deal seed, seats (roster positions, 2 bytes each),
+                   winner, fingerprint of the final position
+    round_rosters  round, position -> agent_id          (once per round)
+    record_rounds  round -> rules/settings, RECORD_VERSION
+    agent_genomes  agent_id -> parent_id, seed, mutation rate
+
+and replay() plays it again on demand: it rebuilds the agents from their
+genomes, deals from the seed and plays through main.play_game, capturing the
+deck and every move. The result is checked against the stored winner and
+fingerprint, so a replay that drifted (different rules, torch version, code
+change) raises instead of showing a different game.
+
+    python game_records.py ROUND GAME --out saved_games/replay.yaml   # then load_game.py
+    python game_records.py ROUND --verify                              # re-simulate a round
+"""
+from __future__ import annotations
+
+import struct
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from uno import Game, GameSaver, SavedMove
+from db_utils import safe_fetchall
+
+if TYPE_CHECKING:
+    from agent import UnoAgent
+    from result_writer import ResultWriter
+
+RECORD_VERSION = 1  # Bump whenever a change to the engine or agents makes old records replay differently
+AGENT_CACHE_SIZE = 256  # Rebuilt weights kept by a Replayer, e.g. a whole lineage
+
+def settings() -> str:
+    """ Everything besides seeds and weights that decides how a game goes """
+    from main import RULES, SPARSE_INPUT
+
+    return f"{RULES!r} sparse_input={SPARSE_INPUT}"
+
+def pack_seats(positions: list[int]) -> bytes:
+    return struct.pack(f"<{len(positions)}H", *positions)
+
+def unpack_seats(seats: bytes) -> list[int]:
+    return list(struct.unpack(f"<{len(seats) // 2}H", seats))
+
+def fingerprint(game: Game) -> int:
+    """ Checksum of a finished game's final position """
+    summary = (
+        game.get_winner(),
+        len(game.deck.cards),
+        [len(player.cards) for player in game.players],
+        [len(game.history[seat]) for seat in range(len(game.players))],
+        [str(card) for card in game.played_cards[-8:]],
+    )
+    return zlib.crc32(repr(summary).encode())
+
+# --- recording (evolve_agents) ---
+
+class _PendingRecord:
+    """ play_game hook for one game being recorded """
+    __slots__ = ("recorder", "round_num", "game_id", "deal_seed", "seats")
+
+    def __init__(self, recorder: "GameRecorder", round_num: int, game_id: int, deal_seed: int, seats: bytes) -> None:
+        self.recorder = recorder
+        self.round_num = round_num
+        self.game_id = game_id
+        self.deal_seed = deal_seed
+        self.seats = seats
+
+    def start(self, game: Game) -> None:
+        pass
+
+    def finish(self, game: Game) -> None:
+        self.recorder.writer.save_game_record(
+            self.round_num, self.game_id, self.deal_seed, self.seats, game.get_winner(), fingerprint(game)
+        )
+
+class GameRecorder:
+    """ Writes genomes, rosters and per-game records through a ResultWriter """
+
+    def __init__(self, writer: "ResultWriter") -> None:
+        self.writer = writer
+
+    def add_agent(self, agent: "UnoAgent", mutation_rate: float | None = None) -> None:
+        """ Call once the agent's weights are final (after mutate for a child) """
+        self.writer.save_agent_genome(agent.agent_id, agent.parent_id, agent.seed, mutation_rate)
+
+    def begin_round(self, round_num: int, agents: list["UnoAgent"]) -> None:
+        """ Roster positions are what game records store in place of agent ids """
+        self.writer.save_round_roster(round_num, [agent.agent_id for agent in agents], settings(), RECORD_VERSION)
+
+    def game(self, round_num: int, game_id: int, deal_seed: int, positions: list[int]) -> _PendingRecord:
+        return _PendingRecord(self, round_num, game_id, deal_seed, pack_seats(positions))
+
+# --- replay ---
+
+class ReplayMismatch(RuntimeError):
+    pass
+
+class _Capture:
+    """ play_game hook collecting the pre-deal deck and every move through a GameSaver """
+
+    def __init__(self, seats: list[str], deal_seed: int) -> None:
+        self.seats = seats
+        self.deal_seed = deal_seed
+        self.deck: list[str] = []
+        self.moves: list[SavedMove] = []
+        self.fingerprint: int | None = None
+        self.winner: int | None = None
+
+    def start(self, game: Game) -> None:
+        self.deck = [str(card) for card in game.deck.cards]
+        saver = GameSaver(game, save_path=None)
+        saver.record(game)
+        self.moves = saver.move_list
+
+    def finish(self, game: Game) -> None:
+        self.winner = game.get_winner()
+        self.fingerprint = fingerprint(game)
+
+class Replayer:
+    """ Rebuilds agents from their genomes (cached) and re-simulates recorded games """
+
+    def __init__(self) -> None:
+        self._weights: OrderedDict[str, dict] = OrderedDict()
+
+    def agent(self, agent_id: str) -> "UnoAgent":
+        from agent import UnoAgent
+        from input_encoding import state_vector_size
+        from main import RULES
+
+        # The agent and its ancestors, nearest first
+        lineage = safe_fetchall("""
+            WITH RECURSIVE lineage(agent_id, parent_id, seed, mutation_rate, depth) AS (
+                SELECT agent_id, parent_id, seed, mutation_rate, 0 FROM agent_genomes WHERE agent_id = ?
+                UNION ALL
+                SELECT g.agent_id, g.parent_id, g.seed, g.mutation_rate, l.depth + 1
+                FROM agent_genomes g JOIN lineage l ON g.agent_id = l.parent_id
+            )
+            SELECT agent_id, parent_id, seed, mutation_rate FROM lineage ORDER BY depth
+        """, (agent_id,))
+        if not lineage:
+            raise KeyError(f"No genome recorded for agent {agent_id}")
+
+        input_size = state_vector_size(RULES.player_count)
+        # Start from the nearest ancestor already rebuilt, or from the root's initialization
+        start = next((i for i, (ancestor_id, *_) in enumerate(lineage) if ancestor_id in self._weights), None)
+        if start is not None:
+            cached_id, parent_id, seed, _ = lineage[start]
+            agent = UnoAgent(agent_id=cached_id, parent_id=parent_id, input_size=input_size)
+            agent.load_state_dict(self._weights[cached_id])
+            agent.seed = seed
+            self._weights.move_to_end(cached_id)
+        else:
+            root_id, parent_id, seed, _ = lineage[-1]
+            if parent_id is not None:
+                raise KeyError(f"Genome chain of {agent_id} is broken at {root_id} (parent {parent_id} not recorded)")
+            agent = UnoAgent(agent_id=root_id, parent_id=None, input_size=input_size, seed=seed)
+            self._remember(root_id, agent)
+            start = len(lineage) - 1
+
+        for child_id, parent_id, seed, mutation_rate in reversed(lineage[:start]):
+            child = UnoAgent(agent_id=child_id, parent_id=parent_id, input_size=input_size)
+            child.load_state_dict(agent.state_dict())
+            child.mutate(mutation_rate=mutation_rate, seed=seed)
+            self._remember(child_id, child)
+            agent = child
+        return agent
+
+    def _remember(self, agent_id: str, agent: "UnoAgent") -> None:
+        self._weights[agent_id] = {name: value.clone() for name, value in agent.state_dict().items()}
+        self._weights.move_to_end(agent_id)
+        while len(self._weights) > AGENT_CACHE_SIZE:
+            self._weights.popitem(last=False)
+
+    def replay(self, round_num: int, game_id: int) -> tuple[Game, list[SavedMove]]:
+        """ (game at its starting position, move list), like GameSaver.load; raises ReplayMismatch if it differs """
+        from uno import new_game_from_deck
+
+        capture = self._replay(round_num, game_id)
+        return new_game_from_deck(capture.deck, len(capture.seats)), capture.moves
+
+    def export(self, round_num: int, game_id: int, save_path: Path) -> None:
+        """ Write the replayed game as a regular GameSaver file (viewable with load_game.py) """
+        from main import new_game
+
+        capture = self._replay(round_num, game_id)
+        saver = GameSaver(new_game(capture.deal_seed), save_path)
+        saver.move_list = capture.moves
+        saver.export()
+
+    def _replay(self, round_num: int, game_id: int) -> _Capture:
+        from main import play_game
+
+        rows = safe_fetchall(
+            "SELECT deal_seed, seats, winner, fingerprint FROM game_records WHERE round_num = ? AND game_id = ?",
+            (round_num, game_id),
+        )
+        if not rows:
+            raise KeyError(f"No record of round {round_num} game {game_id}")
+        deal_seed, seats, winner, expected = rows[0]
+
+        (stored_settings, version), = safe_fetchall(
+            "SELECT settings, version FROM record_rounds WHERE round_num = ?", (round_num,)
+        )
+        if version != RECORD_VERSION or stored_settings != settings():
+            raise ReplayMismatch(
+                f"Round {round_num} was recorded with {stored_settings} (version {version}), "
+                f"now running {settings()} (version {RECORD_VERSION})"
+            )
+
+        roster = dict(safe_fetchall("SELECT position, agent_id FROM round_rosters WHERE round_num = ?", (round_num,)))
+        agents = [self.agent(roster[position]) for position in unpack_seats(seats)]
+
+        capture = _Capture([agent.agent_id for agent in agents], deal_seed)
+        play_game(agents, game_id, round_num, deal_seed=deal_seed, record=capture)
+        if capture.winner != winner or capture.fingerprint != expected:
+            raise ReplayMismatch(
+                f"Round {round_num} game {game_id} replayed differently "
+                f"(winner {capture.winner} vs {winner} recorded)"
+            )
+        return capture
+
+def verify_round(round_num: int) -> tuple[int, int]:
+    """ Re-simulate every recorded game of a round; returns (games, mismatches) """
+    replayer = Replayer()
+    game_ids = [game_id for game_id, in safe_fetchall(
+        "SELECT game_id FROM game_records WHERE round_num = ? ORDER BY game_id", (round_num,)
+    )]
+    mismatches = 0
+    for game_id in game_ids:
+        try:
+            replayer.replay(round_num, game_id)
+        except ReplayMismatch as e:
+            mismatches += 1
+            print(f"[records] {e}")
+    return len(game_ids), mismatches
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Re-simulate compactly recorded training games.")
+    parser.add_argument("round", type=int)
+    parser.add_argument("game", type=int, nargs="?")
+    parser.add_argument("--out", type=Path, help="write the replayed game as a GameSaver YAML file")
+    parser.add_argument("--verify", action="store_true", help="re-simulate every recorded game of the round")
+    args = parser.parse_args()
+
+    if args.verify or args.game is None:
+        games, mismatches = verify_round(args.round)
+        print(f"[records] round {args.round}: {games - mismatches}/{games} games replayed identically")
+    else:
+        replayer = Replayer()
+        if args.out:
+            replayer.export(args.round, args.game, args.out)
+            print(f"[records] wrote {args.out}")
+        else:
+            _, moves = replayer.replay(args.round, args.game)
+            print(f"[records] round {args.round} game {args.game}: {len(moves)} moves, replay verified")
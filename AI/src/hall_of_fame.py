@@ -0,0 +1,168 @@
+"""
+Hall of fame: frozen champion weights and evaluation of later agents against them,
+to tell whether round 400 agents actually beat round 50 agents.
+
+Every HOF_EVERY rounds the current champion's weights are stored in the
+hall_of_fame table and the top agents play every champion. A matchup is a
+fixed set of seeded deals (the seed set), each played twice with the two agents
+alternating seats (A B A B, then B A B A). Agents choose moves deterministically,
+so a matchup's result is fully determined by the pair and the seed set; it is
+stored in hof_results under that key and never played again.
+
+Matchups run on a background process pool that lives as long as the
+HallOfFame, so training continues while they play: evaluate() only queues
+them, and their results are written when collect() finds them finished (at
+the next checkpoint) or at close(). Weights are stored as NumPy arrays and the
+workers play with numpy_agent.NumpyAgent, so they never import torch.
+progress() turns the stored
+results into a curve: for each evaluation round, the evaluated agents' share of
+the decided games against each champion.
+"""
+from __future__ import annotations
+
+import multiprocessing
+from typing import TYPE_CHECKING
+
+import db_utils
+from db_utils import HOF_CHAMPION_SQL, HOF_RESULT_SQL, HOF_EVALUATION_SQL, safe_execute, safe_fetchall
+from numpy_agent import NumpyAgent, export_weights, weights_to_bytes
+
+if TYPE_CHECKING:
+    from agent import UnoAgent
+
+HOF_DEALS = 8  # Seeded deals per matchup, each played in both seatings
+
+def seed_set(deals: int = HOF_DEALS) -> tuple[str, list[int]]:
+    """ (name stored with each result, deal seeds); change the name whenever the seeds change """
+    return f"deals-{deals}", [7919 * i + 1 for i in range(deals)]
+
+def play_matchup(agent: "UnoAgent | NumpyAgent", champion: "UnoAgent | NumpyAgent", seeds: list[int]) -> tuple[int, int, int]:
+    """ (games, agent wins, champion wins); deck-outs count as games but neither side wins """
+    from main import play_game, RULES
+
+    seats = RULES.player_count
+    seatings = (
+        [agent if seat % 2 == 0 else champion for seat in range(seats)],
+        [champion if seat % 2 == 0 else agent for seat in range(seats)],
+    )
+    games = wins = champion_wins = 0
+    for seed in seeds:
+        for seating in seatings:
+            winner = play_game(seating, game_id=games, round_num=-1, deal_seed=seed)
+            games += 1
+            if winner is not None and winner >= 0:
+                if seating[winner] is agent:
+                    wins += 1
+                else:
+                    champion_wins += 1
+    return games, wins, champion_wins
+
+def _matchup_job(args: tuple) -> tuple[str, str, int, int, int]:
+    agent_id, weights, champion_id, seeds, db_path = args
+    db_utils.DB_PATH = db_path  # Spawned workers start from the module default
+    agent = NumpyAgent.from_bytes(weights, agent_id)
+    (champion_weights,), = safe_fetchall("SELECT weights FROM hall_of_fame WHERE agent_id = ?", (champion_id,))
+    champion = NumpyAgent.from_bytes(champion_weights, champion_id)
+    return (agent_id, champion_id, *play_matchup(agent, champion, seeds))
+
+class HallOfFame:
+    def __init__(self, deals: int = HOF_DEALS, processes: int | None = None, precision: str = "float32") -> None:
+        """
+        processes=0 plays matchups inside evaluate() instead of on the pool; champions
+        and evaluated agents are stored and played at `precision` (numpy_agent.PRECISIONS)
+        """
+        self.precision = precision
+        self.seed_set, self.seeds = seed_set(deals)
+        self.processes = processes
+        self._pool = None  # Started with the first matchup
+        self._pending: list[tuple[tuple[str, str], object]] = []  # ((agent_id, champion_id), AsyncResult) not written yet
+        self._queued: set[tuple[str, str]] = set()  # (agent_id, champion_id) being played
+
+    def add_champion(self, agent: "UnoAgent", round_num: int) -> None:
+        input_size = agent.net[0].in_features
+        safe_execute(HOF_CHAMPION_SQL, (
+            agent.agent_id, round_num, agent.first_name, agent.last_name, input_size, weights_to_bytes(export_weights(agent), self.precision)
+        ))
+
+    def champions(self) -> list[tuple[str, int]]:
+        """ (agent_id, round added), oldest first """
+        return safe_fetchall("SELECT agent_id, round_num FROM hall_of_fame ORDER BY round_num", ())
+
+    def evaluate(self, agents: list["UnoAgent"], round_num: int) -> int:
+        """ Queue every agent against every champion, skipping cached or queued matchups; returns matchups queued """
+        champion_ids = [champion_id for champion_id, _ in self.champions()]
+        cached = {
+            (agent_id, champion_id) for agent_id, champion_id in
+            safe_fetchall("SELECT agent_id, champion_id FROM hof_results WHERE seed_set = ?", (self.seed_set,))
+        }
+
+        jobs = []
+        for agent in agents:
+            safe_execute(HOF_EVALUATION_SQL, (round_num, agent.agent_id))
+            weights = None
+            for champion_id in champion_ids:
+                pair = (agent.agent_id, champion_id)
+                if champion_id == agent.agent_id or pair in cached or pair in self._queued:
+                    continue
+                weights = weights or weights_to_bytes(export_weights(agent), self.precision)
+                jobs.append((agent.agent_id, weights, champion_id, self.seeds, db_utils.DB_PATH))
+                self._queued.add(pair)
+
+        if self.processes == 0:
+            for job in jobs:
+                self._save(_matchup_job(job))
+            return len(jobs)
+        if jobs and self._pool is None:
+            self._pool = multiprocessing.get_context("spawn").Pool(self.processes)
+        self._pending += [((job[0], job[2]), self._pool.apply_async(_matchup_job, (job,))) for job in jobs]
+        return len(jobs)
+
+    def collect(self, wait: bool = False) -> int:
+        """ Write the results of finished matchups (all of them with wait=True); returns matchups still running """
+        still_running = []
+        for pair, result in self._pending:
+            if not (wait or result.ready()):
+                still_running.append((pair, result))
+                continue
+            try:
+                self._save(result.get())
+            except Exception as e:
+                # Not cached, so the pair is played again at the next evaluate()
+                print(f"[hall of fame] matchup {pair[0]} vs {pair[1]} failed: {e!r}")
+                self._queued.discard(pair)
+        self._pending = still_running
+        return len(still_running)
+
+    def close(self) -> None:
+        """ Wait for every queued matchup and stop the pool """
+        self.collect(wait=True)
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def _save(self, result: tuple[str, str, int, int, int]) -> None:
+        agent_id, champion_id, games, wins, champion_wins = result
+        safe_execute(HOF_RESULT_SQL, (agent_id, champion_id, self.seed_set, games, wins, champion_wins))
+        self._queued.discard((agent_id, champion_id))
+
+    def progress(self) -> list[tuple[int, int, float | None, int]]:
+        """
+        (evaluation round, champion round, evaluated agents' share of decided games, games)
+        per pair of rounds; a share above 0.5 means the later agents beat that champion.
+        """
+        return safe_fetchall("""
+            SELECT e.round_num, h.round_num,
+                   CAST(SUM(r.wins) AS REAL) / NULLIF(SUM(r.wins + r.champion_wins), 0),
+                   SUM(r.games)
+            FROM hof_evaluations e
+            JOIN hof_results r ON r.agent_id = e.agent_id AND r.seed_set = ?
+            JOIN hall_of_fame h ON h.agent_id = r.champion_id
+            GROUP BY e.round_num, h.round_num
+            ORDER BY e.round_num, h.round_num
+        """, (self.seed_set,))
+
+    def print_progress(self) -> None:
+        for eval_round, champion_round, share, games in self.progress():
+            shown = f"{share:.2f}" if share is not None else "n/a"
+            print(f"[hall of fame] round {eval_round} top agents vs round {champion_round} champion: {shown} ({games} games)")
@@ -1,19 +1,22 @@
-import torch
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
 import numpy as np
-import yaml
-from pathlib import Path
 
-# Load config and card/action mappings
-CONFIG_PATH = Path(__file__).resolve().parent / "../config/config.yaml"
-with open(CONFIG_PATH) as f:
-    config = yaml.safe_load(f)
+# Card/action mappings, compiled from config/config.yaml by build_action_table.py
+from action_table import ACTION_SPACE
+
+if TYPE_CHECKING:
+    import torch
 
-ACTION_SPACE = config["ACTIONS"]
 CARD_TO_INDEX = {card: i for i, card in enumerate(ACTION_SPACE)}
-print(len(CARD_TO_INDEX))
 INDEX_TO_CARD = {i: card for i, card in enumerate(ACTION_SPACE)}
 NUM_CARD_TYPES = len(CARD_TO_INDEX)
 
+def state_vector_size(player_count: int = 4, max_history_len: int = 5) -> int:
+    """ Length of the vector from build_state_tensor (1347 for the default 4 players) """
+    return player_count + NUM_CARD_TYPES * (2 + player_count * max_history_len) + 1
+
 def card_to_one_hot(card: str | None) -> np.ndarray:
     one_hot = np.zeros(NUM_CARD_TYPES, dtype=np.float32)
     if card in CARD_TO_INDEX:
@@ -21,6 +24,8 @@ def card_to_one_hot(card: str | None) -> np.ndarray:
     return one_hot
 
 def build_legal_mask(legal_cards: list[str | None]) -> torch.BoolTensor:
+    import torch
+
     mask = torch.zeros(NUM_CARD_TYPES + 1, dtype=torch.bool)  # +1 for DRAW
     
     for card in legal_cards:
@@ -41,7 +46,14 @@ def build_legal_mask(legal_cards: list[str | None]) -> torch.BoolTensor:
 
     return mask
 
-def build_state_tensor(
+# Hand card -> action indices it counts toward (a wild counts once for every color)
+_HAND_CARD_INDICES = {card: (i,) for card, i in CARD_TO_INDEX.items()}
+for _wild in ("WILD", "WILD_DRAW_FOUR"):
+    _HAND_CARD_INDICES[_wild] = tuple(
+        CARD_TO_INDEX[f"{color}_{_wild}"] for color in ("RED", "YELLOW", "BLUE", "GREEN") if f"{color}_{_wild}" in CARD_TO_INDEX
+    )
+
+def build_state_features(
     your_hand: list[str],
     last_card: str,
     other_hand_sizes: list[int],
@@ -49,46 +61,81 @@ def build_state_tensor(
     others_history: list[list[str]],
     clockwise_turn: bool,
     max_history_len: int = 5,
-) -> torch.Tensor:
-    vec = []
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    The state in sparse form: (indices, values) of the nonzero entries of
+    build_state_vector, in increasing index order. Typically ~30 of 1347 entries
+    are active, and the cost here grows with those, not with the vector size.
+    """
+    indices: list[int] = []
+    values: list[float] = []
 
     # Hand sizes (self and others), normalized
-    vec.append(min(len(your_hand), 20) / 20.0)
-    vec += [min(s, 20) / 20.0 for s in other_hand_sizes]
+    for i, size in enumerate([len(your_hand)] + other_hand_sizes):
+        if size:
+            indices.append(i)
+            values.append(min(size, 20) / 20.0)
+    offset = len(other_hand_sizes) + 1
 
     # Your hand: count of each card type
-    hand_counts = np.zeros(NUM_CARD_TYPES, dtype=np.float32)
-
+    hand_counts: dict[int, float] = {}
     for card in your_hand:
-        if card == "WILD":
-            for color in {"RED", "YELLOW", "BLUE", "GREEN"}:
-                key = color + "_WILD"
-                if key in CARD_TO_INDEX:
-                    hand_counts[CARD_TO_INDEX[key]] += 1.0
-        elif card == "WILD_DRAW_FOUR":
-            for color in {"RED", "YELLOW", "BLUE", "GREEN"}:
-                key = color + "_WILD_DRAW_FOUR"
-                if key in CARD_TO_INDEX:
-                    hand_counts[CARD_TO_INDEX[key]] += 1.0
-        elif card in CARD_TO_INDEX:
-            hand_counts[CARD_TO_INDEX[card]] += 1.0
-
-    vec += hand_counts.tolist()
+        for index in _HAND_CARD_INDICES.get(card, ()):
+            hand_counts[index] = hand_counts.get(index, 0.0) + 1.0
+    for index in sorted(hand_counts):
+        indices.append(offset + index)
+        values.append(hand_counts[index])
+    offset += NUM_CARD_TYPES
 
     # Last played card (one-hot)
-    vec += card_to_one_hot(last_card).tolist()
-
-    # Your play history (padded)
-    padded_history = (your_history + [None] * max_history_len)[:max_history_len]
-    for card in padded_history:
-        vec += card_to_one_hot(card).tolist()
-
-    # Each opponent’s play history (also padded)
-    for history in others_history:
-        padded = (history + [None] * max_history_len)[:max_history_len]
-        for card in padded:
-            vec += card_to_one_hot(card).tolist()
-    
-    vec.append(float(clockwise_turn)) # The current direction of play
+    if last_card in CARD_TO_INDEX:
+        indices.append(offset + CARD_TO_INDEX[last_card])
+        values.append(1.0)
+    offset += NUM_CARD_TYPES
+
+    # Your play history, then each opponent's (padded with empty slots)
+    for history in [your_history] + others_history:
+        for card in history[:max_history_len]:
+            if card in CARD_TO_INDEX:
+                indices.append(offset + CARD_TO_INDEX[card])
+                values.append(1.0)
+            offset += NUM_CARD_TYPES
+        offset += NUM_CARD_TYPES * max(max_history_len - len(history), 0)
+
+    if clockwise_turn: # The current direction of play
+        indices.append(offset)
+        values.append(1.0)
+
+    return np.array(indices, dtype=np.int64), np.array(values, dtype=np.float32)
+
+def build_state_vector(
+    your_hand: list[str],
+    last_card: str,
+    other_hand_sizes: list[int],
+    your_history: list[str],
+    others_history: list[list[str]],
+    clockwise_turn: bool,
+    max_history_len: int = 5,
+) -> np.ndarray:
+    """ The state as a float32 array, without torch (see numpy_agent.py) """
+    vec = np.zeros(state_vector_size(len(other_hand_sizes) + 1, max_history_len), dtype=np.float32)
+    indices, values = build_state_features(
+        your_hand, last_card, other_hand_sizes, your_history, others_history, clockwise_turn, max_history_len
+    )
+    vec[indices] = values
+    return vec
+
+def build_state_tensor(
+    your_hand: list[str],
+    last_card: str,
+    other_hand_sizes: list[int],
+    your_history: list[str],
+    others_history: list[list[str]],
+    clockwise_turn: bool,
+    max_history_len: int = 5,
+) -> torch.Tensor:
+    import torch
 
-    return torch.tensor(vec, dtype=torch.float32)
+    return torch.from_numpy(build_state_vector(
+        your_hand, last_card, other_hand_sizes, your_history, others_history, clockwise_turn, max_history_len
+    ))
@@ -0,0 +1,249 @@
+"""
+Information-set Monte Carlo tree search (single-observer ISMCTS) as a fixed
+reference opponent for the evolved population.
+
+Every simulation deals the cards the searching player cannot see at random
+(Game.determinize), walks one shared tree using only the moves legal in that
+deal, and finishes with a random playout. Moves are keyed by what is played,
+e.g. (Color.RED, CardType.SKIP) or (CardType.WILD, Color.BLUE), not by hand index,
+so one tree serves every deal.
+
+Search is root-parallel: each worker process grows its own tree with an equal
+share of the simulation budget and the root visit counts are summed.
+
+An ISMCTSAgent sits in play_game like any UnoAgent (get_player_action hands it
+the game). Run this file to pit it against fresh agents and measure playout speed:
+
+    python ismcts.py --games 20 --simulations 400 --workers 4
+"""
+from __future__ import annotations
+
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from uno import Game, CardType, Color
+
+ROLLOUT_DEPTH = 300   # plies before a playout is cut off and scored by hand size
+EXPLORATION = 0.7     # UCB constant; rewards are 0/1 wins
+DRAW_HAND_LIMIT = 15  # same rule as main.get_legal_action_indices: drawing with a playable card only below this
+
+_COLORS = (Color.RED, Color.YELLOW, Color.GREEN, Color.BLUE)
+_WILDS = (CardType.WILD, CardType.WILD_DRAW_FOUR)
+
+class _Node:
+    __slots__ = ("parent", "key", "player", "children", "visits", "wins", "avail")
+
+    def __init__(self, parent: "_Node | None", key, player: int) -> None:
+        self.parent = parent
+        self.key = key          # Move that led here
+        self.player = player    # Seat that made that move
+        self.children: dict = {}
+        self.visits = 0
+        self.wins = 0
+        self.avail = 1          # Times this move was legal when its parent was visited
+
+def _move_key(game: Game, move: tuple[int | None, Color | None]):
+    index, color = move
+    if index is None:
+        return None
+    card = game.players[game.whos_turn].cards[index]
+    if color is not None:
+        return (card.card_type, color)
+    return (card.color, card.card_type)
+
+def legal_moves(game: Game, draw_hand_limit: int = DRAW_HAND_LIMIT) -> dict:
+    """ move key -> (hand index, color) for the current player, with the training draw rule """
+    moves = game.legal_moves()
+    if len(moves) > 1 and len(game.players[game.whos_turn].cards) >= draw_hand_limit:
+        moves.pop()  # (None, None): must play while holding a big hand
+    return {_move_key(game, move): move for move in moves}
+
+def _playout(game: Game, rng: random.Random, depth: int) -> int:
+    """ Random playout: a random playable card if there is one, else draw. Returns the winning seat """
+    for _ in range(depth):
+        if game.is_game_over():
+            return game.get_winner()
+        playable = game.get_playable_cards(game.players[game.whos_turn])
+        if playable:
+            index, card = rng.choice(playable)
+            color = rng.choice(_COLORS) if card.card_type in _WILDS else None
+            game.apply(index, color)
+        else:
+            game.apply(None)
+
+    # Cut off: the smallest hand is the likeliest winner
+    sizes = [len(player.cards) for player in game.players]
+    return sizes.index(min(sizes))
+
+def search(
+    game: Game,
+    simulations: int,
+    seed: int | None = None,
+    exploration: float = EXPLORATION,
+    rollout_depth: int = ROLLOUT_DEPTH,
+    draw_hand_limit: int = DRAW_HAND_LIMIT,
+) -> dict:
+    """ Grow one tree from the current player's point of view; returns {move key: (visits, wins)} at the root """
+    rng = random.Random(seed)
+    seat = game.whos_turn
+    root = _Node(None, None, -1)
+
+    for _ in range(simulations):
+        state = game.determinize(seat, rng)
+        node = root
+
+        # Selection / expansion over the moves legal in this deal
+        while not state.is_game_over():
+            moves = legal_moves(state, draw_hand_limit)
+            untried = [key for key in moves if key not in node.children]
+            for key in moves:
+                if key in node.children:
+                    node.children[key].avail += 1
+
+            if untried:
+                key = rng.choice(untried)
+                child = _Node(node, key, state.whos_turn)
+                node.children[key] = child
+                state.apply(*moves[key])
+                node = child
+                break
+
+            # UCB over availability counts, since a child is not legal in every deal
+            node = max(
+                (node.children[key] for key in moves),
+                key=lambda c: c.wins / c.visits + exploration * math.sqrt(math.log(c.avail) / c.visits),
+            )
+            state.apply(*moves[node.key])
+
+        winner = _playout(state, rng, rollout_depth)
+
+        while node is not None:
+            node.visits += 1
+            if node.player == winner:
+                node.wins += 1
+            node = node.parent
+
+    return {key: (child.visits, child.wins) for key, child in root.children.items()}
+
+def _search_job(args: tuple) -> dict:
+    game, simulations, seed, kwargs = args
+    return search(game, simulations, seed, **kwargs)
+
+class ISMCTSAgent:
+    """
+    Reference opponent for play_game. simulations is the budget per move, split
+    across `workers` processes (1 = search in the calling process).
+    """
+
+    def __init__(
+        self,
+        simulations: int = 400,
+        workers: int = 1,
+        seed: int | None = None,
+        exploration: float = EXPLORATION,
+        rollout_depth: int = ROLLOUT_DEPTH,
+        draw_hand_limit: int = DRAW_HAND_LIMIT,
+    ) -> None:
+        self.simulations = simulations
+        self.workers = workers
+        self.rng = random.Random(seed)
+        self.search_kwargs = {"exploration": exploration, "rollout_depth": rollout_depth, "draw_hand_limit": draw_hand_limit}
+
+        self.agent_id = f"ismcts-{simulations}"
+        self.first_name = "ISMCTS"
+        self.last_name = str(simulations)
+        self.games_played = 0
+        self.wins = 0
+
+        # Benchmark counters
+        self.decisions = 0
+        self.total_simulations = 0
+        self.search_seconds = 0.0
+
+        self._pool: ProcessPoolExecutor | None = None
+
+    def choose_action(self, game: Game) -> tuple[int, Color | None]:
+        """ (hand index or -1 for draw, color for wilds), the same as main.get_player_action """
+        moves = legal_moves(game, self.search_kwargs["draw_hand_limit"])
+        if len(moves) == 1:
+            index, color = next(iter(moves.values()))
+            return (index if index is not None else -1, color)
+
+        start = time.perf_counter()
+        stats = self._root_stats(game)
+        self.search_seconds += time.perf_counter() - start
+        self.decisions += 1
+        self.total_simulations += self.simulations
+
+        best = max(moves, key=lambda key: stats.get(key, (0, 0)))
+        index, color = moves[best]
+        return (index if index is not None else -1, color)
+
+    def _root_stats(self, game: Game) -> dict:
+        if self.workers <= 1:
+            return search(game, self.simulations, self.rng.getrandbits(32), **self.search_kwargs)
+
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=get_context("spawn"))
+        # clone() drops listeners (e.g. a GameSaver) so only the position is pickled
+        position = game.clone()
+        share, extra = divmod(self.simulations, self.workers)
+        jobs = [
+            (position, share + (i < extra), self.rng.getrandbits(32), self.search_kwargs)
+            for i in range(self.workers)
+        ]
+
+        totals: dict = {}
+        for stats in self._pool.map(_search_job, jobs):
+            for key, (visits, wins) in stats.items():
+                total_visits, total_wins = totals.get(key, (0, 0))
+                totals[key] = (total_visits + visits, total_wins + wins)
+        return totals
+
+    @property
+    def simulations_per_second(self) -> float:
+        return self.total_simulations / self.search_seconds if self.search_seconds else 0.0
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+def benchmark(games: int, simulations: int, workers: int, seed: int | None = None) -> None:
+    """ ISMCTS in seat 0 against freshly initialized UnoAgents, through main.play_game """
+    from agent import UnoAgent
+    from main import play_game, RULES
+    from input_encoding import state_vector_size
+
+    if seed is not None:
+        random.seed(seed)
+    reference = ISMCTSAgent(simulations, workers, seed)
+    input_size = state_vector_size(RULES.player_count)
+    wins = 0
+    try:
+        for game_id in range(games):
+            opponents = [UnoAgent(agent_id=f"random-{i}", parent_id=None, input_size=input_size) for i in range(RULES.player_count - 1)]
+            winner = play_game([reference] + opponents, game_id, round_num=-1)
+            wins += winner == 0
+            print(f"[ismcts] game {game_id + 1}/{games}: winner seat {winner}, {wins} ISMCTS wins")
+    finally:
+        reference.close()
+
+    print(f"[ismcts] win rate {wins / games:.2f} vs {RULES.player_count - 1} untrained agents "
+          f"(chance {1 / RULES.player_count:.2f})")
+    print(f"[ismcts] {reference.decisions} searched decisions, "
+          f"{reference.simulations_per_second:.0f} simulations/s with {workers} worker(s)")
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Play the ISMCTS reference agent against untrained agents.")
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--simulations", type=int, default=400, help="simulation budget per move")
+    parser.add_argument("--workers", type=int, default=1, help="root-parallel search processes")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    benchmark(args.games, args.simulations, args.workers, args.seed)
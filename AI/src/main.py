@@ -1,14 +1,19 @@
-from uno import Game, GameSaver, Player, Color
-from agent import UnoAgent
-from input_encoding import build_state_tensor, CARD_TO_INDEX, INDEX_TO_CARD
-from db_utils import init_db, save_game_result, save_agent_score, save_agent_snapshot
+from __future__ import annotations
+
+from uno import Game, GameSaver, Player, Color, RuleSet
+from input_encoding import build_state_vector, build_state_features, state_vector_size, CARD_TO_INDEX, INDEX_TO_CARD
 import uuid  # For generating unique agent IDs
 
 import time
 from pathlib import Path
-from typing import List
+from typing import List, TYPE_CHECKING
 import random
-from tqdm import tqdm
+
+if TYPE_CHECKING:
+    # torch is only imported once agents are actually built (see evolve_agents)
+    from agent import UnoAgent
+    from uno import SpectatorPublisher
+    from trajectories import TrajectoryWriter
 
 DRAW_ACTION = "DRAW"  # Your global draw action
 DRAW_INDEX = CARD_TO_INDEX[DRAW_ACTION]  # Index of the draw action in action space
@@ -70,25 +75,22 @@ def map_action_index_to_hand_card(action_idx: int, player: Player) -> int | None
             return hand_idx
     raise KeyError
 
-def get_player_action(player: Player, game: Game, agent: UnoAgent) -> tuple[int | None, Color | None]:
+def get_state_args(player: Player, game: Game) -> dict:
+    """ What the player can see, as keyword arguments for the input_encoding builders """
     your_hand = [str(card) for card in player.cards]
     last_card = str(game.played_cards[-1]) if game.played_cards else "None"
 
     player_seat = get_seat_position(player, game)
-    other_hand_sizes = [
-        len(game.players[(player_seat + i) % 4].cards)
-        for i in range(1, 4)
-    ]
+    num_players = len(game.players)
+    opponent_ids = [(player_seat + i) % num_players for i in range(1, num_players)]
+    other_hand_sizes = [len(game.players[pid].cards) for pid in opponent_ids]
 
     your_history = [str(card) for card in game.history[player_seat]]
-    opponent_ids = [(player_seat + i) % 4 for i in range(1, 4)]
     others_history = [
         [str(card) for card in game.history[pid]] for pid in opponent_ids
     ]
 
-    legal_action_indices = get_legal_action_indices(player, game)
-
-    state_tensor = build_state_tensor(
+    return dict(
         your_hand=your_hand,
         last_card=last_card,
         other_hand_sizes=other_hand_sizes,
@@ -97,29 +99,153 @@ def get_player_action(player: Player, game: Game, agent: UnoAgent) -> tuple[int
         clockwise_turn=game.clockwise_turn
     )
 
-    chosen_action_idx = agent.decide(state_tensor, legal_action_indices)
-
-    chosen_card_str = INDEX_TO_CARD[chosen_action_idx]
+def action_to_move(action_idx: int, player: Player) -> tuple[int, Color | None]:
+    """ (hand index or -1 for draw, color for wilds) for a global action index """
+    chosen_card_str = INDEX_TO_CARD[action_idx]
     chosen_color = None
     if "WILD" in chosen_card_str:
         color_str = chosen_card_str.split('_')[0]  # e.g. "RED_WILD" -> "RED"
         chosen_color = Color[color_str]  # get enum by key
 
-    hand_card_index = map_action_index_to_hand_card(chosen_action_idx, player)
+    hand_card_index = map_action_index_to_hand_card(action_idx, player)
 
     # Return hand index or -1 for draw, plus color choice (None if no color)
     return (hand_card_index if hand_card_index is not None else -1, chosen_color)
 
-NUM_AGENTS = 100
-AGENTS_PER_GAME = 4
-GAMES_PER_ROUND = 1000
+def get_player_action(
+    player: Player, game: Game, agent: UnoAgent, recorder: TrajectoryWriter | None = None
+) -> tuple[int | None, Color | None]:
+    if hasattr(agent, "choose_action"):
+        # Search agents (e.g. ismcts.ISMCTSAgent) look at the game itself, not the encoded state
+        return agent.choose_action(game)
+
+    state_args = get_state_args(player, game)
+    legal_action_indices = get_legal_action_indices(player, game)
+
+    if SPARSE_INPUT:
+        indices, values = build_state_features(**state_args)
+        chosen_action_idx = agent.decide_sparse(indices, values, legal_action_indices)
+        if recorder:
+            state_vector = build_state_vector(**state_args)
+    else:
+        # A NumPy array: UnoAgent converts it, numpy_agent.NumpyAgent uses it as is
+        state_vector = build_state_vector(**state_args)
+        chosen_action_idx = agent.decide(state_vector, legal_action_indices)
+
+    if recorder:
+        recorder.record(state_vector, legal_action_indices, chosen_action_idx, get_seat_position(player, game))
+    return action_to_move(chosen_action_idx, player)
+
+RULES = RuleSet()  # Game variant used for training, e.g. RuleSet(player_count=6, cross_stacking=True)
+TABLES = 25  # Games at once when every agent plays one game; the population fills them exactly
+SITTINGS = 40  # Games each agent plays per round
+AGENTS_PER_GAME = RULES.player_count
+NUM_AGENTS = TABLES * AGENTS_PER_GAME
+GAMES_PER_ROUND = TABLES * SITTINGS
 ROUNDS = 500
-TOP_K = 25
+TOP_K = NUM_AGENTS // 4
 SAVE_DIR = Path("saved_games")
 
-def play_game(agents: List[UnoAgent], game_id: int, round_num: int, save_game: bool = False) -> int | None:
-    uno_game = Game()
-    uno_game.deck.shuffle()
+# Highlight reels: record the reigning champion's first few games each round and render
+# them to frames on background processes (needs pygame; see uno_pygame/src/headless.py)
+RENDER_HIGHLIGHTS = False
+HIGHLIGHT_GAMES = 2
+HIGHLIGHT_DIR = Path("renders")
+
+# Live spectating: every SPECTATE_EVERY-th game is offered to observers connected with
+# `python load_game.py --live 127.0.0.1:50555`; costs nothing while nobody is connected
+SPECTATE = False
+SPECTATE_PORT = 50555
+SPECTATE_EVERY = 50
+
+# Racing evaluation: play each round in stages and stop scheduling agents that are clearly
+# in or out of the TOP_K (see racing.py; `python racing.py` measures the selection quality)
+RACING = False
+RACING_CONFIDENCE = 0.95
+
+# Duplicate deals: each group plays one seeded deal in every seat rotation and agents are
+# ranked by wins relative to their group, cancelling deal luck (see duplicate.py). Whole
+# sittings are rotated so every agent plays as many games as the others: SITTINGS // AGENTS_PER_GAME
+# sittings (at least one) of AGENTS_PER_GAME rotations each, about GAMES_PER_ROUND games in all
+DUPLICATE = False
+
+# Ratings (see ratings.py) are updated after every game and carried across rounds, children
+# start from their parent's. With RATING_SELECTION survivors are picked by rating instead of
+# this round's wins, so fewer GAMES_PER_ROUND are needed once ratings have settled
+RATING_SELECTION = False
+
+# Hall of fame: every HOF_EVERY rounds the champion's weights are frozen and the top HOF_TOP
+# agents play every champion so far on fixed seeded deals (see hall_of_fame.py); results are
+# cached per matchup, so only new pairs are played, on a background pool while training goes on
+HALL_OF_FAME = False
+HOF_EVERY = 25
+HOF_TOP = 5
+HOF_PROCESSES = 1  # Background processes playing matchups while training goes on
+
+# Sparse input: encode states as (active indices, values) and run the first layer over those
+# weight columns only; same decisions as the dense vector (see input_encoding.build_state_features)
+SPARSE_INPUT = False
+
+# Trajectory dataset: every TRAJECTORY_EVERY-th game's decisions (state, legal mask, action,
+# seat, outcome) are appended to memory-mapped shards in TRAJECTORY_DIR (see trajectories.py)
+RECORD_TRAJECTORIES = False
+TRAJECTORY_EVERY = 10
+TRAJECTORY_DIR = Path("trajectories")
+
+# Compact game records: store every game as its deal seed and roster positions (a few bytes)
+# plus each agent's genome, and re-simulate the moves on demand (see game_records.py)
+COMPACT_RECORDS = False
+MUTATION_RATE = 0.1
+
+# Cluster: games are played by workers started anywhere with `python cluster.py worker --connect HOST:50600`
+# plus CLUSTER_LOCAL_WORKERS started here (e.g. one per spare core); each round waits for CLUSTER_WORKERS
+# of them. Games are streamed in adaptively sized chunks and idle workers steal queued ones; tail latency
+# and utilization are printed per round. Games that are saved, highlighted, spectated or recorded are
+# still played here (see cluster.py). Workers play with NumpyAgent, which chooses like UnoAgent up to
+# float rounding (and INFERENCE_PRECISION), so a remote game's winner can in rare close calls differ from
+# the one this process would have produced; results never depend on which worker played a game
+CLUSTER = False
+CLUSTER_PORT = 50600
+CLUSTER_WORKERS = 1
+CLUSTER_LOCAL_WORKERS = 0
+
+# Inference precision (one of numpy_agent.PRECISIONS) of the weights sent to cluster workers and
+# stored for hall-of-fame champions, which play at that precision. Below float32 they are 2-4x
+# smaller but may choose differently; `python numpy_agent.py --precisions` measures how often
+INFERENCE_PRECISION = "float32"
+
+def new_game(deal_seed: int | None = None) -> Game:
+    """ A game with a shuffled deck, not yet dealt; the same deal_seed gives the same deck order """
+    uno_game = Game(rules=RULES)
+    if deal_seed is None:
+        uno_game.deck.shuffle()
+    else:
+        random.Random(deal_seed).shuffle(uno_game.deck.cards)
+    return uno_game
+
+def play_game(
+    agents: List[UnoAgent],
+    game_id: int,
+    round_num: int,
+    save_game: bool = False,
+    publisher: SpectatorPublisher | None = None,
+    deal_seed: int | None = None,
+    recorder: TrajectoryWriter | None = None,
+    record=None,
+) -> int | None:
+    """
+    deal_seed replays the same shuffle for every game given it (duplicate deals);
+    recorder gets every encoded decision and the outcome (search agents' moves are not recorded);
+    record.start(game) / record.finish(game) are called before the deal and at the end (see game_records.py)
+    """
+    uno_game = new_game(deal_seed)
+    if record:
+        record.start(uno_game)
+
+    # Only streamed if someone is watching; otherwise the per-move checks below are all that's paid
+    publishing = publisher is not None and publisher.begin_game(
+        uno_game, {"round": round_num, "game": game_id, "agents": [f"{a.first_name} {a.last_name}" for a in agents]}
+    )
 
     game_saver = None
     if save_game:
@@ -127,6 +253,7 @@ def play_game(agents: List[UnoAgent], game_id: int, round_num: int, save_game: b
         save_path = SAVE_DIR / f"round_{round_num}_game_{game_id}_{timestamp}.yaml"
         game_saver = GameSaver(uno_game, save_path)
         game_saver.export()
+        game_saver.record(uno_game)
         
     uno_game.deal_cards()
     uno_game.played_cards.append(uno_game.deck.cards.pop())
@@ -137,33 +264,111 @@ def play_game(agents: List[UnoAgent], game_id: int, round_num: int, save_game: b
         current_player = uno_game.players[uno_game.whos_turn]
         agent = agents[uno_game.whos_turn]
 
-        card_idx, color_choice = get_player_action(current_player, uno_game, agent)
+        card_idx, color_choice = get_player_action(current_player, uno_game, agent, recorder)
 
         if card_idx == -1:
             uno_game.play(None)
-            if game_saver:
-                game_saver.save_move(None)
+            if publishing:
+                publisher.move(None)
         else:
             played_card = current_player.cards[card_idx]
             uno_game.play(played_card, color_input=color_choice)
-            if game_saver:
-                game_saver.save_move(card_idx)
+            if publishing:
+                publisher.move(card_idx, color_choice)
 
         game_length += 1
     
     if game_saver:
         game_saver.export()
+    if publishing:
+        publisher.end_game(uno_game.get_winner())
+    if recorder:
+        recorder.end_game(uno_game.get_winner(), round_num, game_id)
+    if record:
+        record.finish(uno_game)
     
     return uno_game.get_winner()
 
+def play_remote(coordinator, agents: List[UnoAgent], schedule: list[list[int]], deal_seeds: list[int]) -> dict[int, int | None]:
+    """ Winners of the round's games that need nothing from this process, played by the cluster """
+    from numpy_agent import export_weights, weights_to_bytes
+
+    local = {0}  # Saved to SAVE_DIR
+    if RENDER_HIGHLIGHTS:
+        local.update([game_id for game_id, agent_indices in enumerate(schedule) if 0 in agent_indices][:HIGHLIGHT_GAMES])
+    if SPECTATE:
+        local.update(range(0, len(schedule), SPECTATE_EVERY))
+    if RECORD_TRAJECTORIES:
+        local.update(range(0, len(schedule), TRAJECTORY_EVERY))
+    games = [
+        [game_id, [agents[i].agent_id for i in agent_indices], deal_seeds[game_id]]
+        for game_id, agent_indices in enumerate(schedule) if game_id not in local
+    ]
+    if not games:
+        return {}
+
+    if not coordinator.wait_for_workers(CLUSTER_WORKERS, timeout=0):
+        print(f"[cluster] waiting for {CLUSTER_WORKERS} workers on port {CLUSTER_PORT}")
+        coordinator.wait_for_workers(CLUSTER_WORKERS)
+    weights = {agent.agent_id: weights_to_bytes(export_weights(agent), INFERENCE_PRECISION) for agent in agents}
+    winners = coordinator.play(weights, games)
+    print(f"[cluster] {coordinator.report()}")
+    return winners
+
 def evolve_agents():
-    init_db()  # Ensure tables exist
+    from tqdm import tqdm
+    from agent import UnoAgent
+    from db_utils import init_db
+    from result_writer import ResultWriter
+    from ratings import RatingTable
+    from hall_of_fame import HallOfFame
 
-    agents = [UnoAgent(agent_id=str(uuid.uuid4()), parent_id=None) for _ in range(NUM_AGENTS)]
+    init_db()  # Ensure tables exist
+    # Results are persisted on a background thread; pending writes are drained at exit/Ctrl-C
+    writer = ResultWriter()
+
+    publisher = None
+    if SPECTATE:
+        from uno import SpectatorPublisher
+        publisher = SpectatorPublisher(port=SPECTATE_PORT)
+
+    renderer = None
+    if RENDER_HIGHLIGHTS:
+        from uno_pygame.src.headless import HighlightRenderer
+        renderer = HighlightRenderer(HIGHLIGHT_DIR)
+
+    recorder = None
+    if RECORD_TRAJECTORIES:
+        from trajectories import TrajectoryWriter
+        recorder = TrajectoryWriter(TRAJECTORY_DIR, state_vector_size(RULES.player_count))
+
+    records = None
+    if COMPACT_RECORDS:
+        from game_records import GameRecorder
+        records = GameRecorder(writer)
+
+    coordinator = None
+    if CLUSTER:
+        from cluster import Coordinator
+        coordinator = Coordinator(port=CLUSTER_PORT)
+        coordinator.spawn_local_workers(CLUSTER_LOCAL_WORKERS)
+
+    input_size = state_vector_size(RULES.player_count)
+    agents = [
+        UnoAgent(agent_id=str(uuid.uuid4()), parent_id=None, input_size=input_size, seed=random.getrandbits(63))
+        for _ in range(NUM_AGENTS)
+    ]
     for agent in agents:
         agent.create_name(parent_last_name=None)
+        if records:
+            records.add_agent(agent)
     scores = [0] * NUM_AGENTS
-    games_per_agent = (GAMES_PER_ROUND * AGENTS_PER_GAME) // NUM_AGENTS
+    ratings = RatingTable()
+    hall_of_fame = HallOfFame(processes=HOF_PROCESSES, precision=INFERENCE_PRECISION) if HALL_OF_FAME else None
+    assert NUM_AGENTS % AGENTS_PER_GAME == 0, "NUM_AGENTS must be divisible by the player count"
+    assert not (RACING and DUPLICATE), "RACING and DUPLICATE are separate schedules, enable one"
+    assert not (RACING and CLUSTER), "RACING schedules games one stage at a time, CLUSTER needs the whole round"
+    assert not (COMPACT_RECORDS and CLUSTER), "COMPACT_RECORDS checks every game as it is played here, leaving CLUSTER nothing to play"
     assert GAMES_PER_ROUND % (NUM_AGENTS // AGENTS_PER_GAME) == 0, "GAMES_PER_ROUND must be divisible by (NUM_AGENTS / AGENTS_PER_GAME)"
 
     games_per_round = NUM_AGENTS // AGENTS_PER_GAME
@@ -182,12 +387,58 @@ def evolve_agents():
 
         assert len(full_schedule) == GAMES_PER_ROUND
 
-        for game_id, agent_indices in enumerate(tqdm(full_schedule, desc=f"Round {round_num + 1}", unit="game")):
+        race = None
+        schedule = full_schedule
+        deal_seeds: list[int | None] = [None] * GAMES_PER_ROUND
+        if DUPLICATE:
+            from duplicate import duplicate_schedule, relative_scores
+            duplicate_sittings = max(1, SITTINGS // AGENTS_PER_GAME)
+            schedule, deal_seeds = duplicate_schedule(full_schedule[:TABLES * duplicate_sittings], random)
+        elif RACING:
+            from racing import Race
+            race = Race(NUM_AGENTS, TOP_K, AGENTS_PER_GAME, GAMES_PER_ROUND, confidence=RACING_CONFIDENCE)
+            schedule = race.games()
+        if records or coordinator:
+            # Every recorded game needs its own seed to be replayable, and a game played remotely
+            # must give the same result whichever worker plays it
+            deal_seeds = [seed if seed is not None else random.getrandbits(63) for seed in deal_seeds]
+        if records:
+            records.begin_round(round_num, agents)
+
+        remote_winners: dict[int, int | None] = {}
+        if coordinator:
+            remote_winners = play_remote(coordinator, agents, schedule, deal_seeds)
+
+        games_played = [0] * NUM_AGENTS
+        duplicate_scores = [0.0] * NUM_AGENTS
+        highlight_ids: list[int] = []
+        total_games = len(schedule) if isinstance(schedule, list) else GAMES_PER_ROUND
+        for game_id, agent_indices in enumerate(tqdm(schedule, desc=f"Round {round_num + 1}", unit="game", total=total_games)):
             game_agents = [agents[i] for i in agent_indices]
-            for agent in game_agents:
+            for i, agent in zip(agent_indices, game_agents):
                 agent.games_played += 1
+                games_played[i] += 1
             save_game = game_id < 1
-            winner_idx = play_game(game_agents, game_id, round_num, save_game)
+
+            # agents[0] is the previous round's top survivor
+            if renderer and 0 in agent_indices and len(highlight_ids) < HIGHLIGHT_GAMES:
+                highlight_ids.append(game_id)
+                save_game = True
+
+            game_publisher = publisher if game_id % SPECTATE_EVERY == 0 else None
+            game_recorder = recorder if game_id % TRAJECTORY_EVERY == 0 else None
+            game_record = records.game(round_num, game_id, deal_seeds[game_id], agent_indices) if records else None
+            if game_id in remote_winners:
+                winner_idx = remote_winners[game_id]
+            else:
+                winner_idx = play_game(
+                    game_agents, game_id, round_num, save_game, game_publisher, deal_seeds[game_id], game_recorder, game_record
+                )
+            ratings.record([agent.agent_id for agent in game_agents], winner_idx)
+            if race:
+                race.record(agent_indices, winner_idx)
+            if DUPLICATE:
+                relative_scores(duplicate_scores, agent_indices, winner_idx)
             
             if winner_idx != None:
                 global_winner_idx = agent_indices[winner_idx]
@@ -196,20 +447,49 @@ def evolve_agents():
                 winner_agent.wins += 1
 
                 # Save to DB
-                save_game_result(round_num, game_id, winner_agent.agent_id)
+                writer.save_game_result(round_num, game_id, winner_agent.agent_id)
             else:
-                save_game_result(round_num, game_id, "None")
+                writer.save_game_result(round_num, game_id, "None")
+
+        if renderer:
+            for game_id in highlight_ids:
+                for save_path in SAVE_DIR.glob(f"round_{round_num}_game_{game_id}_*.yaml"):
+                    renderer.submit(save_path)
+
+        if race:
+            print(f"[racing] {race.report(GAMES_PER_ROUND)}")
 
         # Log scores and snapshots
-        for agent, score in zip(agents, scores):
-            save_agent_score(agent.agent_id, round_num, score)
-            save_agent_snapshot(agent.agent_id, round_num, agent.serialize_weights(), agent.metadata())
+        for agent, score, games in zip(agents, scores, games_played):
+            writer.save_agent_score(agent.agent_id, round_num, score, games)
+            rating = ratings.get(agent.agent_id)
+            writer.save_agent_rating(agent.agent_id, round_num, rating.mu, rating.sigma, rating.games)
+            # state_dict() is serialized on the writer thread; survivors are never mutated in place
+            writer.save_agent_snapshot(agent.agent_id, round_num, agent.state_dict(), agent.metadata())
+        writer.refresh_round_aggregates(round_num)
+        if recorder:
+            recorder.flush()
 
         # Selection
-        agent_score_pairs = list(zip(agents, scores))
-        agent_score_pairs.sort(key=lambda x: x[1], reverse=True)
+        if race:
+            survivors = [agents[i] for i in race.ranking()[:TOP_K]]
+        elif RATING_SELECTION:
+            survivors = sorted(agents, key=lambda a: ratings.get(a.agent_id).conservative, reverse=True)[:TOP_K]
+        elif DUPLICATE:
+            ranking = sorted(range(NUM_AGENTS), key=lambda i: duplicate_scores[i], reverse=True)
+            survivors = [agents[i] for i in ranking[:TOP_K]]
+        else:
+            agent_score_pairs = list(zip(agents, scores))
+            agent_score_pairs.sort(key=lambda x: x[1], reverse=True)
+
+            survivors = [a for a, _ in agent_score_pairs[:TOP_K]]
 
-        survivors = [a for a, _ in agent_score_pairs[:TOP_K]]
+        if hall_of_fame and (round_num + 1) % HOF_EVERY == 0:
+            running = hall_of_fame.collect()  # Whatever finished since the last checkpoint
+            hall_of_fame.print_progress()
+            hall_of_fame.add_champion(survivors[0], round_num)
+            queued = hall_of_fame.evaluate(survivors[:HOF_TOP], round_num)
+            print(f"[hall of fame] {queued} new matchups against {len(hall_of_fame.champions())} champions queued, {running} still running")
 
         score_counts = {}
         for score in scores:
@@ -222,15 +502,31 @@ def evolve_agents():
         new_agents = survivors[:]
         while len(new_agents) < NUM_AGENTS:
             parent = random.choice(survivors)
-            child = UnoAgent(agent_id=str(uuid.uuid4()), parent_id=parent.agent_id)
+            child = UnoAgent(agent_id=str(uuid.uuid4()), parent_id=parent.agent_id, input_size=input_size)
             child.load_state_dict(parent.state_dict())
-            child.mutate(mutation_rate=0.1)
+            child.mutate(mutation_rate=MUTATION_RATE)
             child.create_name(parent_last_name=parent.last_name)
+            ratings.seed_child(child.agent_id, parent.agent_id)
+            if records:
+                records.add_agent(child, MUTATION_RATE)
             new_agents.append(child)
 
         agents = new_agents
+        ratings.keep(agent.agent_id for agent in agents)
         scores = [0] * NUM_AGENTS
 
+    if hall_of_fame:
+        hall_of_fame.close()
+        hall_of_fame.print_progress()
+    writer.close()
+    if coordinator:
+        coordinator.close()
+    if recorder:
+        recorder.close()
+    if renderer:
+        renderer.close()
+    if publisher:
+        publisher.close()
     return agents
 
 if __name__ == "__main__":
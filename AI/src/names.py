@@ -0,0 +1,96 @@
+"""
+Name tables used by UnoAgent.create_name.
+
+Each names/*.txt list is packed once into a binary index next to it
+(<name>.idx: magic, count, count + 1 uint32 offsets, then the utf-8 names)
+and memory-mapped. Looking up a name is an offset read plus a slice, so
+sampling is O(1) and, after the first call in a process, costs no file I/O.
+Forked workers inherit the mapping and spawned ones share the same pages
+through the OS page cache.
+"""
+import mmap
+import os
+import random
+import struct
+from pathlib import Path
+
+import numpy as np
+
+NAMES_DIR = Path(__file__).parent.parent / "names"
+FIRST_NAMES_FILE = NAMES_DIR / "first-names.txt"
+LAST_NAMES_FILE = NAMES_DIR / "last-names.txt"
+
+_MAGIC = b"UNON"
+_HEADER = struct.Struct("<4sI")
+
+def build_index(source: Path, index_path: Path) -> None:
+    """ Pack the non-empty, stripped lines of source into index_path """
+    with open(source, "r", encoding="utf-8") as f:
+        names = [line.strip().encode("utf-8") for line in f if line.strip()]
+
+    offsets = [0]
+    for name in names:
+        offsets.append(offsets[-1] + len(name))
+
+    # Write to a temp file and rename so concurrent workers never see a partial index
+    tmp_path = index_path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, len(names)))
+        f.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        f.write(b"".join(names))
+    os.replace(tmp_path, index_path)
+
+class NameTable:
+    def __init__(self, source: Path) -> None:
+        self.source = source
+        self.index_path = source.with_suffix(".idx")
+
+        if (
+            not self.index_path.exists()
+            or self.index_path.stat().st_mtime < source.stat().st_mtime
+        ):
+            build_index(source, self.index_path)
+
+        with open(self.index_path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self._count = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{self.index_path} is not a name index")
+
+        offsets_start = _HEADER.size
+        self._blob_start = offsets_start + 4 * (self._count + 1)
+        # Offsets are written little-endian, so read them that way on every host
+        self._offsets = np.frombuffer(
+            self._map, dtype="<u4", count=self._count + 1, offset=offsets_start
+        )
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int) -> str:
+        start = self._blob_start + int(self._offsets[i])
+        end = self._blob_start + int(self._offsets[i + 1])
+        return self._map[start:end].decode("utf-8")
+
+    def sample(self, rng: random.Random | None = None) -> str:
+        """ Uniformly random name, uses the global random module unless rng is given """
+        return self[(rng or random).randrange(self._count)]
+
+_TABLE_CACHE: dict[Path, NameTable] = {}
+
+def _table(source: Path) -> NameTable:
+    if source not in _TABLE_CACHE:
+        _TABLE_CACHE[source] = NameTable(source)
+    return _TABLE_CACHE[source]
+
+def first_names() -> NameTable:
+    return _table(FIRST_NAMES_FILE)
+
+def last_names() -> NameTable:
+    return _table(LAST_NAMES_FILE)
+
+def preload() -> None:
+    """ Map both tables now, e.g. in the parent before forking workers """
+    first_names()
+    last_names()
@@ -0,0 +1,345 @@
+"""
+Torch-free inference for UnoAgent.
+
+A UnoAgent is a small MLP (Linear -> ReLU -> Linear). Processes that only play
+games don't need torch for that: export the weights to plain float32 arrays and
+decide with NumPy, which skips torch's import time, its memory per process and
+its dispatch overhead on these tiny matmuls. Evolution and mutation stay in torch.
+
+    weights = export_weights(agent)              # in the torch process
+    player = NumpyAgent(weights)                 # anywhere; only numpy is imported
+
+NumpyAgent.decide picks the same action as UnoAgent.decide (the highest logit
+among the legal actions, first index on ties). Run this file to check that on
+states from real games:
+
+    python numpy_agent.py --games 20
+
+Weights can also be kept at reduced precision (PRECISIONS): float16, bfloat16
+or int8 with one scale per output channel. Stored and sent weights
+(weights_to_bytes, e.g. to hall-of-fame and cluster workers, see
+main.INFERENCE_PRECISION) take 2-4x less space. In memory, the sparse path
+expands only the rows it reads, so an agent deciding from sparse states stays
+small. The dense path expands the first layer to float32 once, on first use,
+and keeps that copy: it is then as fast as float32 but saves no memory. The
+small output layer is always expanded up front. Reduced weights can choose
+different actions, so measure how often before using them:
+
+    python numpy_agent.py --precisions --games 20
+"""
+from __future__ import annotations
+
+import io
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from agent import UnoAgent
+
+WEIGHT_NAMES = ("net.0.weight", "net.0.bias", "net.2.weight", "net.2.bias")
+MATRIX_NAMES = ("net.0.weight", "net.2.weight")  # Stored at the chosen precision; biases stay float32
+PRECISIONS = ("float32", "float16", "bfloat16", "int8")
+
+def compress(matrix: np.ndarray, precision: str) -> tuple[np.ndarray, np.ndarray | None]:
+    """
+    (stored array, scale) for a [out, in] weight matrix. bfloat16 is kept as the
+    upper 16 bits of the float32 (rounded to nearest even) since NumPy has no
+    such type; int8 scale has one entry per output channel, shaped [out, 1].
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if precision == "float32":
+        return matrix, None
+    if precision == "float16":
+        return matrix.astype(np.float16), None
+    if precision == "bfloat16":
+        bits = matrix.view(np.uint32)
+        return ((bits + 0x7FFF + ((bits >> 16) & 1)) >> 16).astype(np.uint16), None
+    if precision == "int8":
+        scale = np.abs(matrix).max(axis=1, keepdims=True) / 127.0
+        scale[scale == 0] = 1.0
+        return np.clip(np.round(matrix / scale), -127, 127).astype(np.int8), scale.astype(np.float32)
+    raise ValueError(f"Unknown precision {precision!r}, expected one of {PRECISIONS}")
+
+def expand(stored: np.ndarray, scale: np.ndarray | None) -> np.ndarray:
+    """ float32 values of compress() output (or any slice or transpose of it, with the scale to match) """
+    if stored.dtype == np.float32:
+        return stored
+    if stored.dtype == np.uint16:
+        return (stored.astype(np.uint32) << 16).view(np.float32)
+    values = stored.astype(np.float32)
+    if scale is not None:
+        values *= scale
+    return values
+
+def export_weights(agent: "UnoAgent") -> dict[str, np.ndarray]:
+    """ The agent's parameters as float32 arrays, keyed like its state_dict """
+    state_dict = agent.state_dict()
+    return {name: state_dict[name].detach().cpu().numpy().astype(np.float32, copy=True) for name in WEIGHT_NAMES}
+
+def weights_to_bytes(weights: dict[str, np.ndarray], precision: str = "float32") -> bytes:
+    arrays = {"precision": np.array(precision)}
+    for name in WEIGHT_NAMES:
+        if name in MATRIX_NAMES:
+            arrays[name], scale = compress(weights[name], precision)
+            if scale is not None:
+                arrays[f"{name}.scale"] = scale
+        else:
+            arrays[name] = weights[name]
+    buffer = io.BytesIO()
+    np.savez(buffer, **arrays)
+    return buffer.getvalue()
+
+def weights_from_bytes(data: bytes) -> dict[str, np.ndarray]:
+    """ float32 weights, whatever precision they were stored at """
+    with np.load(io.BytesIO(data)) as arrays:
+        return {
+            name: expand(arrays[name], arrays[f"{name}.scale"] if f"{name}.scale" in arrays else None)
+            for name in WEIGHT_NAMES
+        }
+
+class NumpyAgent:
+    """
+    Plays like the UnoAgent its weights came from; has the same identity fields
+    for play_game. Below float32 precision the first layer is kept compressed
+    for the sparse path and expanded to float32 for the dense one (see above).
+    """
+
+    def __init__(
+        self,
+        weights: dict[str, np.ndarray],
+        agent_id: str | None = None,
+        parent_id: str | None = None,
+        first_name: str | None = None,
+        last_name: str | None = None,
+        precision: str = "float32",
+    ) -> None:
+        self.precision = precision
+        # Transposed once so a batch of states is a plain row-major matmul
+        w1, w1_scale = compress(weights["net.0.weight"], precision)
+        w2, w2_scale = compress(weights["net.2.weight"], precision)
+        self.w1 = np.ascontiguousarray(w1.T)
+        self.w1_scale = w1_scale.T if w1_scale is not None else None
+        self.w2 = np.ascontiguousarray(w2.T)
+        self.w2_scale = w2_scale.T if w2_scale is not None else None
+        self.b1 = np.asarray(weights["net.0.bias"], dtype=np.float32)
+        self.b2 = np.asarray(weights["net.2.bias"], dtype=np.float32)
+        # float32 copies; expand() returns the array itself at float32 so nothing is copied then
+        self._w1_dense: np.ndarray | None = None  # Made by the first dense logits() call
+        self._w2_dense = expand(self.w2, self.w2_scale)
+
+        self.agent_id = agent_id
+        self.parent_id = parent_id
+        self.first_name = first_name
+        self.last_name = last_name
+        self.games_played = 0
+        self.wins = 0
+
+    @classmethod
+    def from_agent(cls, agent: "UnoAgent", precision: str = "float32") -> "NumpyAgent":
+        return cls(export_weights(agent), agent.agent_id, agent.parent_id, agent.first_name, agent.last_name, precision)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, agent_id: str | None = None) -> "NumpyAgent":
+        """ Agent for weights_to_bytes output, kept at the precision it was stored at """
+        with np.load(io.BytesIO(data)) as arrays:
+            precision = str(arrays["precision"])
+        # Compressing the expanded values again gives back the stored ones
+        return cls(weights_from_bytes(data), agent_id, precision=precision)
+
+    @property
+    def input_size(self) -> int:
+        return self.w1.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        """ Memory held by the parameters, including float32 copies made so far """
+        arrays = (self.w1, self.w1_scale, self.w2, self.w2_scale, self.b1, self.b2, self._w1_dense, self._w2_dense)
+        held = {id(a): a for a in arrays if a is not None}
+        return sum(a.nbytes for a in held.values())
+
+    def logits(self, states: np.ndarray) -> np.ndarray:
+        """ Network output for one state [input_size] or a batch [n, input_size] """
+        if self._w1_dense is None:
+            self._w1_dense = expand(self.w1, self.w1_scale)
+        hidden = states @ self._w1_dense
+        return self._output(hidden)
+
+    def sparse_logits(self, indices: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """ logits() of one state given as input_encoding.build_state_features output; w1's rows are the embedding table """
+        hidden = values @ expand(self.w1[indices], self.w1_scale)
+        return self._output(hidden)
+
+    def _output(self, hidden: np.ndarray) -> np.ndarray:
+        hidden += self.b1
+        np.maximum(hidden, 0.0, out=hidden)
+        out = hidden @ self._w2_dense
+        out += self.b2
+        return out
+
+    def decide(self, state: np.ndarray, legal_action_indices: list[int]) -> int:
+        return self._best_legal(self.logits(state), legal_action_indices)
+
+    def decide_sparse(self, indices: np.ndarray, values: np.ndarray, legal_action_indices: list[int]) -> int:
+        return self._best_legal(self.sparse_logits(indices, values), legal_action_indices)
+
+    @staticmethod
+    def _best_legal(logits: np.ndarray, legal_action_indices: list[int]) -> int:
+        masked = np.full_like(logits, -np.inf)
+        masked[legal_action_indices] = logits[legal_action_indices]
+        return int(masked.argmax())  # First maximum on ties, like torch.argmax
+
+    def decide_batch(self, states: np.ndarray, legal_action_indices: list[list[int]]) -> list[int]:
+        """ decide() for many states at once, e.g. one per table in a batch of games """
+        masked = np.full((len(states), self.w2.shape[1]), -np.inf, dtype=np.float32)
+        logits = self.logits(states)
+        for row, legal in enumerate(legal_action_indices):
+            masked[row, legal] = logits[row, legal]
+        return masked.argmax(axis=1).tolist()
+
+def verify(games: int = 20, seed: int = 0) -> float:
+    """
+    Play games with fresh UnoAgents and check that NumpyAgent copies and the
+    sparse-input paths (including agent.SparseLinear converted from the first
+    layer and back, one state and a batch) choose the same action at every
+    decision; returns the largest logit difference seen.
+    """
+    import random
+    import torch
+    from agent import SparseLinear, UnoAgent
+    from input_encoding import state_vector_size
+    import main
+
+    random.seed(seed)
+    torch.manual_seed(seed)
+    input_size = state_vector_size(main.RULES.player_count)
+    max_error = 0.0
+    decisions = 0
+
+    def first_layer_error(agent, state, indices) -> float:
+        """ Largest difference between the first Linear and SparseLinear conversions of it """
+        first = agent.net[0]
+        converted = SparseLinear.from_linear(first)
+        back = converted.to_linear()
+        assert torch.equal(back.weight, first.weight) and torch.equal(back.bias, first.bias)
+        indices_t, values_t = torch.from_numpy(indices), torch.from_numpy(state[indices])
+        with torch.no_grad():
+            expected = first(torch.from_numpy(state))
+            # Two copies of the state as a batch exercise the embedding-bag path
+            batch = converted(indices_t.repeat(2), values_t.repeat(2), torch.tensor([0, len(indices)]))
+            outputs = (converted(indices_t, values_t), agent.sparse_first_layer(indices_t, values_t), batch[0], batch[1])
+        return max(float((output - expected).abs().max()) for output in outputs)
+
+    original_decide = UnoAgent.decide
+    def checked_decide(agent, state, legal_action_indices):
+        nonlocal max_error, decisions
+        action = original_decide(agent, state, legal_action_indices)
+        mirror = NumpyAgent(export_weights(agent))
+        with torch.no_grad():
+            expected = agent(torch.from_numpy(state)).numpy()
+        indices = np.flatnonzero(state)
+        max_error = max(
+            max_error,
+            float(np.abs(mirror.logits(state) - expected).max()),
+            float(np.abs(mirror.sparse_logits(indices, state[indices]) - expected).max()),
+            first_layer_error(agent, state, indices),
+        )
+        assert mirror.decide(state, legal_action_indices) == action, "NumPy and torch chose different actions"
+        assert mirror.decide_sparse(indices, state[indices], legal_action_indices) == action
+        assert agent.decide_sparse(indices, state[indices], legal_action_indices) == action
+        assert mirror.decide_batch(state[None], [legal_action_indices]) == [action]
+        decisions += 1
+        return action
+
+    UnoAgent.decide = checked_decide
+    try:
+        for game_id in range(games):
+            agents = [UnoAgent(agent_id=str(i), parent_id=None, input_size=input_size) for i in range(main.RULES.player_count)]
+            main.play_game(agents, game_id, round_num=-1)
+    finally:
+        UnoAgent.decide = original_decide
+
+    print(f"[numpy agent] {decisions} decisions in {games} games agree, max logit difference {max_error:.2e}")
+    return max_error
+
+def compare_precisions(games: int = 20, seed: int = 0, mutations: int = 5) -> list[tuple]:
+    """
+    Record every decision of float32 agents over `games` games, then replay the
+    recorded states through each precision and report how often the chosen
+    action differs. Agents are mutated a few times first, like a population
+    some rounds in. Returns (precision, bytes per agent as stored, bytes once
+    the dense path has run, mismatch rate, max logit error, dense us, sparse us) rows.
+    """
+    import random
+    import time
+    import torch
+    from agent import UnoAgent
+    from input_encoding import state_vector_size
+    import main
+
+    random.seed(seed)
+    torch.manual_seed(seed)
+    input_size = state_vector_size(main.RULES.player_count)
+    agents = [UnoAgent(agent_id=str(i), parent_id=None, input_size=input_size) for i in range(main.RULES.player_count)]
+    for agent in agents:
+        for _ in range(mutations):
+            agent.mutate(mutation_rate=0.1)
+
+    recorded: dict[str, list[tuple[np.ndarray, list[int], int]]] = {agent.agent_id: [] for agent in agents}
+    original_decide = UnoAgent.decide
+    def recording_decide(agent, state, legal_action_indices):
+        action = original_decide(agent, state, legal_action_indices)
+        recorded[agent.agent_id].append((state, legal_action_indices, action))
+        return action
+
+    UnoAgent.decide = recording_decide
+    try:
+        for game_id in range(games):
+            main.play_game(agents, game_id, round_num=-1)
+    finally:
+        UnoAgent.decide = original_decide
+
+    rows = []
+    decisions = sum(len(states) for states in recorded.values())
+    for precision in PRECISIONS:
+        mismatches = 0
+        max_error = 0.0
+        dense_seconds = sparse_seconds = 0.0
+        for agent in agents:
+            exact = NumpyAgent(export_weights(agent))
+            reduced = NumpyAgent(export_weights(agent), precision=precision)
+            stored_bytes = reduced.nbytes
+            for state, legal, action in recorded[agent.agent_id]:
+                indices = np.flatnonzero(state)
+                values = state[indices]
+                start = time.perf_counter()
+                dense_action = reduced.decide(state, legal)
+                dense_seconds += time.perf_counter() - start
+                start = time.perf_counter()
+                sparse_action = reduced.decide_sparse(indices, values, legal)
+                sparse_seconds += time.perf_counter() - start
+                mismatches += (dense_action != action) + (sparse_action != action)
+                max_error = max(max_error, float(np.abs(reduced.logits(state) - exact.logits(state)).max()))
+        rows.append((
+            precision, stored_bytes, reduced.nbytes, mismatches / (2 * decisions), max_error,
+            dense_seconds / decisions * 1e6, sparse_seconds / decisions * 1e6,
+        ))
+
+    print(f"[precision] {decisions} recorded decisions from {games} games")
+    print(f"{'precision':>10} {'bytes/agent':>12} {'with dense':>11} {'differs':>8} {'max logit err':>14} {'dense us':>9} {'sparse us':>10}")
+    for precision, stored, dense_bytes, mismatch, error, dense_us, sparse_us in rows:
+        print(f"{precision:>10} {stored:>12} {dense_bytes:>11} {mismatch:>8.2%} {error:>14.2e} {dense_us:>9.1f} {sparse_us:>10.1f}")
+    return rows
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Check NumPy inference against the torch agent.")
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--precisions", action="store_true", help="report how often reduced precisions change the action")
+    args = parser.parse_args()
+    if args.precisions:
+        compare_precisions(args.games, args.seed)
+    else:
+        verify(args.games, args.seed)
@@ -0,0 +1,223 @@
+"""
+Racing (successive elimination) for the per-round fitness evaluation.
+
+The fixed schedule gives every agent the same number of games, but only the
+TOP_K survivors matter and most of the population is clearly out after a few
+games. A Race plays the round in stages instead:
+
+1. every agent plays min_games games;
+2. the cutoff is the K-th best win rate so far; agents whose win-rate interval
+   lies entirely below it are eliminated and those entirely above it are locked in;
+3. the next stage only schedules the undecided (borderline) agents, padding
+   groups with decided agents when needed;
+
+until everyone is decided, every borderline agent has played as many games as
+the fixed schedule would give it (max_games_per_agent), or the budget is spent.
+Borderline agents that hit the cap are ranked by win rate, as in the fixed schedule.
+
+    race = Race(NUM_AGENTS, TOP_K, AGENTS_PER_GAME, max_games=GAMES_PER_ROUND)
+    for group in race.games():        # next stage is planned from results so far
+        race.record(group, play(group))
+    survivors = race.ranking()[:TOP_K]
+
+Running this file compares racing with the fixed schedule on simulated agents
+of known strength, so the selection quality cost of the saved games is measurable.
+"""
+from __future__ import annotations
+
+import math
+import random
+from statistics import NormalDist
+from typing import Iterator
+
+class Race:
+    def __init__(
+        self,
+        n_agents: int,
+        top_k: int,
+        seats: int,
+        max_games: int,
+        max_games_per_agent: int | None = None,
+        min_games: int = 8,
+        stage_games: int = 4,
+        confidence: float = 0.95,
+        rng: random.Random | None = None,
+    ) -> None:
+        if not 0 < top_k < n_agents:
+            raise ValueError(f"top_k must be between 1 and {n_agents - 1}, got {top_k}")
+        if n_agents < seats:
+            raise ValueError("Need at least one full table of agents")
+        self.n_agents = n_agents
+        self.top_k = top_k
+        self.seats = seats
+        self.max_games = max_games
+        # Default: what the fixed schedule gives every agent
+        self.max_games_per_agent = max_games_per_agent or max_games * seats // n_agents
+        self.min_games = min_games
+        self.stage_games = stage_games
+        self.z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        self.rng = rng or random.Random()
+
+        self.wins = [0] * n_agents
+        self.games_played = [0] * n_agents
+        self.eliminated: set[int] = set()
+        self.locked: set[int] = set()
+        self.games_total = 0
+        self.stages = 0
+
+    # --- statistics ---
+
+    def win_rate(self, i: int) -> float:
+        return self.wins[i] / self.games_played[i] if self.games_played[i] else 0.0
+
+    def interval(self, i: int) -> tuple[float, float]:
+        """ Wilson score interval for agent i's win rate """
+        n = self.games_played[i]
+        if n == 0:
+            return 0.0, 1.0
+        p = self.wins[i] / n
+        z2 = self.z * self.z
+        center = (p + z2 / (2 * n)) / (1 + z2 / n)
+        half = self.z * math.sqrt(p * (1 - p) / n + z2 / (4 * n * n)) / (1 + z2 / n)
+        # Exact at the edges; rounding would otherwise put 0 wins a hair above a 0.0 cutoff
+        low = 0.0 if self.wins[i] == 0 else center - half
+        high = 1.0 if self.wins[i] == n else center + half
+        return low, high
+
+    def undecided(self) -> list[int]:
+        return [i for i in range(self.n_agents) if i not in self.eliminated and i not in self.locked]
+
+    def racing(self) -> list[int]:
+        """ Undecided agents that still get games """
+        return [i for i in self.undecided() if self.games_played[i] < self.max_games_per_agent]
+
+    def _decide(self) -> None:
+        cutoff = sorted((self.win_rate(i) for i in range(self.n_agents)), reverse=True)[self.top_k - 1]
+        for i in self.undecided():
+            low, high = self.interval(i)
+            if high < cutoff:
+                self.eliminated.add(i)
+            elif low > cutoff:
+                self.locked.add(i)
+
+        # Everyone left fits in the remaining places (or none are left)
+        remaining = self.undecided()
+        if len(self.locked) + len(remaining) <= self.top_k:
+            self.locked.update(remaining)
+        elif len(self.locked) >= self.top_k:
+            self.eliminated.update(remaining)
+
+    @property
+    def done(self) -> bool:
+        return self.games_total >= self.max_games or not self.racing()
+
+    # --- scheduling ---
+
+    def _stage(self, agents: list[int], games_each: int) -> list[list[int]]:
+        """ Groups in which every agent in `agents` plays about games_each games """
+        groups = []
+        decided = [i for i in range(self.n_agents) if i not in set(agents)]
+        for _ in range(games_each):
+            order = agents[:]
+            self.rng.shuffle(order)
+            short = -len(order) % self.seats
+            if short:
+                # Fill the last table with decided agents (or repeat borderline ones if there are none)
+                pool = [i for i in (decided or agents) if i not in order[-(self.seats - short):]]
+                order += self.rng.sample(pool, short)
+            groups += [order[i:i + self.seats] for i in range(0, len(order), self.seats)]
+        return groups
+
+    def games(self) -> Iterator[list[int]]:
+        """ Yields agent groups, stage by stage; call record() with each result before taking the next """
+        plan = self._stage(list(range(self.n_agents)), self.min_games)
+        while plan:
+            self.stages += 1
+            for group in plan:
+                if self.games_total >= self.max_games:
+                    return
+                yield group
+            self._decide()
+            if self.done:
+                return
+            plan = self._stage(self.racing(), self.stage_games)
+
+    def record(self, group: list[int], winner_seat: int | None) -> None:
+        """ winner_seat indexes into group; None or -1 means nobody won """
+        self.games_total += 1
+        for i in group:
+            self.games_played[i] += 1
+        if winner_seat is not None and winner_seat >= 0:
+            self.wins[group[winner_seat]] += 1
+
+    def ranking(self) -> list[int]:
+        """ Locked agents first, then undecided, then eliminated, each by win rate """
+        def rank(i: int) -> tuple[int, float]:
+            tier = 0 if i in self.locked else 2 if i in self.eliminated else 1
+            return tier, -self.win_rate(i)
+        return sorted(range(self.n_agents), key=rank)
+
+    def report(self, fixed_games: int) -> str:
+        saved = 1 - self.games_total / fixed_games if fixed_games else 0.0
+        return (
+            f"{self.games_total}/{fixed_games} games ({saved:.0%} saved) in {self.stages} stages: "
+            f"{len(self.locked)} locked in, {len(self.eliminated)} eliminated, {len(self.undecided())} undecided"
+        )
+
+# --- comparison with the fixed schedule on simulated agents ---
+
+def _simulated_winner(strengths: list[float], group: list[int], rng: random.Random) -> int:
+    """ Seat of the winner when agent i wins with probability proportional to strengths[i] """
+    return rng.choices(range(len(group)), weights=[strengths[i] for i in group])[0]
+
+def _fixed_selection(strengths: list[float], top_k: int, seats: int, games: int, rng: random.Random) -> list[int]:
+    n = len(strengths)
+    wins = [0] * n
+    for _ in range(games // (n // seats)):
+        order = list(range(n))
+        rng.shuffle(order)
+        for start in range(0, n, seats):
+            group = order[start:start + seats]
+            wins[group[_simulated_winner(strengths, group, rng)]] += 1
+    return sorted(range(n), key=lambda i: -wins[i])[:top_k]
+
+def compare(
+    trials: int = 20,
+    n_agents: int = 100,
+    top_k: int = 25,
+    seats: int = 4,
+    games: int = 1000,
+    seed: int = 0,
+    **race_kwargs,
+) -> None:
+    """ Print the share of the true top K each method selects and the racing games used """
+    rng = random.Random(seed)
+    fixed_hits, race_hits, race_games = [], [], []
+    for _ in range(trials):
+        strengths = [rng.lognormvariate(0, 0.5) for _ in range(n_agents)]
+        best = set(sorted(range(n_agents), key=lambda i: -strengths[i])[:top_k])
+
+        fixed_hits.append(len(best & set(_fixed_selection(strengths, top_k, seats, games, rng))) / top_k)
+
+        race = Race(n_agents, top_k, seats, games, rng=rng, **race_kwargs)
+        for group in race.games():
+            race.record(group, _simulated_winner(strengths, group, rng))
+        race_hits.append(len(best & set(race.ranking()[:top_k])) / top_k)
+        race_games.append(race.games_total)
+
+    mean = lambda xs: sum(xs) / len(xs)
+    print(f"fixed : {games} games, {mean(fixed_hits):.1%} of the true top {top_k} selected")
+    print(f"racing: {mean(race_games):.0f} games ({1 - mean(race_games) / games:.0%} saved), "
+          f"{mean(race_hits):.1%} of the true top {top_k} selected")
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compare racing with the fixed schedule on simulated agents.")
+    parser.add_argument("--trials", type=int, default=20)
+    parser.add_argument("--games", type=int, default=1000, help="fixed schedule games per round (racing budget)")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--min-games", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    compare(args.trials, games=args.games, seed=args.seed, confidence=args.confidence, min_games=args.min_games)
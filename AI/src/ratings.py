@@ -0,0 +1,98 @@
+"""
+Multiplayer skill ratings updated after every game and carried across rounds.
+
+Ratings follow the Weng-Lin Bayesian approximation with the Plackett-Luce model
+(the free-for-all update behind TrueSkill-like systems such as OpenSkill): each
+agent has a mean `mu` and an uncertainty `sigma`, and one game's ranking moves
+every seat at once. In uno the winner ranks first and everyone else ties for
+second; when the deck runs out everyone ties.
+
+Survivors keep their rating between rounds and a child starts from its parent's
+mu with the uncertainty widened by CHILD_SIGMA, since mutation changes its play.
+Selecting on the conservative estimate (mu - 3 sigma) uses all the evidence an
+agent has gathered, not only this round's win count.
+"""
+from __future__ import annotations
+
+import math
+
+MU = 25.0
+SIGMA = MU / 3
+BETA = SIGMA / 2         # Performance noise of a single game
+KAPPA = 1e-4             # Keeps sigma from collapsing to 0
+CHILD_SIGMA = SIGMA / 2  # Uncertainty a mutation adds on top of the parent's
+
+class Rating:
+    __slots__ = ("mu", "sigma", "games")
+
+    def __init__(self, mu: float = MU, sigma: float = SIGMA, games: int = 0) -> None:
+        self.mu = mu
+        self.sigma = sigma
+        self.games = games
+
+    @property
+    def conservative(self) -> float:
+        """ Skill the agent almost certainly has; unproven agents rank low """
+        return self.mu - 3 * self.sigma
+
+    def __repr__(self) -> str:
+        return f"Rating(mu={self.mu:.2f}, sigma={self.sigma:.2f}, games={self.games})"
+
+def rate(ratings: list[Rating], ranks: list[int]) -> None:
+    """ Update ratings in place from one game; ranks[i] is seat i's place (0 = best, ties share a place) """
+    c = math.sqrt(sum(r.sigma ** 2 + BETA ** 2 for r in ratings))
+    strengths = [math.exp(r.mu / c) for r in ratings]
+    # For each seat q: total strength of everyone placed at or below q, and how many share q's place
+    sums = [sum(s for s, rank in zip(strengths, ranks) if rank >= ranks[q]) for q in range(len(ratings))]
+    ties = [ranks.count(ranks[q]) for q in range(len(ratings))]
+
+    updates = []
+    for i, rating in enumerate(ratings):
+        omega = delta = 0.0
+        for q in range(len(ratings)):
+            if ranks[q] > ranks[i]:
+                continue
+            quotient = strengths[i] / sums[q]
+            omega += ((1 - quotient) if q == i else -quotient) / ties[q]
+            delta += quotient * (1 - quotient) / ties[q]
+        variance = rating.sigma ** 2
+        gamma = rating.sigma / c
+        updates.append((
+            rating.mu + omega * variance / c,
+            math.sqrt(variance * max(1 - delta * gamma * variance / c ** 2, KAPPA)),
+        ))
+
+    for rating, (mu, sigma) in zip(ratings, updates):
+        rating.mu = mu
+        rating.sigma = sigma
+        rating.games += 1
+
+class RatingTable:
+    """ Ratings by agent_id, updated per game result """
+
+    def __init__(self) -> None:
+        self.ratings: dict[str, Rating] = {}
+
+    def get(self, agent_id: str) -> Rating:
+        if agent_id not in self.ratings:
+            self.ratings[agent_id] = Rating()
+        return self.ratings[agent_id]
+
+    def seed_child(self, child_id: str, parent_id: str) -> Rating:
+        """ Parent's mu as the prior, with the uncertainty widened for the mutation """
+        parent = self.get(parent_id)
+        self.ratings[child_id] = Rating(parent.mu, min(SIGMA, math.sqrt(parent.sigma ** 2 + CHILD_SIGMA ** 2)))
+        return self.ratings[child_id]
+
+    def record(self, agent_ids: list[str], winner_seat: int | None) -> None:
+        """ winner_seat indexes into agent_ids; None or -1 (deck ran out) is a draw between everyone """
+        if winner_seat is None or winner_seat < 0:
+            ranks = [0] * len(agent_ids)
+        else:
+            ranks = [0 if seat == winner_seat else 1 for seat in range(len(agent_ids))]
+        rate([self.get(agent_id) for agent_id in agent_ids], ranks)
+
+    def keep(self, agent_ids) -> None:
+        """ Forget agents that left the population """
+        keep = set(agent_ids)
+        self.ratings = {agent_id: r for agent_id, r in self.ratings.items() if agent_id in keep}
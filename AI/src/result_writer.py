@@ -0,0 +1,169 @@
+import atexit
+import queue
+import sqlite3
+import threading
+import time
+from typing import Callable
+
+import db_utils
+from db_utils import (
+    GAME_RESULT_SQL, AGENT_SCORE_SQL, AGENT_SNAPSHOT_SQL, AGENT_UPSERT_SQL,
+    ROUND_STATS_SQL, FAMILY_ROUND_STATS_SQL, AGENT_RATING_SQL, RATING_HISTORY_SQL,
+    AGENT_GENOME_SQL, RECORD_ROUND_SQL, ROUND_ROSTER_SQL, GAME_RECORD_SQL,
+    agent_params, rating_params, snapshot_params,
+)
+
+_STOP = object()  # Sentinel telling the writer thread to finish
+
+class ResultWriter:
+    """
+    Persists game results, scores and snapshots from a background thread so the
+    game loop never waits on SQLite.
+
+    Events go into a bounded queue. When the queue is full the caller blocks until
+    the writer catches up (backpressure), so memory use stays bounded. The writer
+    takes everything that is queued, up to batch_size events, and commits it in a
+    single transaction. close() drains the queue; it is also registered with atexit
+    so pending events are written on normal exit and on Ctrl-C.
+    """
+
+    def __init__(self, max_queue: int = 10_000, batch_size: int = 1_000, retries: int = 5, delay: float = 0.1) -> None:
+        self.batch_size = batch_size
+        self.retries = retries
+        self.delay = delay
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._error: BaseException | None = None
+        self._closed = False
+        self.events_written = 0
+        self.batches_written = 0
+
+        self._thread = threading.Thread(target=self._run, name="ResultWriter", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # --- producer API (mirrors db_utils) ---
+
+    def save_game_result(self, round_num: int, game_id: int, winner_agent_id: str) -> None:
+        self._put(GAME_RESULT_SQL, None, (round_num, game_id, winner_agent_id))
+
+    def save_agent_score(self, agent_id: str, round_num: int, score: int, games: int | None = None) -> None:
+        self._put(AGENT_SCORE_SQL, None, (agent_id, round_num, score, games))
+
+    def save_agent_snapshot(self, agent_id: str, round_num: int, weights_dict: dict, metadata_dict: dict) -> None:
+        """ Serialization happens on the writer thread, so weights_dict must not be modified in place afterwards """
+        self._put(AGENT_SNAPSHOT_SQL, snapshot_params, (agent_id, round_num, weights_dict, metadata_dict))
+        self._put(AGENT_UPSERT_SQL, agent_params, (round_num, metadata_dict))
+
+    def save_agent_rating(self, agent_id: str, round_num: int, mu: float, sigma: float, games: int) -> None:
+        self._put(AGENT_RATING_SQL, rating_params, (agent_id, round_num, mu, sigma, games))
+        self._put(RATING_HISTORY_SQL, rating_params, (agent_id, round_num, mu, sigma, games))
+
+    def save_agent_genome(self, agent_id: str, parent_id: str | None, seed: int, mutation_rate: float | None) -> None:
+        self._put(AGENT_GENOME_SQL, None, (agent_id, parent_id, seed, mutation_rate))
+
+    def save_round_roster(self, round_num: int, agent_ids: list[str], settings: str, version: int) -> None:
+        self._put(RECORD_ROUND_SQL, None, (round_num, settings, version))
+        for position, agent_id in enumerate(agent_ids):
+            self._put(ROUND_ROSTER_SQL, None, (round_num, position, agent_id))
+
+    def save_game_record(self, round_num: int, game_id: int, deal_seed: int, seats: bytes, winner: int | None, fingerprint: int) -> None:
+        self._put(GAME_RECORD_SQL, None, (round_num, game_id, deal_seed, seats, winner, fingerprint))
+
+    def refresh_round_aggregates(self, round_num: int) -> None:
+        """ Queued behind the round's scores and snapshots, so it sees all of them """
+        self._put(ROUND_STATS_SQL, None, {"round_num": round_num})
+        self._put(FAMILY_ROUND_STATS_SQL, None, {"round_num": round_num})
+
+    def flush(self) -> None:
+        """ Block until every event queued so far is committed """
+        self._queue.join()
+        self._raise_if_failed()
+
+    def close(self) -> None:
+        """ Drain the queue and stop the writer thread; safe to call more than once """
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._raise_if_failed()
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _put(self, statement: str, build_params: Callable[..., tuple | dict] | None, args: tuple | dict) -> None:
+        """ build_params, if given, turns args into the row on the writer thread """
+        if self._closed:
+            raise RuntimeError("ResultWriter is closed")
+        self._raise_if_failed()
+        self._queue.put((statement, build_params, args))  # Blocks while the queue is full
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise RuntimeError("ResultWriter failed to persist results") from self._error
+
+    # --- writer thread ---
+
+    def _run(self) -> None:
+        conn = sqlite3.connect(db_utils.DB_PATH)
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute("PRAGMA synchronous=NORMAL;")
+        try:
+            stopping = False
+            while not stopping:
+                batch = [self._queue.get()]
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                if batch[-1] is _STOP:
+                    stopping = True
+                    events = batch[:-1]
+                else:
+                    events = batch
+
+                # After a failure keep consuming so producers never block forever,
+                # the error is re-raised on their next call
+                if events and self._error is None:
+                    try:
+                        self._write_batch(conn, events)
+                    except BaseException as e:
+                        self._error = e
+
+                for _ in batch:
+                    self._queue.task_done()
+        finally:
+            conn.close()
+
+    def _write_batch(self, conn: sqlite3.Connection, events: list) -> None:
+        # Group consecutive events with the same statement so each run is one executemany
+        runs: list[tuple[str, list]] = []
+        for statement, build_params, args in events:
+            params = build_params(*args) if build_params else args
+            if runs and runs[-1][0] == statement:
+                runs[-1][1].append(params)
+            else:
+                runs.append((statement, [params]))
+
+        for attempt in range(self.retries):
+            try:
+                with conn:
+                    for statement, rows in runs:
+                        conn.executemany(statement, rows)
+                break
+            except sqlite3.OperationalError as e:
+                if "database is locked" in str(e) and attempt < self.retries - 1:
+                    time.sleep(self.delay * (2 ** attempt))  # exponential backoff
+                else:
+                    raise
+
+        self.events_written += len(events)
+        self.batches_written += 1
@@ -0,0 +1,79 @@
+"""
+Measures cold import time of the uno package and the AI entry points.
+
+Every worker process and short CLI tool pays this cost, so each target has a
+budget (in ms, on top of a bare interpreter start) and a list of heavy modules
+it must not pull in at import time. Exits non-zero if any target is over.
+
+    python AI/src/startup_budget.py [--runs N]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+AI_SRC = Path(__file__).resolve().parent
+REPO_ROOT = AI_SRC.parent.parent
+
+HEAVY_MODULES = ("torch", "tqdm", "yaml", "sqlite3")
+
+# module -> (budget in ms above bare interpreter start, heavy modules allowed at import)
+BUDGETS: dict[str, tuple[float, tuple[str, ...]]] = {
+    "uno": (40.0, ()),
+    "db_utils": (40.0, ("sqlite3",)),
+    "input_encoding": (200.0, ()),  # numpy is the bulk of this
+    "main": (250.0, ()),
+    "numpy_agent": (200.0, ()),  # Game workers decide without torch
+}
+
+def _time_import(code: str, runs: int) -> tuple[float, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([str(REPO_ROOT), str(AI_SRC), env.get("PYTHONPATH", "")])
+    samples = []
+    output = ""
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=AI_SRC, env=env,
+            capture_output=True, text=True, check=True,
+        )
+        samples.append((time.perf_counter() - start) * 1000.0)
+        output = result.stdout.strip()
+    return statistics.median(samples), output
+
+def measure(runs: int = 10) -> bool:
+    baseline, _ = _time_import("pass", runs)
+    print(f"bare interpreter: {baseline:.1f} ms (median of {runs})")
+
+    ok = True
+    for module, (budget, allowed) in BUDGETS.items():
+        code = (
+            f"import sys, {module}; "
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+        )
+        try:
+            elapsed, loaded = _time_import(code, runs)
+        except subprocess.CalledProcessError as e:
+            reason = e.stderr.strip().splitlines()[-1] if e.stderr else "unknown error"
+            print(f"{module:>16}: import failed ({reason})")
+            ok = False
+            continue
+        cost = elapsed - baseline
+        unexpected = [m for m in loaded.split(",") if m and m not in allowed]
+
+        status = "ok"
+        if cost > budget or unexpected:
+            status = "OVER"
+            ok = False
+        extra = f", imported {', '.join(unexpected)}" if unexpected else ""
+        print(f"{module:>16}: {cost:7.1f} ms / {budget:.0f} ms budget [{status}]{extra}")
+
+    return ok
+
+if __name__ == "__main__":
+    runs = 10
+    if "--runs" in sys.argv:
+        runs = int(sys.argv[sys.argv.index("--runs") + 1])
+    sys.exit(0 if measure(runs) else 1)
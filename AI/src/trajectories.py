@@ -0,0 +1,200 @@
+"""
+Self-play trajectories on disk as memory-mapped NumPy shards.
+
+A TrajectoryWriter collects one row per decision of a recorded game:
+
+    state     float32 [state size]   build_state_vector input the agent saw
+    legal     bool    [61]           legal action mask
+    action    int16                  chosen global action index
+    seat      int8                   seat of the player deciding
+    outcome   int8                   +1 that seat won, -1 it lost, 0 deck ran out
+    round     int32, game int32      where the game came from
+
+Rows are held until their game ends (the outcome is only known then) and are
+then appended to the current shard: one preallocated .npy file per field,
+written through np.lib.format.open_memmap. A full shard is flushed and a new one
+started. index.json lists the shards with the rows flushed so far and is
+replaced atomically, so readers only ever see complete rows.
+
+TrajectoryDataset opens a directory read-only with every field memory-mapped,
+so offline training streams rows straight from the page cache:
+
+    data = TrajectoryDataset("trajectories")
+    for batch in data.batches(4096):
+        train(batch["state"], batch["legal"], batch["action"], batch["outcome"])
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+from input_encoding import NUM_CARD_TYPES
+
+SHARD_ROWS = 65536  # ~350 MB of states per shard at the default 1347 inputs
+INDEX_FILE = "index.json"
+
+def _fields(state_size: int) -> dict[str, tuple[tuple[int, ...], str]]:
+    """ field -> (shape of one row, dtype) """
+    return {
+        "state": ((state_size,), "float32"),
+        "legal": ((NUM_CARD_TYPES,), "bool"),
+        "action": ((), "int16"),
+        "seat": ((), "int8"),
+        "outcome": ((), "int8"),
+        "round": ((), "int32"),
+        "game": ((), "int32"),
+    }
+
+class TrajectoryWriter:
+    def __init__(self, directory: Path | str, state_size: int, shard_rows: int = SHARD_ROWS) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.fields = _fields(state_size)
+        self.shard_rows = shard_rows
+
+        index_path = self.directory / INDEX_FILE
+        if index_path.exists():
+            # Appending to an earlier run: finished shards stay as they are
+            index = json.loads(index_path.read_text())
+            if index["fields"]["state"][0] != [state_size]:
+                raise ValueError(f"{self.directory} holds states of size {index['fields']['state'][0]}, not {state_size}")
+            self.shards = index["shards"]
+        else:
+            self.shards = []
+
+        self._shard: dict[str, np.memmap] | None = None
+        self._rows = 0
+        self._pending: list[tuple[np.ndarray, list[int], int, int]] = []
+
+    # --- per game ---
+
+    def record(self, state: np.ndarray, legal_action_indices: list[int], action: int, seat: int) -> None:
+        self._pending.append((state, legal_action_indices, action, seat))
+
+    def end_game(self, winner: int | None, round_num: int, game_id: int) -> None:
+        """ Write the pending rows of a finished game with each seat's outcome; winner -1 or None = nobody won """
+        for state, legal, action, seat in self._pending:
+            if self._shard is None or self._rows == self.shard_rows:
+                self._next_shard()
+            row = self._rows
+            self._shard["state"][row] = state
+            self._shard["legal"][row] = False
+            self._shard["legal"][row, legal] = True
+            self._shard["action"][row] = action
+            self._shard["seat"][row] = seat
+            self._shard["outcome"][row] = 0 if winner is None or winner < 0 else (1 if winner == seat else -1)
+            self._shard["round"][row] = round_num
+            self._shard["game"][row] = game_id
+            self._rows += 1
+        self._pending = []
+
+    def discard_game(self) -> None:
+        self._pending = []
+
+    # --- shards ---
+
+    def _next_shard(self) -> None:
+        self._finish_shard()
+        name = f"shard_{len(self.shards):05d}"
+        (self.directory / name).mkdir(exist_ok=True)
+        self._shard = {
+            field: np.lib.format.open_memmap(
+                self.directory / name / f"{field}.npy", mode="w+", dtype=dtype, shape=(self.shard_rows, *shape)
+            )
+            for field, (shape, dtype) in self.fields.items()
+        }
+        self.shards.append({"name": name, "rows": 0})
+        self._rows = 0
+
+    def _finish_shard(self) -> None:
+        if self._shard is None:
+            return
+        for array in self._shard.values():
+            array.flush()
+        self.shards[-1]["rows"] = self._rows
+        self._shard = None
+        self._write_index()
+
+    def _write_index(self) -> None:
+        index = {
+            "fields": {field: [list(shape), dtype] for field, (shape, dtype) in self.fields.items()},
+            "shards": self.shards,
+        }
+        tmp = self.directory / (INDEX_FILE + ".tmp")
+        tmp.write_text(json.dumps(index))
+        tmp.replace(self.directory / INDEX_FILE)
+
+    def flush(self) -> None:
+        """ Make everything written so far visible to readers (e.g. at the end of a round) """
+        if self._shard is None:
+            return
+        for array in self._shard.values():
+            array.flush()
+        self.shards[-1]["rows"] = self._rows
+        self._write_index()
+
+    def close(self) -> None:
+        self._pending = []
+        self._finish_shard()
+
+    @property
+    def rows(self) -> int:
+        if self._shard is None:
+            return sum(shard["rows"] for shard in self.shards)
+        return sum(shard["rows"] for shard in self.shards[:-1]) + self._rows
+
+class TrajectoryDataset:
+    """ Read-only view of a TrajectoryWriter directory; arrays are memory-mapped, not loaded """
+
+    def __init__(self, directory: Path | str) -> None:
+        self.directory = Path(directory)
+        index = json.loads((self.directory / INDEX_FILE).read_text())
+        self.fields = list(index["fields"])
+        self.shard_rows = [shard["rows"] for shard in index["shards"]]
+        self._shards = [
+            {field: np.load(self.directory / shard["name"] / f"{field}.npy", mmap_mode="r")[:shard["rows"]] for field in self.fields}
+            for shard in index["shards"] if shard["rows"]
+        ]
+
+    def __len__(self) -> int:
+        return sum(self.shard_rows)
+
+    def shards(self) -> Iterator[dict[str, np.ndarray]]:
+        yield from self._shards
+
+    def batches(self, batch_size: int, shuffle: bool = False, rng: np.random.Generator | None = None) -> Iterator[dict[str, np.ndarray]]:
+        """
+        Consecutive rows shard by shard, or with shuffle=True shards in random
+        order and rows shuffled within each shard (reads stay local to one file).
+        """
+        rng = rng or np.random.default_rng()
+        order = rng.permutation(len(self._shards)) if shuffle else range(len(self._shards))
+        for shard_index in order:
+            shard = self._shards[shard_index]
+            rows = len(shard["action"])
+            positions = rng.permutation(rows) if shuffle else None
+            for start in range(0, rows, batch_size):
+                if positions is None:
+                    yield {field: array[start:start + batch_size] for field, array in shard.items()}
+                else:
+                    take = np.sort(positions[start:start + batch_size])
+                    yield {field: array[take] for field, array in shard.items()}
+
+    def summary(self) -> str:
+        outcomes = np.concatenate([shard["outcome"] for shard in self._shards]) if self._shards else np.zeros(0)
+        games = sum(np.unique(np.stack([s["round"], s["game"]]), axis=1).shape[1] for s in self._shards)
+        return (
+            f"{len(self)} rows in {len(self._shards)} shards from about {games} games; "
+            f"outcomes: {np.mean(outcomes == 1):.1%} win, {np.mean(outcomes == -1):.1%} loss, {np.mean(outcomes == 0):.1%} deck-out"
+        )
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Summarize a trajectory directory.")
+    parser.add_argument("directory", nargs="?", default="trajectories")
+    args = parser.parse_args()
+    print(TrajectoryDataset(args.directory).summary())
@@ -0,0 +1,355 @@
+"""
+Reset/step environments over uno.Game for learning code other than the
+evolutionary loop in main.py (PPO, DQN, ...).
+
+UnoEnv seats one learner at the table and plays every other seat with fixed
+opponents (anything get_player_action accepts: UnoAgent, NumpyAgent,
+ISMCTSAgent, or the RandomAgent here). Calls follow gymnasium's API without
+depending on it:
+
+    env = UnoEnv(seed=0)
+    obs, info = env.reset()
+    while True:
+        action = policy(obs, info["legal_mask"])
+        obs, reward, terminated, truncated, info = env.step(action)
+        if terminated or truncated:
+            break
+
+Observations are build_state_vector arrays, actions are global action indices
+(the same 61 outputs as UnoAgent) and the reward is +1 for a win, -1 when an
+opponent wins and 0 when the deck runs out.
+
+SubprocVectorEnv runs K copies in worker processes. Observations, masks and
+rewards are written straight into shared memory, so a step only sends the
+actions and small info dicts through pipes; step_async/step_wait let the
+caller compute something while the workers play. Finished envs reset
+themselves, as in gymnasium's vector envs.
+"""
+from __future__ import annotations
+
+import random
+import traceback
+from multiprocessing import get_context, shared_memory
+
+import numpy as np
+
+from input_encoding import build_state_vector, state_vector_size, NUM_CARD_TYPES
+
+ACTION_SIZE = NUM_CARD_TYPES  # Includes the draw action
+MAX_STEPS = 1000  # Learner moves before an episode is truncated
+
+class RandomAgent:
+    """ Opponent that picks a uniformly random legal action """
+
+    def __init__(self, seed: int | None = None) -> None:
+        self.rng = random.Random(seed)
+        self.agent_id = "random"
+        self.first_name, self.last_name = "Random", "Agent"
+
+    def decide(self, state, legal_action_indices: list[int]) -> int:
+        return self.rng.choice(legal_action_indices)
+
+    def decide_sparse(self, indices, values, legal_action_indices: list[int]) -> int:
+        return self.rng.choice(legal_action_indices)
+
+class UnoEnv:
+    def __init__(
+        self,
+        opponents: list | None = None,
+        seat: int | None = None,
+        max_steps: int = MAX_STEPS,
+        seed: int | None = None,
+    ) -> None:
+        """ seat=None puts the learner in a random seat every episode """
+        from main import RULES
+
+        self.players = RULES.player_count
+        self.rng = random.Random(seed)
+        self.opponents = opponents or [RandomAgent(self.rng.getrandbits(32)) for _ in range(self.players - 1)]
+        if len(self.opponents) != self.players - 1:
+            raise ValueError(f"Need {self.players - 1} opponents, got {len(self.opponents)}")
+        self.fixed_seat = seat
+        self.max_steps = max_steps
+        self.observation_size = state_vector_size(self.players)
+
+        self.game = None
+        self.seat = 0
+        self.steps = 0
+
+    def reset(self, seed: int | None = None, options: dict | None = None) -> tuple[np.ndarray, dict]:
+        from main import new_game
+
+        if seed is not None:
+            self.rng = random.Random(seed)
+        self.seat = self.fixed_seat if self.fixed_seat is not None else self.rng.randrange(self.players)
+        self.steps = 0
+        self.game = new_game(self.rng.getrandbits(32))
+        self.game.deal_cards()
+        self.game.played_cards.append(self.game.deck.cards.pop())
+
+        self._play_opponents()
+        return self._observation(), self._info()
+
+    def step(self, action: int) -> tuple[np.ndarray, float, bool, bool, dict]:
+        from main import action_to_move, get_legal_action_indices
+
+        if self.game is None or self.game.is_game_over():
+            raise RuntimeError("step() called on a finished episode; call reset()")
+        player = self.game.players[self.seat]
+        if action not in get_legal_action_indices(player, self.game):
+            raise ValueError(f"Action {action} is not legal here")
+
+        self._play(player, action_to_move(action, player))
+        self.steps += 1
+        self._play_opponents()
+
+        terminated = self.game.is_game_over()
+        truncated = not terminated and self.steps >= self.max_steps
+        return self._observation(), self._reward(), terminated, truncated, self._info()
+
+    @property
+    def legal_mask(self) -> np.ndarray:
+        from main import get_legal_action_indices
+
+        mask = np.zeros(ACTION_SIZE, dtype=bool)
+        if self.game is not None and not self.game.is_game_over():
+            mask[get_legal_action_indices(self.game.players[self.seat], self.game)] = True
+        return mask
+
+    def _play_opponents(self) -> None:
+        """ Let the other seats move until it is the learner's turn or the game is over """
+        from main import get_player_action
+
+        while not self.game.is_game_over() and self.game.whos_turn != self.seat:
+            turn = self.game.whos_turn
+            opponent = self.opponents[(turn - self.seat - 1) % self.players]
+            player = self.game.players[turn]
+            self._play(player, get_player_action(player, self.game, opponent))
+
+    def _play(self, player, move: tuple[int, object]) -> None:
+        card_idx, color = move
+        if card_idx == -1:
+            self.game.play(None)
+        else:
+            self.game.play(player.cards[card_idx], color_input=color)
+
+    def _observation(self) -> np.ndarray:
+        from main import get_state_args
+
+        return build_state_vector(**get_state_args(self.game.players[self.seat], self.game))
+
+    def _reward(self) -> float:
+        winner = self.game.get_winner()
+        if winner is None or winner < 0:
+            return 0.0
+        return 1.0 if winner == self.seat else -1.0
+
+    def _info(self) -> dict:
+        return {"legal_mask": self.legal_mask, "seat": self.seat, "winner": self.game.get_winner()}
+
+# --- vectorized ---
+
+class EnvWorkerError(RuntimeError):
+    """ An env in a SubprocVectorEnv worker raised; the message has the worker's traceback """
+
+def _worker(index: int, conn, buffer_names: dict, shapes: dict, env_kwargs: dict) -> None:
+    buffers = {name: shared_memory.SharedMemory(name=shm_name) for name, shm_name in buffer_names.items()}
+    arrays = {name: np.ndarray(shapes[name][0], dtype=shapes[name][1], buffer=buffers[name].buf) for name in buffers}
+    # Failures are sent back as ("error", traceback) replies so the parent raises them, instead of
+    # the worker dying and the parent finding out from a closed pipe
+    env, failure = None, None
+    try:
+        env = UnoEnv(**env_kwargs)
+    except Exception:
+        failure = traceback.format_exc()
+
+    def write(obs: np.ndarray, info: dict) -> dict:
+        arrays["obs"][index] = obs
+        arrays["mask"][index] = info.pop("legal_mask")
+        return info
+
+    def run(command: str, arg) -> dict:
+        if command == "reset":
+            obs, info = env.reset(seed=arg)
+            return write(obs, info)
+        obs, reward, terminated, truncated, info = env.step(arg)
+        if terminated or truncated:
+            info["final_observation"] = obs
+            info["final_info"] = {key: value for key, value in info.items() if key != "final_observation"}
+            obs, reset_info = env.reset()
+            info["legal_mask"] = reset_info["legal_mask"]
+            info["seat"] = reset_info["seat"]
+        arrays["reward"][index] = reward
+        arrays["terminated"][index] = terminated
+        arrays["truncated"][index] = truncated
+        return write(obs, info)
+
+    try:
+        while True:
+            command, arg = conn.recv()
+            if command == "close":
+                break
+            if failure:
+                conn.send(("error", failure))
+                continue
+            try:
+                conn.send(("ok", run(command, arg)))
+            except Exception:
+                conn.send(("error", traceback.format_exc()))
+    except (KeyboardInterrupt, EOFError):
+        pass  # Interrupted, or the parent went away without saying close
+    finally:
+        del arrays
+        for shm in buffers.values():
+            shm.close()
+        conn.close()
+
+class SubprocVectorEnv:
+    """
+    K UnoEnv copies in spawned worker processes. Batched arrays returned by
+    reset/step_wait are copies of the shared buffers, so they stay valid after
+    the next step. env_kwargs must pickle (NumpyAgent opponents keep the
+    workers free of torch); each worker gets seed + its index. An exception in
+    a worker is raised here as EnvWorkerError with the worker's traceback;
+    after one, only close() is safe to call.
+    """
+
+    def __init__(self, num_envs: int, seed: int | None = None, **env_kwargs) -> None:
+        from main import RULES
+
+        self.num_envs = num_envs
+        self.observation_size = state_vector_size(RULES.player_count)
+        shapes = {
+            "obs": ((num_envs, self.observation_size), np.float32),
+            "mask": ((num_envs, ACTION_SIZE), np.bool_),
+            "reward": ((num_envs,), np.float32),
+            "terminated": ((num_envs,), np.bool_),
+            "truncated": ((num_envs,), np.bool_),
+        }
+        self._buffers = {
+            name: shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1))
+            for name, (shape, dtype) in shapes.items()
+        }
+        self._arrays = {
+            name: np.ndarray(shape, dtype=dtype, buffer=self._buffers[name].buf) for name, (shape, dtype) in shapes.items()
+        }
+
+        context = get_context("spawn")
+        self._conns = []
+        self._processes = []
+        names = {name: shm.name for name, shm in self._buffers.items()}
+        for index in range(num_envs):
+            parent_conn, child_conn = context.Pipe()
+            kwargs = {**env_kwargs, "seed": None if seed is None else seed + index}
+            process = context.Process(target=_worker, args=(index, child_conn, names, shapes, kwargs), daemon=True)
+            process.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._processes.append(process)
+        self._waiting = False
+        self.closed = False
+
+    def _send(self, index: int, message: tuple) -> None:
+        try:
+            self._conns[index].send(message)
+        except OSError as e:
+            raise EnvWorkerError(f"env {index} is gone (exit code {self._processes[index].exitcode}): {e}") from e
+
+    def _receive(self) -> list[dict]:
+        """ One reply from every worker (read from all so the pipes stay in step), raising the first failure """
+        replies = []
+        for index, conn in enumerate(self._conns):
+            try:
+                replies.append(conn.recv())
+            except (EOFError, OSError):
+                replies.append(("error", f"worker process exited (exit code {self._processes[index].exitcode})\n"))
+        for index, (status, payload) in enumerate(replies):
+            if status == "error":
+                raise EnvWorkerError(f"env {index} failed in its worker:\n{payload}")
+        return [payload for _, payload in replies]
+
+    def reset(self, seed: int | None = None) -> tuple[np.ndarray, dict]:
+        for index in range(self.num_envs):
+            self._send(index, ("reset", None if seed is None else seed + index))
+        infos = self._receive()
+        return self._arrays["obs"].copy(), {"legal_mask": self._arrays["mask"].copy(), "infos": infos}
+
+    def step_async(self, actions) -> None:
+        if self._waiting:
+            raise RuntimeError("step_async() called twice without step_wait()")
+        for index, action in enumerate(actions):
+            self._send(index, ("step", int(action)))
+        self._waiting = True
+
+    def step_wait(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict]:
+        self._waiting = False
+        infos = self._receive()
+        return (
+            self._arrays["obs"].copy(),
+            self._arrays["reward"].copy(),
+            self._arrays["terminated"].copy(),
+            self._arrays["truncated"].copy(),
+            {"legal_mask": self._arrays["mask"].copy(), "infos": infos},
+        )
+
+    def step(self, actions) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict]:
+        self.step_async(actions)
+        return self.step_wait()
+
+    def close(self) -> None:
+        """ Stop the workers and free the shared memory, even if some workers already died """
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            # A reply still pending from step_async is left unread: the worker sends it and then reads the close
+            for conn in self._conns:
+                try:
+                    conn.send(("close", None))
+                except OSError:
+                    pass  # Worker already gone (BrokenPipeError is an OSError)
+            self._waiting = False
+            for process in self._processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+            for conn in self._conns:
+                conn.close()
+        finally:
+            self._arrays = {}
+            for shm in self._buffers.values():
+                shm.close()
+                shm.unlink()
+
+    def __enter__(self) -> "SubprocVectorEnv":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+def benchmark(num_envs: int = 4, steps: int = 2000, seed: int = 0) -> None:
+    """ Random legal actions through SubprocVectorEnv; prints environment steps per second """
+    import time
+
+    rng = np.random.default_rng(seed)
+    with SubprocVectorEnv(num_envs, seed=seed) as envs:
+        obs, info = envs.reset()
+        episodes = 0
+        start = time.perf_counter()
+        for _ in range(steps):
+            actions = [rng.choice(np.flatnonzero(mask)) for mask in info["legal_mask"]]
+            obs, rewards, terminated, truncated, info = envs.step(actions)
+            episodes += int((terminated | truncated).sum())
+        elapsed = time.perf_counter() - start
+    print(f"[env] {num_envs} envs: {steps * num_envs / elapsed:.0f} steps/s, {episodes} episodes finished")
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Step random policies through the vectorized environment.")
+    parser.add_argument("--envs", type=int, default=4)
+    parser.add_argument("--steps", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    benchmark(args.envs, args.steps, args.seed)
@@ -1,55 +1,76 @@
 # main.py
 import sys
 from pathlib import Path
-import yaml
-
-from uno import Game, Card
-from uno import CardType
-from uno import Color
-from uno_pygame import UnoObserverUI
+from uno import Game, GameSaver, SavedMove
+from uno_pygame import UnoObserverUI, GridObserverUI
 
 SAVES_DIR = Path(__file__).parent / "saved_games"
 
-def parse_card(card_str: str) -> Card:
-    parts = card_str.split(" ", 1)
-    if len(parts) == 2:
-        color_str, type_str = parts
-        return Card(color=Color(color_str), card_type=CardType(type_str))
-    elif len(parts) == 1:
-        return Card(color=Color.WILD, card_type=CardType(parts[0]))
-    raise ValueError(f"Invalid card string: {card_str}")
-
-def _latest_save(path: Path) -> Path | None:
+def _saves_newest_first(path: Path) -> list[Path]:
     if not path.exists():
-        return None
-    candidates = sorted(
+        return []
+    return sorted(
         (p for p in path.iterdir() if p.suffix.lower() in (".yml", ".yaml")),
         key=lambda p: p.stat().st_mtime,
         reverse=True
     )
-    return candidates[0] if candidates else None
-
-def load_game(path: Path) -> tuple[Game, list[int | None]] | None:
-    with open(path, "r") as f:
-        data = yaml.safe_load(f)
 
-    if "deck" not in data or not data["deck"]:
-        return None
+def _latest_save(path: Path) -> Path | None:
+    candidates = _saves_newest_first(path)
+    return candidates[0] if candidates else None
 
+def load_game(path: Path) -> tuple[Game, list[SavedMove]] | None:
     try:
-        cards = [parse_card(s) for s in data["deck"]]
+        return GameSaver.load(path)
     except ValueError as e:
         print(f"[load] Error parsing cards: {e}")
         return None
 
-    game = Game(player_count=4)
-    game.deck.cards = cards
-    game.start_game(shuffle=False)
+def watch_live(address: str, grid_tiles: int | None = None) -> int:
+    """ Follow games published by a training run (AI/src/main.py with SPECTATE = True) """
+    from uno import SpectatorSubscriber, LiveGameFeed
+
+    host, _, port = address.rpartition(":")
+    subscriber = SpectatorSubscriber(host or "127.0.0.1", int(port))
+    print(f"[live] Connected to {address}, waiting for the next published game")
+
+    if grid_tiles is not None:
+        ui = GridObserverUI(grid_tiles, live_feed=LiveGameFeed(subscriber))
+    else:
+        game = Game()
+        game.start_game()
+        ui = UnoObserverUI(game, fullscreen=True)
+        ui.attach_live(LiveGameFeed(subscriber))
+    try:
+        return ui.run()
+    finally:
+        subscriber.close()
 
-    moves = data.get("moves", [])
-    return game, moves
+def _arg_value(flag: str, default: str) -> str | None:
+    """ Value following flag on the command line, default if it has none, None if flag is absent """
+    if flag not in sys.argv:
+        return None
+    i = sys.argv.index(flag)
+    if i + 1 < len(sys.argv) and not sys.argv[i + 1].startswith("--"):
+        return sys.argv[i + 1]
+    return default
 
 def main() -> int:
+    grid = _arg_value("--grid", "4")
+    grid_tiles = int(grid) if grid is not None else None
+
+    address = _arg_value("--live", "127.0.0.1:50555")
+    if address is not None:
+        return watch_live(address, grid_tiles)
+
+    if grid_tiles is not None:
+        # Newest recordings first; tiles cycle through all of them
+        saves = _saves_newest_first(SAVES_DIR)
+        if not saves:
+            print(f"[load] No saved games in {SAVES_DIR}")
+            return 1
+        return GridObserverUI(grid_tiles, save_paths=saves).run()
+
     save_path = _latest_save(SAVES_DIR)
 
     if save_path:
@@ -61,7 +82,7 @@ def main() -> int:
             ui.moves = moves
             return ui.run()
 
-    game = Game(player_count=4)
+    game = Game()
     game.start_game()
     ui = UnoObserverUI(game, fullscreen=True)
     return ui.run()
@@ -1,5 +1,5 @@
 from uno import Game
-from uno import GameSaver
+from uno import GameSaver, Color
 from pathlib import Path
 import time
 
@@ -42,8 +42,10 @@ def main():
             uno_game.play(None)
             game_saver.save_move(None)
         else:
-            uno_game.play(current_player.cards[player_choice])
-            game_saver.save_move(player_choice)
+            played_card = current_player.cards[player_choice]
+            uno_game.play(played_card)
+            # A wild card now carries the color that was just chosen
+            game_saver.save_move(player_choice, played_card.color if played_card.color != Color.WILD else None)
 
         game_saver.export()
 
@@ -1,3 +1,8 @@
-from .src.uno import Game, Card, Color, CardType, GameSaver, Player
+from .src.uno import Game, Card, Color, CardType, GameSaver, Player, RuleSet, SavedMove, new_game_from_deck, play_saved_move
+from .src import uno as _uno
 
-__all__ = ["Game", "Player", "Card", "Color", "CardType", "GameSaver"]
\ No newline at end of file
+__all__ = _uno.__all__
+
+def __getattr__(name: str):
+    # Lazily exported names (see uno/src/uno/__init__.py)
+    return getattr(_uno, name)
@@ -1,6 +1,28 @@
 from .game import Game, Card, Player
 from .enums.card_type import CardType
 from .enums.color import Color
-from .game_saver import GameSaver
+from .game_saver import GameSaver, SavedMove, new_game_from_deck, play_saved_move
+from .rules import RuleSet
+from .events import (
+    EVENT_KINDS, GameEvent, CardPlayed, CardsDrawn, TurnSkipped, DirectionReversed, ColorChosen, GameOver,
+)
 
-__all__ = ["Game", "Player", "Card", "CardType", "Color", "GameSaver"]
+__all__ = [
+    "Game", "Player", "Card", "CardType", "Color", "GameSaver", "RuleSet", "new_game_from_deck",
+    "SavedMove", "play_saved_move",
+    "EVENT_KINDS", "GameEvent", "CardPlayed", "CardsDrawn", "TurnSkipped", "DirectionReversed", "ColorChosen", "GameOver",
+    "SpectatorPublisher", "SpectatorSubscriber", "LiveGameFeed",
+]
+
+# Imported on first use so `import uno` does not pull in socket/json
+_LAZY = {
+    "SpectatorPublisher": ".spectator",
+    "SpectatorSubscriber": ".spectator",
+    "LiveGameFeed": ".spectator",
+}
+
+def __getattr__(name: str):
+    if name in _LAZY:
+        import importlib
+        return getattr(importlib.import_module(_LAZY[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
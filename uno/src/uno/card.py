@@ -1,5 +1,6 @@
 from .enums.color import Color
 from .enums.card_type import CardType
+from .rules import CompiledRules, DEFAULT_RULES, compile_rules
 
 class Card:
     def __init__(self, color: Color, card_type: CardType) -> None:
@@ -15,24 +16,11 @@ class Card:
     def set_color(self, color: Color) -> None:
         self.color = color
 
-    def playable(self, previous_card: "Card", draw_debt: bool) -> bool:
+    def playable(self, previous_card: "Card", draw_debt: bool, rules: CompiledRules | None = None) -> bool:
         """ 
         Returns if card is playable given the previous card and if there is a "draw_debt" meaning a +2 or +4
-        has been played previously and nobody has drawn the cards yet (due to stacking or being the next player)
+        has been played previously and nobody has drawn the cards yet (due to stacking or being the next player).
+        The stacking rules come from the compiled rule table (default rules if none given)
         """
-        if draw_debt:
-            # stacking draw 2s
-            if previous_card.card_type == CardType.DRAW_TWO and self.card_type != CardType.DRAW_TWO:
-                return False
-            
-            # stacking draw 4s
-            if previous_card.card_type == CardType.WILD_DRAW_FOUR and self.card_type != CardType.WILD_DRAW_FOUR:
-                return False
-
-        if self.color == previous_card.color:
-            return True
-        if self.card_type == previous_card.card_type:
-            return True
-        if self.card_type == CardType.WILD or self.card_type == CardType.WILD_DRAW_FOUR:
-            return True
-        return False
\ No newline at end of file
+        table = (rules or compile_rules(DEFAULT_RULES)).playable
+        return (self.color, self.card_type) in table[(previous_card.color, previous_card.card_type, bool(draw_debt))]
@@ -1,4 +1,3 @@
-import yaml
 from pathlib import Path
 import random
 
@@ -6,6 +5,20 @@ from .card import Card
 from .enums.color import Color
 from .enums.card_type import CardType
 
+CONFIG_PATH = Path(__file__).parent / "config" / "config.yaml"
+
+_CONFIG_CACHE: dict | None = None
+
+def _load_config() -> dict:
+    """ Parses the card config once per process; yaml is only imported the first time a deck is built """
+    global _CONFIG_CACHE
+    if _CONFIG_CACHE is None:
+        import yaml
+
+        with CONFIG_PATH.open("r") as f:
+            _CONFIG_CACHE = yaml.safe_load(f)
+    return _CONFIG_CACHE
+
 class Deck:
     """ Size is a positive in multiplier where 1 = normal deck, 2 = 2x size deck, etc. """
     def __init__(self, size=1) -> None:
@@ -15,11 +28,8 @@ class Deck:
         self.__init_deck()
     
     def __init_deck(self) -> None:
-        config_path = Path(__file__).parent / "config" / "config.yaml"
+        config = _load_config()
 
-        with config_path.open("r") as f:
-            config = yaml.safe_load(f)
-        
         for color in config["CARDS"]:
             for card_type in config["CARDS"][color]:
                 for i in range(self.size):
@@ -0,0 +1,83 @@
+"""
+Events a Game emits to its listeners (see Game.add_listener).
+
+Every event has a `kind` string, the `game` it happened in and the `seat` of the
+player whose turn it was. Events are created only for kinds that have a listener.
+"""
+from .card import Card
+from .enums.color import Color
+
+CARD_PLAYED = "card_played"
+CARDS_DRAWN = "cards_drawn"
+TURN_SKIPPED = "turn_skipped"
+DIRECTION_REVERSED = "direction_reversed"
+COLOR_CHOSEN = "color_chosen"
+GAME_OVER = "game_over"
+
+EVENT_KINDS = (CARD_PLAYED, CARDS_DRAWN, TURN_SKIPPED, DIRECTION_REVERSED, COLOR_CHOSEN, GAME_OVER)
+
+class GameEvent:
+    __slots__ = ("game", "seat")
+    kind = ""
+
+    def __init__(self, game, seat: int) -> None:
+        self.game = game
+        self.seat = seat
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}(seat={self.seat}{', ' + fields if fields else ''})"
+
+class CardPlayed(GameEvent):
+    """ index is the card's position in the hand before it was played """
+    __slots__ = ("card", "index")
+    kind = CARD_PLAYED
+
+    def __init__(self, game, seat: int, card: Card, index: int) -> None:
+        super().__init__(game, seat)
+        self.card = card
+        self.index = index
+
+class CardsDrawn(GameEvent):
+    """ cards were appended to the end of the hand; debt is True if they were a +2/+4 penalty """
+    __slots__ = ("cards", "debt")
+    kind = CARDS_DRAWN
+
+    def __init__(self, game, seat: int, cards: list[Card], debt: bool) -> None:
+        super().__init__(game, seat)
+        self.cards = cards
+        self.debt = debt
+
+class TurnSkipped(GameEvent):
+    """ skipped is the seat that lost its turn """
+    __slots__ = ("skipped",)
+    kind = TURN_SKIPPED
+
+    def __init__(self, game, seat: int, skipped: int) -> None:
+        super().__init__(game, seat)
+        self.skipped = skipped
+
+class DirectionReversed(GameEvent):
+    __slots__ = ("clockwise",)
+    kind = DIRECTION_REVERSED
+
+    def __init__(self, game, seat: int, clockwise: bool) -> None:
+        super().__init__(game, seat)
+        self.clockwise = clockwise
+
+class ColorChosen(GameEvent):
+    __slots__ = ("color",)
+    kind = COLOR_CHOSEN
+
+    def __init__(self, game, seat: int, color: Color) -> None:
+        super().__init__(game, seat)
+        self.color = color
+
+class GameOver(GameEvent):
+    """ winner is a seat, or -1 if the deck ran out """
+    __slots__ = ("winner",)
+    kind = GAME_OVER
+
+    def __init__(self, game, seat: int, winner: int) -> None:
+        super().__init__(game, seat)
+        self.winner = winner
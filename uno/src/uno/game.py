@@ -1,22 +1,43 @@
+import random
+
 from .player import Player
 from .deck import Deck
 from .card import Card
 
 from .enums.card_type import CardType
 from .enums.color import Color
+from .rules import RuleSet, CompiledRules, DEFAULT_RULES, WILD_CARD_TYPES, compile_rules
+from .state import GameSnapshot, MoveRecord, PLAYABLE_COLORS
+from .events import (
+    EVENT_KINDS, CARD_PLAYED, CARDS_DRAWN, TURN_SKIPPED, DIRECTION_REVERSED, COLOR_CHOSEN, GAME_OVER,
+    CardPlayed, CardsDrawn, TurnSkipped, DirectionReversed, ColorChosen, GameOver,
+)
 
 class Game:
-    def __init__(self, player_count: int = 4) -> None:
-        self.deck: Deck = Deck(size=5)
-        self.players: list[Player] = [Player() for i in range(player_count)]
+    def __init__(self, player_count: int | None = None, rules: RuleSet | None = None) -> None:
+        """ player_count, if given, overrides rules.player_count """
+        rules = rules or DEFAULT_RULES
+        if player_count is not None and player_count != rules.player_count:
+            rules = rules.replace(player_count=player_count)
+
+        self.rules: RuleSet = rules
+        self.rule_table: CompiledRules = compile_rules(rules)
+
+        self.deck: Deck = Deck(size=rules.deck_multiplier)
+        self.players: list[Player] = [Player() for i in range(rules.player_count)]
         self.played_cards: list[Card] = []
         self.whos_turn: int = 0
         self.clockwise_turn: bool = True # Normally goes clockwise for turns, unless reverse card then it flips
         self.draw_debt: int = 0 # The number of cards to draw for 
-        self.history: dict[int, list[Card]] = {0: [], 1: [], 2: [], 3: []}
+        self.history: dict[int, list[Card]] = {i: [] for i in range(rules.player_count)}
 
         self.append_new_deck_call = None
 
+        # Event listeners by kind. While there are none, play() is the plain method and
+        # pays nothing for events; add_listener swaps in the emitting version per instance
+        self._listeners: dict[str, tuple] = {}
+        self._game_over_emitted: bool = False
+
     def __repr__(self) -> str:
         return "\n ".join(f"Player {i}: [{hand}]" for i, hand in enumerate(self.players))
 
@@ -39,6 +60,16 @@ class Game:
 
         return cards_to_draw
 
+    def __draw_until_playable(self) -> list[Card]:
+        """ Draws one card at a time until a playable one comes up or the deck runs out """
+        cards_to_draw: list[Card] = []
+        while self.deck.cards:
+            card = self.deck.draw()[0]
+            cards_to_draw.append(card)
+            if not self.played_cards or card.playable(self.played_cards[-1], False, self.rule_table):
+                break
+        return cards_to_draw
+
     def play(self, played_card: Card | None, replay: bool = False, color_input: Color | None = None) -> None:
         """
         Handles the current player's action of playing a card or drawing from the deck.
@@ -53,10 +84,13 @@ class Game:
         current_player: Player = self.players[self.whos_turn]
 
         if not played_card: # This means the player chose to/had to draw
-            if not self.draw_debt: # If 0 cards are needed to be drawn (nobody played a draw 2 or draw 4), then set the draw amount to 1
-                self.draw_debt = 1
+            if not self.draw_debt and self.rules.draw_until_playable:
+                cards_to_draw: list[Card] = self.__draw_until_playable()
+            else:
+                if not self.draw_debt: # If 0 cards are needed to be drawn (nobody played a draw 2 or draw 4), then set the draw amount to 1
+                    self.draw_debt = 1
 
-            cards_to_draw: list[Card] = self.__smart_draw(self.draw_debt)
+                cards_to_draw = self.__smart_draw(self.draw_debt)
             current_player.recieve_cards(cards_to_draw)
             self.draw_debt = 0
 
@@ -91,6 +125,181 @@ class Game:
 
         self.__set_whos_turn()
     
+    def add_listener(self, listener, *kinds: str) -> None:
+        """ Call listener(event) after each play() for the given event kinds (every kind if none given) """
+        for kind in kinds or EVENT_KINDS:
+            if kind not in EVENT_KINDS:
+                raise ValueError(f"Unknown event kind {kind!r}, expected one of {EVENT_KINDS}")
+            self._listeners[kind] = self._listeners.get(kind, ()) + (listener,)
+        self.play = self._play_with_events
+
+    def remove_listener(self, listener) -> None:
+        self._listeners = {
+            kind: rest for kind, listeners in self._listeners.items()
+            if (rest := tuple(l for l in listeners if l != listener))
+        }
+        if not self._listeners:
+            self.__dict__.pop("play", None)  # Back to the plain class method
+
+    def _emit(self, kind: str, event_type: type, *args) -> None:
+        listeners = self._listeners.get(kind)
+        if listeners:
+            event = event_type(self, *args)
+            for listener in listeners:
+                listener(event)
+
+    def _play_with_events(self, played_card: Card | None, replay: bool = False, color_input: Color | None = None) -> None:
+        """ play() plus events; installed on the instance while listeners are attached """
+        seat = self.whos_turn
+        hand = self.players[seat].cards
+        if played_card:
+            index = hand.index(played_card)
+        else:
+            hand_size = len(hand)
+            debt = bool(self.draw_debt)
+
+        Game.play(self, played_card, replay, color_input)
+
+        if not played_card:
+            self._emit(CARDS_DRAWN, CardsDrawn, seat, hand[hand_size:], debt)
+        else:
+            self._emit(CARD_PLAYED, CardPlayed, seat, played_card, index)
+            card_type = played_card.card_type
+            if card_type == CardType.SKIP:
+                skipped = self.rule_table.next_seat[self.clockwise_turn][seat]
+                self._emit(TURN_SKIPPED, TurnSkipped, seat, skipped)
+            elif card_type == CardType.REVERSE:
+                self._emit(DIRECTION_REVERSED, DirectionReversed, seat, self.clockwise_turn)
+            elif card_type == CardType.WILD or card_type == CardType.WILD_DRAW_FOUR:
+                self._emit(COLOR_CHOSEN, ColorChosen, seat, played_card.color)
+
+        if GAME_OVER in self._listeners and not self._game_over_emitted and self.is_game_over():
+            self._game_over_emitted = True
+            self._emit(GAME_OVER, GameOver, seat, self.get_winner())
+
+    # --- lookahead search ---
+
+    def clone(self) -> "Game":
+        """
+        Independent copy of the current position, far cheaper than deepcopy: the rules
+        and Card objects are shared, only the containers are copied. Listeners are not copied.
+        Advance clones with apply(), which never recolors shared wild cards.
+        """
+        game = Game.__new__(Game)
+        game.rules = self.rules
+        game.rule_table = self.rule_table
+        game.deck = Deck.__new__(Deck)
+        game.deck.cards = self.deck.cards.copy()
+        game.deck.size = self.deck.size
+        game.players = [Player() for _ in self.players]
+        for player, source in zip(game.players, self.players):
+            player.cards = source.cards.copy()
+        game.played_cards = self.played_cards.copy()
+        game.whos_turn = self.whos_turn
+        game.clockwise_turn = self.clockwise_turn
+        game.draw_debt = self.draw_debt
+        game.history = {seat: cards.copy() for seat, cards in self.history.items()}
+        game.append_new_deck_call = None
+        game._listeners = {}
+        game._game_over_emitted = self._game_over_emitted
+        return game
+
+    def snapshot(self) -> GameSnapshot:
+        return GameSnapshot(self)
+
+    def restore(self, snapshot: GameSnapshot) -> None:
+        """ Return to a snapshot of this game (any earlier or sibling position) """
+        for player, hand in zip(self.players, snapshot.hands):
+            player.cards[:] = hand
+        self.deck.cards[:] = snapshot.deck
+        self.played_cards[:] = snapshot.played_cards
+        for seat, cards in enumerate(snapshot.history):
+            self.history[seat][:] = cards
+        if snapshot.top_color is not None:
+            self.played_cards[-1].color = snapshot.top_color
+        self.whos_turn = snapshot.whos_turn
+        self.clockwise_turn = snapshot.clockwise_turn
+        self.draw_debt = snapshot.draw_debt
+
+    def legal_moves(self) -> list[tuple[int | None, Color | None]]:
+        """
+        Distinct moves for the current player as (hand index, color): one per different
+        playable card, wilds once per color, and (None, None) for drawing.
+        """
+        moves: list[tuple[int | None, Color | None]] = []
+        seen = set()
+        for i, card in self.get_playable_cards(self.players[self.whos_turn]):
+            if card.card_type in WILD_CARD_TYPES:
+                if card.card_type not in seen:
+                    seen.add(card.card_type)
+                    moves.extend((i, color) for color in PLAYABLE_COLORS)
+            elif (card.color, card.card_type) not in seen:
+                seen.add((card.color, card.card_type))
+                moves.append((i, None))
+        moves.append((None, None))
+        return moves
+
+    def apply(self, move: int | None, color: Color | None = None) -> MoveRecord:
+        """
+        Play hand index `move` (None = draw) for the current player, without events or
+        prompting for input. Wild cards need a color. Pass the result to undo() to take it back.
+        """
+        record = MoveRecord(self)
+        if move is None:
+            Game.play(self, None)
+            return record
+
+        hand = self.players[self.whos_turn].cards
+        card = hand[move]
+        record.card = card
+        if card.card_type in WILD_CARD_TYPES:
+            if color is None:
+                raise ValueError("A color is needed to play a wild card")
+            # Play a private copy: the original object may also sit in other hands or the deck
+            hand[move] = Card(color, card.card_type)
+            record.removed_at = move
+            Game.play(self, hand[move], replay=True)
+        else:
+            # remove_card takes the first occurrence of a shared card object
+            record.removed_at = hand.index(card)
+            Game.play(self, card)
+        return record
+
+    def undo(self, record: MoveRecord) -> None:
+        """ Take back the most recent apply() (records must be undone in reverse order) """
+        hand = self.players[record.seat].cards
+        if record.card is None:
+            drawn = hand[record.hand_size:]
+            del hand[record.hand_size:]
+            self.deck.cards[0:0] = drawn  # Deck.draw takes from the front
+        else:
+            self.played_cards.pop()
+            self.history[record.seat].pop()
+            hand.insert(record.removed_at, record.card)
+        self.whos_turn = record.whos_turn
+        self.clockwise_turn = record.clockwise_turn
+        self.draw_debt = record.draw_debt
+
+    def determinize(self, seat: int, rng=None) -> "Game":
+        """
+        A clone in which everything `seat` cannot see (other hands and the deck order)
+        is dealt again at random from the unseen cards. Hand sizes and everything
+        played stay the same, so the result is consistent with what `seat` has observed.
+        """
+        rng = rng or random
+        game = self.clone()
+        others = [player for i, player in enumerate(game.players) if i != seat]
+        unseen = [card for player in others for card in player.cards] + game.deck.cards
+        rng.shuffle(unseen)
+
+        start = 0
+        for player in others:
+            size = len(player.cards)
+            player.cards = unseen[start:start + size]
+            start += size
+        game.deck.cards = unseen[start:]
+        return game
+
     def get_playable_cards(self, player: Player) -> list[tuple[int, Card]]:
         """ Returns a list of indexes and card types for available cards """
         if not self.played_cards:
@@ -98,9 +307,10 @@ class Game:
             return list(enumerate(player.cards))
         
         last_played_card = self.played_cards[-1]
+        allowed = self.rule_table.playable[(last_played_card.color, last_played_card.card_type, bool(self.draw_debt))]
         playable_cards: list[tuple[int, Card]] = [
             (i, card) for i, card in enumerate(player.cards)
-            if card.playable(last_played_card, True if self.draw_debt else False)
+            if (card.color, card.card_type) in allowed
         ]
         return playable_cards
 
@@ -115,12 +325,7 @@ class Game:
         return color_map[int(user_input)]
 
     def __set_whos_turn(self) -> None:
-        if self.clockwise_turn:
-            self.whos_turn += 1
-        else:
-            self.whos_turn -= 1
-        
-        self.whos_turn %= len(self.players)
+        self.whos_turn = self.rule_table.next_seat[self.clockwise_turn][self.whos_turn]
 
     def __skip(self) -> None:
         self.__set_whos_turn()
@@ -137,7 +342,7 @@ class Game:
         return False
 
     def deal_cards(self) -> None:
-        NUM_CARDS_TO_DEAL = 7
+        NUM_CARDS_TO_DEAL = self.rule_table.hand_size
         current_player_to_deal: int = 0
         for i in range(NUM_CARDS_TO_DEAL * len(self.players)):
             self.players[current_player_to_deal].recieve_cards(self.deck.draw())
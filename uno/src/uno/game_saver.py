@@ -1,25 +1,96 @@
 from pathlib import Path
 from .game import Game
 from .deck import Deck
-import yaml
+from .card import Card
+from .enums.card_type import CardType
+from .enums.color import Color
+from .events import CARD_PLAYED, CARDS_DRAWN, GameEvent
+from .rules import RuleSet, WILD_CARD_TYPES
+
+# 1: moves are hand indexes or None (draw). 2: adds "format", and a wild card is
+# saved as [index, color] so replays follow the color that was chosen
+SAVE_FORMAT = 2
+
+# A hand index, (hand index, chosen color) for a wild card, or None for a draw
+SavedMove = int | tuple[int, Color] | None
+
+def parse_card(card_str: str) -> Card:
+    """ Inverse of str(card): "Red Three" or "Wild_draw_four" """
+    parts = card_str.split(" ", 1)
+    if len(parts) == 2:
+        color_str, type_str = parts
+        return Card(color=Color(color_str), card_type=CardType(type_str))
+    elif len(parts) == 1:
+        return Card(color=Color.WILD, card_type=CardType(parts[0]))
+    raise ValueError(f"Invalid card string: {card_str}")
+
+def new_game_from_deck(deck: list[str], player_count: int | None = None, rules: RuleSet | None = None) -> Game:
+    """ Game at its starting position (dealt, first card flipped) from a pre-deal deck listing """
+    game = Game(player_count=player_count, rules=rules)
+    game.deck.cards = [parse_card(s) for s in deck]
+    game.start_game(shuffle=False)
+    return game
+
+def play_saved_move(game: Game, move: SavedMove) -> None:
+    """ Play one entry of a saved move list for the current player """
+    if move is None:
+        game.play(None)  # Draw
+        return
+    if isinstance(move, tuple):
+        index, color = move
+        game.play(game.players[game.whos_turn].cards[index], color_input=color)
+        return
+    # Format 1 saves have no wild colors; the card is replayed as it is
+    game.play(game.players[game.whos_turn].cards[move], replay=True)
+
+def _encode_move(move: SavedMove) -> int | list | None:
+    if isinstance(move, tuple):
+        index, color = move
+        return [index, color.value]
+    return move
+
+def _decode_move(move: int | list | None) -> SavedMove:
+    if isinstance(move, list):
+        index, color = move
+        return index, Color(color)
+    return move
 
 class GameSaver:
     def __init__(self, game: Game, save_path: Path) -> None:
         self.save_path: Path = save_path
-        self.move_list: list[int | None] = []  # ints = played card index, None = draw
+        self.move_list: list[SavedMove] = []  # ints = played card index, (index, color) = wild, None = draw
         self.deck: Deck = game.deck
+        self.rules: RuleSet = game.rules
+
+    def save_move(self, move: int | None, color: Color | None = None) -> None:
+        """ color is the one chosen for a wild card, needed to replay the game exactly """
+        self.move_list.append(move if color is None else (move, color))
+
+    def record(self, game: Game) -> None:
+        """ Save every move of game as it is played, instead of calling save_move by hand """
+        game.add_listener(self._on_event, CARD_PLAYED, CARDS_DRAWN)
 
-    def save_move(self, move: int | None) -> None:
-        self.move_list.append(move)
+    def _on_event(self, event: GameEvent) -> None:
+        if event.kind != CARD_PLAYED:
+            self.save_move(None)
+        elif event.card.card_type in WILD_CARD_TYPES:
+            self.save_move(event.index, event.card.color)
+        else:
+            self.save_move(event.index)
 
     def export(self) -> None:
         """
         Export to YAML:
         - deck is only written if file doesn't exist
         - moves are always updated
+        - rules are those of the game being saved, so it replays under the same variant
         """
+        import yaml
+
         payload = {
-            "moves": self.move_list
+            "format": SAVE_FORMAT,
+            "rules": self.rules.to_dict(),
+            "moves": [_encode_move(move) for move in self.move_list]
         }
 
         if self.save_path.exists():
@@ -34,4 +105,25 @@ class GameSaver:
         self.save_path.parent.mkdir(parents=True, exist_ok=True)
         with open(self.save_path, "w", encoding="utf-8") as f:
             yaml.safe_dump(payload, f, sort_keys=False, allow_unicode=True)
-    
\ No newline at end of file
+
+    @staticmethod
+    def load(save_path: Path, player_count: int | None = None) -> tuple[Game, list[SavedMove]] | None:
+        """
+        Rebuild a saved game at its starting position (dealt, first card flipped)
+        plus its move list (play each with play_saved_move), under the rules it was saved with.
+        Returns None if the file has no deck; raises ValueError for a newer save format.
+        """
+        import yaml
+
+        with open(save_path, "r", encoding="utf-8") as f:
+            data = yaml.safe_load(f) or {}
+
+        save_format = data.get("format", 1)
+        if save_format > SAVE_FORMAT:
+            raise ValueError(f"{save_path} has save format {save_format}, this version reads up to {SAVE_FORMAT}")
+
+        if not data.get("deck"):
+            return None
+
+        game = new_game_from_deck(data["deck"], player_count, RuleSet.from_dict(data.get("rules")))
+        return game, [_decode_move(move) for move in data.get("moves") or []]
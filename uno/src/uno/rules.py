@@ -0,0 +1,132 @@
+from .enums.card_type import CardType
+from .enums.color import Color
+
+DRAW_CARD_TYPES = frozenset({CardType.DRAW_TWO, CardType.WILD_DRAW_FOUR})
+WILD_CARD_TYPES = frozenset({CardType.WILD, CardType.WILD_DRAW_FOUR})
+
+class RuleSet:
+    """
+    The variant of uno being played. The defaults are the rules the engine has
+    always used: 4 players, 7 cards each, 5x deck, +2 on +2 and +4 on +4 stacking.
+
+    player_count: number of seats (2-10)
+    hand_size: cards dealt to each player
+    stacking: if a draw debt can be passed on by playing another draw card
+    cross_stacking: with stacking, if +4 may be played on +2 and +2 (matching color) on +4
+    draw_until_playable: drawing without a debt keeps drawing until a playable card comes up
+    deck_multiplier: number of standard 108 card decks shuffled together
+
+    RuleSets are immutable and hashable so each one is compiled only once.
+    """
+    __slots__ = FIELDS = ("player_count", "hand_size", "stacking", "cross_stacking", "draw_until_playable", "deck_multiplier")
+
+    def __init__(
+        self,
+        player_count: int = 4,
+        hand_size: int = 7,
+        stacking: bool = True,
+        cross_stacking: bool = False,
+        draw_until_playable: bool = False,
+        deck_multiplier: int = 5,
+    ) -> None:
+        if not 2 <= player_count <= 10:
+            raise ValueError(f"player_count must be between 2 and 10, got {player_count}")
+        if hand_size < 1:
+            raise ValueError(f"hand_size must be positive, got {hand_size}")
+        if deck_multiplier < 1:
+            raise ValueError(f"deck_multiplier must be positive, got {deck_multiplier}")
+        if player_count * hand_size >= 108 * deck_multiplier:
+            raise ValueError("Not enough cards in the deck to deal every hand")
+
+        for name, value in zip(self.FIELDS, (player_count, hand_size, bool(stacking), bool(cross_stacking), bool(draw_until_playable), deck_multiplier)):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError("RuleSet is immutable, use replace()")
+
+    def _values(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.FIELDS)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, RuleSet) and self._values() == other._values()
+
+    def __hash__(self) -> int:
+        return hash(self._values())
+
+    def __repr__(self) -> str:
+        return "RuleSet(" + ", ".join(f"{name}={getattr(self, name)!r}" for name in self.FIELDS) + ")"
+
+    def __reduce__(self):
+        # Rebuilt through __init__ so pickling (e.g. to worker processes) bypasses __setattr__
+        return (RuleSet, self._values())
+
+    def replace(self, **changes) -> "RuleSet":
+        return RuleSet(**{**dict(zip(self.FIELDS, self._values())), **changes})
+
+    def to_dict(self) -> dict:
+        """ Plain fields for save files and the spectator feed """
+        return dict(zip(self.FIELDS, self._values()))
+
+    @classmethod
+    def from_dict(cls, data: dict | None) -> "RuleSet":
+        """ Inverse of to_dict; missing fields (files written before rules were saved) take the defaults """
+        data = data or {}
+        unknown = set(data) - set(cls.FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown rule fields: {sorted(unknown)}")
+        return cls(**data)
+
+def _playable(rules: RuleSet, color: Color, card_type: CardType, prev_color: Color, prev_type: CardType, has_debt: bool) -> bool:
+    """ Reference rule; only evaluated while compiling the lookup table """
+    if has_debt and prev_type in DRAW_CARD_TYPES:
+        if not rules.stacking:
+            return False
+        allowed = DRAW_CARD_TYPES if rules.cross_stacking else {prev_type}
+        if card_type not in allowed:
+            return False
+
+    if color == prev_color:
+        return True
+    if card_type == prev_type:
+        return True
+    if card_type in WILD_CARD_TYPES:
+        return True
+    return False
+
+class CompiledRules:
+    """
+    A RuleSet turned into lookup tables for the engine's hot path:
+
+    playable[(prev_color, prev_type, has_debt)] -> frozenset of (color, card_type) that may be played
+    next_seat[clockwise][seat] -> seat whose turn is next
+    """
+    def __init__(self, rules: RuleSet) -> None:
+        self.rules = rules
+        self.player_count = rules.player_count
+        self.hand_size = rules.hand_size
+
+        all_cards = [(color, card_type) for color in Color for card_type in CardType]
+        self.playable: dict[tuple[Color, CardType, bool], frozenset[tuple[Color, CardType]]] = {
+            (prev_color, prev_type, has_debt): frozenset(
+                card for card in all_cards
+                if _playable(rules, card[0], card[1], prev_color, prev_type, has_debt)
+            )
+            for prev_color, prev_type in all_cards
+            for has_debt in (False, True)
+        }
+
+        n = rules.player_count
+        self.next_seat: dict[bool, tuple[int, ...]] = {
+            True: tuple((seat + 1) % n for seat in range(n)),
+            False: tuple((seat - 1) % n for seat in range(n)),
+        }
+
+_COMPILED_CACHE: dict[RuleSet, CompiledRules] = {}
+
+def compile_rules(rules: RuleSet) -> CompiledRules:
+    """ Compiled once per distinct RuleSet and shared by every game using it """
+    if rules not in _COMPILED_CACHE:
+        _COMPILED_CACHE[rules] = CompiledRules(rules)
+    return _COMPILED_CACHE[rules]
+
+DEFAULT_RULES = RuleSet()
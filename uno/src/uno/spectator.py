@@ -0,0 +1,240 @@
+"""
+Live spectator feed: a training process publishes the moves of sampled games
+over a local TCP socket and observers subscribe to watch them as they happen.
+
+Events are newline-delimited JSON objects:
+    {"event": "game_start", "deck": [...], "player_count": 4, "rules": {...}, "info": {...}}
+    {"event": "move", "move": 3 | null, "color": "Red" | null}
+    {"event": "game_over", "winner": 0 | -1 | null}
+
+The deck is sent in its pre-deal order (as GameSaver writes it) with the
+RuleSet fields, so a subscriber rebuilds the game with new_game_from_deck and
+replays moves on it.
+
+The publisher never blocks the game loop: sockets are non-blocking, new
+subscribers are only accepted at game boundaries (they need a game_start to
+follow along anyway), and a subscriber that falls more than max_pending bytes
+behind is dropped for the rest of that game and resynced at the next one.
+Only whole unsent events are dropped: a line whose start already went out is
+finished first, so the stream always stays valid NDJSON.
+With nobody connected, begin_game() is one non-blocking accept() and the
+other calls return immediately.
+"""
+import json
+import socket
+from collections import deque
+
+from .game import Game
+from .enums.color import Color
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 50555
+
+class _Subscriber:
+    __slots__ = ("sock", "pending", "queued", "sent", "in_sync")
+
+    def __init__(self, sock: socket.socket) -> None:
+        self.sock = sock
+        self.pending: deque[bytes] = deque()  # Encoded events not fully sent yet, one line each
+        self.queued = 0  # Total bytes in pending
+        self.sent = 0  # Bytes of pending[0] already sent
+        self.in_sync = False  # Only receives events once it has seen a game_start
+
+    @property
+    def unsent(self) -> int:
+        return self.queued - self.sent
+
+    def queue(self, line: bytes) -> None:
+        self.pending.append(line)
+        self.queued += len(line)
+
+    def flush(self) -> None:
+        """ Send as much as the socket takes without blocking; OSError if the subscriber is gone """
+        while self.pending:
+            head = self.pending[0]
+            try:
+                self.sent += self.sock.send(memoryview(head)[self.sent:])
+            except (BlockingIOError, InterruptedError):
+                return
+            if self.sent < len(head):
+                return
+            self.queued -= len(self.pending.popleft())
+            self.sent = 0
+
+    def drop_unsent(self) -> None:
+        """ Forget every event not started yet; a partly sent line is kept so it can be finished """
+        while len(self.pending) > (1 if self.sent else 0):
+            self.queued -= len(self.pending.pop())
+
+class SpectatorPublisher:
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, max_pending: int = 1 << 20) -> None:
+        self.max_pending = max_pending
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind((host, port))
+        self._server.listen()
+        self._server.setblocking(False)
+        self.address: tuple[str, int] = self._server.getsockname()
+
+        self._subscribers: list[_Subscriber] = []
+        self.publishing = False  # True while a game is being streamed to someone
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    def begin_game(self, game: Game, info: dict | None = None) -> bool:
+        """
+        Call after shuffling and before dealing. Returns True if the game is being
+        published; if False the caller can skip move()/end_game() entirely.
+        """
+        self._accept()
+        self.publishing = bool(self._subscribers)
+        if self.publishing:
+            for sub in self._subscribers:
+                # Anything still queued (the end of the last game) goes out first
+                sub.in_sync = True
+            self._send({
+                "event": "game_start",
+                "deck": [str(card) for card in game.deck.cards],
+                "player_count": len(game.players),
+                "rules": game.rules.to_dict(),
+                "info": info or {},
+            })
+        return self.publishing
+
+    def move(self, move: int | None, color: Color | None = None) -> None:
+        if self.publishing:
+            self._send({"event": "move", "move": move, "color": color.value if color else None})
+
+    def end_game(self, winner: int | None) -> None:
+        if self.publishing:
+            self._send({"event": "game_over", "winner": winner})
+            self.publishing = False
+
+    def flush(self) -> None:
+        """ Send what is still queued without waiting for the next event (e.g. while idle between games) """
+        for sub in list(self._subscribers):
+            try:
+                sub.flush()
+            except OSError:
+                sub.sock.close()
+                self._subscribers.remove(sub)
+
+    def close(self) -> None:
+        for sub in self._subscribers:
+            sub.sock.close()
+        self._subscribers = []
+        self._server.close()
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                sock, _ = self._server.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            sock.setblocking(False)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._subscribers.append(_Subscriber(sock))
+
+    def _send(self, event: dict) -> None:
+        data = (json.dumps(event, separators=(",", ":")) + "\n").encode("utf-8")
+        dropped = []
+        any_in_sync = False
+        for sub in self._subscribers:
+            if sub.in_sync:
+                sub.queue(data)
+            elif not sub.pending:
+                continue
+            try:
+                sub.flush()
+            except OSError:
+                dropped.append(sub)
+                continue
+
+            if sub.in_sync and sub.unsent > self.max_pending:
+                # Too slow: stop sending this game, it resyncs at the next game_start
+                sub.in_sync = False
+                sub.drop_unsent()
+            elif sub.in_sync:
+                any_in_sync = True
+
+        for sub in dropped:
+            sub.sock.close()
+            self._subscribers.remove(sub)
+
+        if not any_in_sync:
+            self.publishing = False
+
+class SpectatorSubscriber:
+    """ Non-blocking reader; poll() returns every complete event received since the last call """
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+        self._sock = socket.create_connection((host, port))
+        self._sock.setblocking(False)
+        self._buffer = bytearray()
+        self.connected = True
+
+    def poll(self) -> list[dict]:
+        while self.connected:
+            try:
+                chunk = self._sock.recv(1 << 16)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                chunk = b""
+            if not chunk:
+                self.connected = False
+                break
+            self._buffer += chunk
+
+        events = []
+        end = self._buffer.rfind(b"\n")
+        if end >= 0:
+            for line in bytes(self._buffer[:end]).split(b"\n"):
+                if line:
+                    events.append(json.loads(line))
+            del self._buffer[:end + 1]
+        return events
+
+    def close(self) -> None:
+        self._sock.close()
+        self.connected = False
+
+class LiveGameFeed:
+    """
+    Turns subscriber events into a queue of games to animate. Keeps at most
+    max_games queued so a slow viewer skips ahead instead of falling behind.
+    """
+
+    def __init__(self, subscriber: SpectatorSubscriber, max_games: int = 2) -> None:
+        self.subscriber = subscriber
+        self.max_games = max_games
+        self.games: deque[dict] = deque()  # {"deck", "player_count", "rules", "info", "moves": deque, "winner", "over"}
+        self._receiving: dict | None = None  # Game moves are appended to, even after a viewer took it off the queue
+
+    def poll(self) -> None:
+        for event in self.subscriber.poll():
+            kind = event.get("event")
+            if kind == "game_start":
+                if self._receiving is not None:
+                    self._receiving["over"] = True  # Publisher dropped us mid-game
+                self._receiving = {
+                    "deck": event["deck"],
+                    "player_count": event["player_count"],
+                    "rules": event.get("rules"),
+                    "info": event.get("info", {}),
+                    "moves": deque(),
+                    "winner": None,
+                    "over": False,
+                }
+                self.games.append(self._receiving)
+                while len(self.games) > self.max_games:
+                    self.games.popleft()
+            elif self._receiving is not None and kind == "move":
+                color = Color(event["color"]) if event.get("color") else None
+                self._receiving["moves"].append((event["move"], color))
+            elif self._receiving is not None and kind == "game_over":
+                self._receiving["winner"] = event.get("winner")
+                self._receiving["over"] = True
+                self._receiving = None
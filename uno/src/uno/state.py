@@ -0,0 +1,39 @@
+"""
+Records used by Game.snapshot/restore and Game.apply/undo for lookahead search.
+
+Both hold references to the game's Card objects rather than copies: cards are
+shared between hands, deck and clones and only wild cards are ever mutated
+(their color), which apply() avoids by playing a private copy of the wild.
+"""
+from .card import Card
+from .enums.color import Color
+
+PLAYABLE_COLORS = (Color.RED, Color.YELLOW, Color.GREEN, Color.BLUE)
+
+class GameSnapshot:
+    """ Everything play() can change, taken by Game.snapshot() """
+    __slots__ = ("hands", "deck", "played_cards", "history", "top_color", "whos_turn", "clockwise_turn", "draw_debt")
+
+    def __init__(self, game) -> None:
+        self.hands = tuple(tuple(player.cards) for player in game.players)
+        self.deck = tuple(game.deck.cards)
+        self.played_cards = tuple(game.played_cards)
+        self.history = tuple(tuple(game.history[seat]) for seat in range(len(game.players)))
+        # Shared wild objects may be recolored later, so the color in play is kept separately
+        self.top_color = game.played_cards[-1].color if game.played_cards else None
+        self.whos_turn = game.whos_turn
+        self.clockwise_turn = game.clockwise_turn
+        self.draw_debt = game.draw_debt
+
+class MoveRecord:
+    """ What Game.undo() needs to take back one Game.apply() """
+    __slots__ = ("seat", "card", "removed_at", "hand_size", "whos_turn", "clockwise_turn", "draw_debt")
+
+    def __init__(self, game) -> None:
+        self.seat = game.whos_turn
+        self.card: Card | None = None  # None for a draw
+        self.removed_at = 0
+        self.hand_size = len(game.players[game.whos_turn].cards)
+        self.whos_turn = game.whos_turn
+        self.clockwise_turn = game.clockwise_turn
+        self.draw_debt = game.draw_debt
@@ -0,0 +1,64 @@
+import random
+
+import yaml
+
+from uno import CardType, Color, Game, GameSaver, RuleSet, play_saved_move
+
+COLORS = [Color.RED, Color.BLUE, Color.GREEN, Color.YELLOW]
+WILDS = (CardType.WILD, CardType.WILD_DRAW_FOUR)
+
+def _play_recorded(rules: RuleSet, seed: int, save_path) -> Game:
+    """ Play a random game to the end, saving it the way training does """
+    rng = random.Random(seed)
+    game = Game(rules=rules)
+    rng.shuffle(game.deck.cards)
+    saver = GameSaver(game, save_path)
+    saver.export()  # Pre-deal deck
+    saver.record(game)
+    game.start_game(shuffle=False)
+
+    while not game.is_game_over():
+        playable = game.get_playable_cards(game.players[game.whos_turn])
+        if not playable or rng.random() < 0.1:
+            game.play(None)
+        else:
+            _, card = rng.choice(playable)
+            color = rng.choice(COLORS) if card.card_type in WILDS else None
+            game.play(card, color_input=color)
+    saver.export()
+    return game
+
+def _state(game: Game) -> tuple:
+    return (
+        [[str(card) for card in player.cards] for player in game.players],
+        [str(card) for card in game.played_cards],
+        game.get_winner(),
+    )
+
+def test_replay_follows_wild_colors(tmp_path):
+    rules = RuleSet(draw_until_playable=True, deck_multiplier=1)
+    for seed in range(20):
+        save_path = tmp_path / f"game_{seed}.yaml"
+        played = _play_recorded(rules, seed, save_path)
+
+        game, moves = GameSaver.load(save_path)
+        assert game.rules == rules
+        for move in moves:
+            play_saved_move(game, move)
+        assert _state(game) == _state(played), f"seed {seed} replayed differently"
+
+def test_old_saves_still_load(tmp_path):
+    played_path = tmp_path / "new.yaml"
+    _play_recorded(RuleSet(), 0, played_path)
+    with open(played_path, encoding="utf-8") as f:
+        data = yaml.safe_load(f)
+
+    # Format 1: no "format" key and plain indexes for wild cards
+    del data["format"]
+    data["moves"] = [move[0] if isinstance(move, list) else move for move in data["moves"]]
+    old_path = tmp_path / "old.yaml"
+    with open(old_path, "w", encoding="utf-8") as f:
+        yaml.safe_dump(data, f)
+
+    game, moves = GameSaver.load(old_path)
+    assert moves == data["moves"]
@@ -0,0 +1,137 @@
+import random
+
+import pytest
+
+from uno import Color, Game, RuleSet, new_game_from_deck, play_saved_move
+
+RULES = [
+    RuleSet(),
+    RuleSet(player_count=2, stacking=False, deck_multiplier=1),
+    RuleSet(player_count=5, cross_stacking=True, draw_until_playable=True, deck_multiplier=1),
+]
+
+def _cards(cards) -> list[tuple]:
+    return [(card.color, card.card_type) for card in cards]
+
+def _state(game: Game) -> tuple:
+    """ Everything play() can change, by value """
+    return (
+        [_cards(player.cards) for player in game.players],
+        _cards(game.deck.cards),
+        _cards(game.played_cards),
+        [_cards(game.history[seat]) for seat in range(len(game.players))],
+        game.whos_turn,
+        game.clockwise_turn,
+        game.draw_debt,
+    )
+
+def _new_game(rules: RuleSet, seed: int) -> tuple[Game, list[str]]:
+    """ A dealt game and the pre-deal deck it came from """
+    game = Game(rules=rules)
+    random.Random(seed).shuffle(game.deck.cards)
+    deck = [str(card) for card in game.deck.cards]
+    game.start_game(shuffle=False)
+    return game, deck
+
+def _random_moves(game: Game, rng: random.Random, limit: int):
+    """ Apply up to limit random legal moves, yielding each (move, color, record) """
+    for _ in range(limit):
+        if game.is_game_over():
+            return
+        move, color = rng.choice(game.legal_moves())
+        yield move, color, game.apply(move, color)
+
+@pytest.mark.parametrize("rules", RULES)
+def test_clone_is_independent(rules):
+    game, _ = _new_game(rules, 1)
+    game.add_listener(lambda event: None)
+    before = _state(game)
+
+    clone = game.clone()
+    assert _state(clone) == before
+    assert clone._listeners == {}
+    for _ in _random_moves(clone, random.Random(1), 200):
+        pass
+
+    assert _state(clone) != before
+    assert _state(game) == before
+
+@pytest.mark.parametrize("rules", RULES)
+def test_apply_matches_play(rules):
+    for seed in range(5):
+        game, deck = _new_game(rules, seed)
+        played = new_game_from_deck(deck, rules=rules)
+        for move, color, _ in _random_moves(game, random.Random(seed), 500):
+            play_saved_move(played, move if color is None else (move, color))
+            assert _state(game) == _state(played)
+
+@pytest.mark.parametrize("rules", RULES)
+def test_undo_restores_every_position(rules):
+    for seed in range(5):
+        game, _ = _new_game(rules, seed)
+        positions, records = [], []
+        positions.append(_state(game))
+        for _, _, record in _random_moves(game, random.Random(seed), 300):
+            records.append(record)
+            positions.append(_state(game))
+
+        for record in reversed(records):
+            positions.pop()
+            game.undo(record)
+            assert _state(game) == positions[-1]
+
+def _wild_turn(game: Game) -> int:
+    """ Make it the turn of a seat holding a wild card, returning the card's index """
+    seat, index = next(
+        (seat, i) for seat, player in enumerate(game.players)
+        for i, card in enumerate(player.cards) if card.color == Color.WILD
+    )
+    game.whos_turn = seat
+    return index
+
+def test_apply_leaves_shared_wilds_uncolored():
+    game, _ = _new_game(RuleSet(), 0)
+    index = _wild_turn(game)
+    hand = game.players[game.whos_turn].cards
+    card = hand[index]
+
+    record = game.apply(index, Color.RED)
+    assert card.color == Color.WILD
+    assert game.played_cards[-1].color == Color.RED
+
+    game.undo(record)
+    assert hand[index] is card
+
+def test_apply_wild_needs_a_color():
+    game, _ = _new_game(RuleSet(), 0)
+    index = _wild_turn(game)
+    before = _state(game)
+    with pytest.raises(ValueError):
+        game.apply(index)
+    assert _state(game) == before
+
+@pytest.mark.parametrize("rules", RULES)
+def test_determinize_keeps_what_the_seat_has_seen(rules):
+    game, _ = _new_game(rules, 3)
+    for _ in _random_moves(game, random.Random(3), 40):
+        pass
+    before = _state(game)
+    seat = game.whos_turn
+
+    world = game.determinize(seat, random.Random(0))
+    hands, deck, played, history, *turn = _state(world)
+    real_hands, real_deck, real_played, real_history, *real_turn = before
+
+    assert _state(game) == before
+    assert hands[seat] == real_hands[seat]
+    assert [len(hand) for hand in hands] == [len(hand) for hand in real_hands]
+    assert len(deck) == len(real_deck)
+    assert (played, history, turn) == (real_played, real_history, real_turn)
+
+    unseen = [card for i, hand in enumerate(hands) if i != seat for card in hand] + deck
+    real_unseen = [card for i, hand in enumerate(real_hands) if i != seat for card in hand] + real_deck
+    assert sorted(map(str, unseen)) == sorted(map(str, real_unseen))
+
+    # Seeded worlds are reproducible and differ between seeds
+    assert _state(game.determinize(seat, random.Random(0))) == _state(world)
+    assert _state(game.determinize(seat, random.Random(1))) != _state(world)
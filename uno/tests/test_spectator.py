@@ -0,0 +1,73 @@
+import time
+
+from uno import Game, RuleSet, SpectatorPublisher, SpectatorSubscriber
+
+MOVE = {"event": "move", "move": None, "color": None}
+
+def _new_game(rules: RuleSet) -> Game:
+    game = Game(rules=rules)
+    game.deck.shuffle()
+    return game
+
+def _drain(publisher: SpectatorPublisher, subscriber: SpectatorSubscriber, until: dict) -> list[dict]:
+    """ Read events (flushing the publisher meanwhile) until `until` arrives """
+    events = []
+    deadline = time.monotonic() + 30
+    while until not in events:
+        assert time.monotonic() < deadline, "timed out waiting for events"
+        publisher.flush()
+        events += subscriber.poll()
+    return events
+
+def _fill_socket(publisher: SpectatorPublisher) -> int:
+    """ Publish moves until the subscriber's socket stops taking them """
+    moves = 0
+    sub = publisher._subscribers[0]
+    while publisher.publishing and not sub.pending:
+        publisher.move(None)
+        moves += 1
+    return moves
+
+def test_overflow_then_resync_keeps_lines_whole():
+    publisher = SpectatorPublisher(port=0, max_pending=64 * 1024)
+    subscriber = SpectatorSubscriber(*publisher.address)
+    try:
+        assert publisher.begin_game(_new_game(RuleSet()), {"game": 0})
+        # The subscriber reads nothing during the first game, so it falls behind and is dropped
+        while publisher.publishing:
+            publisher.move(None)
+        publisher.end_game(-1)
+
+        rules = RuleSet(player_count=3, stacking=False, draw_until_playable=True)
+        assert publisher.begin_game(_new_game(rules), {"game": 1})
+        for _ in range(10):
+            publisher.move(None)
+        publisher.end_game(2)
+
+        events = _drain(publisher, subscriber, {"event": "game_over", "winner": 2})
+        starts = [i for i, event in enumerate(events) if event["event"] == "game_start"]
+        assert [events[i]["info"]["game"] for i in starts] == [0, 1]
+        assert events[starts[1]]["rules"] == rules.to_dict()
+        assert events[starts[1] + 1:] == [MOVE] * 10 + [{"event": "game_over", "winner": 2}]
+    finally:
+        subscriber.close()
+        publisher.close()
+
+def test_resync_keeps_queued_game_over():
+    publisher = SpectatorPublisher(port=0, max_pending=1 << 24)
+    subscriber = SpectatorSubscriber(*publisher.address)
+    try:
+        assert publisher.begin_game(_new_game(RuleSet()), {"game": 0})
+        moves = _fill_socket(publisher)
+        publisher.end_game(1)  # Queued behind the moves the socket did not take
+        assert publisher.begin_game(_new_game(RuleSet()), {"game": 1})
+        publisher.end_game(0)
+
+        events = _drain(publisher, subscriber, {"event": "game_over", "winner": 0})
+        assert [event["event"] for event in events] == (
+            ["game_start"] + ["move"] * moves + ["game_over", "game_start", "game_over"]
+        )
+        assert events[moves + 1] == {"event": "game_over", "winner": 1}
+    finally:
+        subscriber.close()
+        publisher.close()
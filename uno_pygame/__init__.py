@@ -1,3 +1,3 @@
-from .src import UnoObserverUI
+from .src import UnoObserverUI, GridObserverUI
 
-__all__ = ["UnoObserverUI"]
\ No newline at end of file
+__all__ = ["UnoObserverUI", "GridObserverUI"]
\ No newline at end of file
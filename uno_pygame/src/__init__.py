@@ -1,3 +1,4 @@
 from .pygame_ui import UnoObserverUI
+from .grid import GridObserverUI
 
-__all__ = ["UnoObserverUI"]
\ No newline at end of file
+__all__ = ["UnoObserverUI", "GridObserverUI"]
\ No newline at end of file
@@ -25,6 +25,88 @@ def _overlay_path_for_card_type(assets_root: Path, card_type: CardType) -> Path:
     # e.g., assets/three.png or assets/draw_two.png
     return assets_root / f"{card_type.name.lower()}.png"
 
+def _compose_face(assets_root: Path, color: Color, card_type: CardType, number_offset: Tuple[int, int]) -> pygame.Surface:
+    """ Base (color) with the overlay (number/special) on top, at full resolution """
+    base_path = _base_path_for_color(assets_root, color)
+    overlay = _load_image(_overlay_path_for_card_type(assets_root, card_type))
+
+    if base_path:
+        composed = _load_image(base_path).copy()
+        composed.blit(overlay, overlay.get_rect(topleft=number_offset))
+        return composed
+
+    # If it is a wild card (wild cards don't have color)
+    return overlay
+
+
+def _all_faces() -> list[Tuple[Color, CardType]]:
+    """ Every face a card can show: all types on each color, plus uncolored wilds """
+    faces = [(color, card_type) for color in Color if color != Color.WILD for card_type in CardType]
+    faces += [(Color.WILD, CardType.WILD), (Color.WILD, CardType.WILD_DRAW_FOUR)]
+    return faces
+
+
+class CardAtlas:
+    """
+    Every composed and scaled card face packed into a single surface. Faces are
+    handed out as subsurfaces (views into the atlas), so sprites share its pixels
+    and building a sprite does no image work.
+    """
+
+    def __init__(
+        self,
+        assets_root: Path,
+        scale: float,
+        number_offset: Tuple[int, int] = (0, 0),
+    ) -> None:
+        self.assets_root = assets_root
+        self.scale = scale
+
+        faces = _all_faces()
+        scaled: Dict[Tuple[Color, CardType], pygame.Surface] = {}
+        for color, card_type in faces:
+            composed = _compose_face(assets_root, color, card_type, number_offset)
+            if scale != 1.0:
+                w, h = composed.get_size()
+                composed = pygame.transform.smoothscale(composed, (int(w * scale), int(h * scale)))
+            scaled[(color, card_type)] = composed
+
+        # One row per color, one column per card type
+        cell_w = max(face.get_width() for face in scaled.values())
+        cell_h = max(face.get_height() for face in scaled.values())
+        columns = len(CardType)
+        rows = (len(faces) + columns - 1) // columns
+
+        self.surface: pygame.Surface = pygame.Surface((cell_w * columns, cell_h * rows), pygame.SRCALPHA).convert_alpha()
+        self.regions: Dict[Tuple[Color, CardType], pygame.Rect] = {}
+        self._faces: Dict[Tuple[Color, CardType], pygame.Surface] = {}
+
+        for i, key in enumerate(faces):
+            face = scaled[key]
+            rect = face.get_rect(topleft=((i % columns) * cell_w, (i // columns) * cell_h))
+            self.surface.blit(face, rect)
+            self.regions[key] = rect
+            self._faces[key] = self.surface.subsurface(rect)
+
+    def face(self, color: Color, card_type: CardType) -> pygame.Surface:
+        return self._faces[(color, card_type)]
+
+
+_ATLAS_CACHE: Dict[Tuple[Path, float, Tuple[int, int]], CardAtlas] = {}
+
+def get_atlas(assets_root: Path, scale: float, number_offset: Tuple[int, int] = (0, 0)) -> CardAtlas:
+    """ Built once per (assets_root, scale, offset); needs an initialized display """
+    key = (assets_root.resolve(), float(scale), tuple(number_offset))
+    if key not in _ATLAS_CACHE:
+        _ATLAS_CACHE[key] = CardAtlas(assets_root, scale, number_offset)
+    return _ATLAS_CACHE[key]
+
+def clear_atlas_cache() -> None:
+    """ Drop all atlases, e.g. after the display is recreated """
+    _ATLAS_CACHE.clear()
+    _IMAGE_CACHE.clear()
+
+
 class CardSprite(Sprite):
     def __init__(
         self,
@@ -37,30 +119,8 @@ class CardSprite(Sprite):
     ):
         super().__init__()
 
-        # Load base (color) and overlay (number/special) images
-        base_path = _base_path_for_color(assets_root, color)
-        overlay_path = _overlay_path_for_card_type(assets_root, card_type)
-
-        if base_path:
-            base = _load_image(base_path)
-            overlay = _load_image(overlay_path)
-
-            # Compose once at full resolution
-            composed = base.copy()
-            composed.blit(overlay, overlay.get_rect(topleft=number_offset))
-        
-        else: # If it is a wild card (wild cards don't have color)
-            overlay = _load_image(overlay_path)
-            composed = overlay.copy()
-
-        # Scale result
-        if scale != 1.0:
-            w, h = composed.get_size()
-            new_size = (int(w * scale), int(h * scale))
-            self.image: pygame.Surface = pygame.transform.smoothscale(composed, new_size)
-        else:
-            self.image = composed
-
+        # Composed and scaled once per atlas; this is a view into the atlas surface
+        self.image: pygame.Surface = get_atlas(assets_root, scale, number_offset).face(color, card_type)
         self.rect: pygame.Rect = self.image.get_rect(topleft=position)
 
     def draw(self, surface: pygame.Surface):
@@ -0,0 +1,286 @@
+# uno_pygame/src/grid.py
+"""
+Watch many games at once. The window is split into a grid of 4-16 tiles, each
+an UnoObserverUI drawing into its own offscreen surface at a card scale that
+fits the tile. Tiles of one grid share the card atlas, the rotated-card cache
+and the background/deck images, so adding tables costs drawing time, not memory.
+
+Tiles are fed either from recorded games (GameSaver files, cycled) or from a
+live training run (LiveGameFeed); an idle tile takes the next available game.
+
+Every frame only the tiles that changed are redrawn and presented. If frames
+take longer than the budget, hands are drawn more cheaply (smooth rotation ->
+fast rotation -> upright cards) and quality comes back once there is headroom.
+Small tiles start without smooth rotation since it is not visible at that size.
+"""
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Optional
+
+import pygame  # pygame-ce
+from uno import Game, GameSaver, RuleSet
+
+from .pygame_ui import UnoObserverUI, ASSETS_ROOT, CARD_SCALE
+
+if TYPE_CHECKING:
+    from uno import LiveGameFeed
+
+MIN_TILES = 4
+MAX_TILES = 16
+REFERENCE_SIZE = (1280, 720)   # screen size CARD_SCALE looks right at
+TILE_GAP = 2                   # px between tiles
+SMALL_TILE_WIDTH = 560         # narrower tiles skip smooth rotation from the start
+
+# Hand render quality, best first: (rotate, smooth)
+QUALITY_LEVELS = ((True, True), (True, False), (False, False))
+FRAME_BUDGET_MS = 12.0         # time allowed for updating + drawing all tiles per frame
+BUDGET_WINDOW = 30             # frames averaged before changing quality
+
+
+def grid_shape(n_tiles: int) -> tuple[int, int]:
+    """(columns, rows) for n tiles, as square as possible and wider than tall."""
+    cols = math.ceil(math.sqrt(n_tiles))
+    rows = math.ceil(n_tiles / cols)
+    return cols, rows
+
+
+class GridObserverUI:
+    def __init__(
+        self,
+        n_tiles: int = 4,
+        save_paths: Iterable[Path] = (),
+        live_feed: Optional["LiveGameFeed"] = None,
+        assets_root: Path = ASSETS_ROOT,
+        fullscreen: bool = True,
+        window_size: tuple[int, int] = (1600, 900),
+        move_interval_ms: int = 400,
+        hold_ms: int = 2000,
+        frame_budget_ms: float = FRAME_BUDGET_MS,
+        rules: Optional[RuleSet] = None,
+    ) -> None:
+        """
+        rules is the variant of the table a tile shows until its first game arrives
+        (the default rules if not given); every game is then shown under its own rules.
+        """
+        if not MIN_TILES <= n_tiles <= MAX_TILES:
+            raise ValueError(f"n_tiles must be between {MIN_TILES} and {MAX_TILES}, got {n_tiles}")
+
+        self.n_tiles = n_tiles
+        self.save_paths: deque[Path] = deque(Path(p) for p in save_paths)
+        self.live_feed = live_feed
+        self.assets_root = assets_root
+        self.fullscreen = fullscreen
+        self.initial_window_size = window_size
+        self.move_interval_ms = move_interval_ms
+        self.hold_ms = hold_ms  # How long a finished game stays up before the tile moves on
+        self.frame_budget_ms = frame_budget_ms
+        self.rules = rules
+
+        if self.live_feed is not None:
+            # Queue enough games that every idle tile can pick one up
+            self.live_feed.max_games = max(self.live_feed.max_games, n_tiles)
+
+        self.screen: Optional[pygame.Surface] = None
+        self.tiles: list[UnoObserverUI] = []
+        self.tile_rects: list[pygame.Rect] = []
+        self._tile_elapsed_ms: list[int] = []
+
+        # Frame budget state
+        self.base_quality = 0
+        self.quality = 0
+        self._frame_times: list[float] = []
+
+    # --- setup ---
+
+    def init_display(self) -> None:
+        flags = pygame.RESIZABLE | (pygame.FULLSCREEN if self.fullscreen else 0)
+        size = (0, 0) if self.fullscreen else self.initial_window_size
+        self.screen = pygame.display.set_mode(size, flags)
+        pygame.display.set_caption(f"UNO Observer - {self.n_tiles} tables")
+        self._layout_tiles()
+
+    def init_offscreen(self, size: tuple[int, int]) -> None:
+        """Render the grid into a plain surface (headless use, see UnoObserverUI.init_offscreen)."""
+        if pygame.display.get_surface() is None:
+            pygame.display.set_mode((1, 1))
+        self.screen = pygame.Surface(size).convert()
+        self._layout_tiles()
+
+    def _layout_tiles(self) -> None:
+        assert self.screen is not None
+        w, h = self.screen.get_size()
+        cols, rows = grid_shape(self.n_tiles)
+        tile_w = (w - TILE_GAP * (cols - 1)) // cols
+        tile_h = (h - TILE_GAP * (rows - 1)) // rows
+
+        self.tile_rects = [
+            pygame.Rect((i % cols) * (tile_w + TILE_GAP), (i // cols) * (tile_h + TILE_GAP), tile_w, tile_h)
+            for i in range(self.n_tiles)
+        ]
+
+        # All tiles share one card scale, so they share one atlas and one rotation cache
+        card_scale = CARD_SCALE * min(tile_w / REFERENCE_SIZE[0], tile_h / REFERENCE_SIZE[1])
+        self.base_quality = 0 if tile_w >= SMALL_TILE_WIDTH else 1
+        self.quality = max(self.quality, self.base_quality)
+        self._frame_times = []
+
+        if not self.tiles:
+            for _ in range(self.n_tiles):
+                game = Game(rules=self.rules)
+                game.start_game()
+                tile = UnoObserverUI(game, assets_root=self.assets_root, fullscreen=False)
+                tile.live_move_interval_ms = self.move_interval_ms
+                self.tiles.append(tile)
+            self._tile_elapsed_ms = [0] * self.n_tiles
+            needs_game = True
+        else:
+            needs_game = False
+
+        for tile, rect in zip(self.tiles, self.tile_rects):
+            tile.set_card_scale(card_scale)
+            tile.init_offscreen(rect.size)
+            tile.set_render_quality(*QUALITY_LEVELS[self.quality])
+
+        if needs_game:
+            for i in range(self.n_tiles):
+                self._next_game(i)
+
+        self.screen.fill((0, 0, 0))
+
+    # --- game sources ---
+
+    def _next_game(self, i: int) -> bool:
+        """Load the next recorded or live game into tile i. Returns False if none is available."""
+        tile = self.tiles[i]
+        self._tile_elapsed_ms[i] = 0
+
+        if self.live_feed is not None:
+            if not self.live_feed.games:
+                return False
+            tile.start_live_game(self.live_feed.games.popleft())
+            return True
+
+        for _ in range(len(self.save_paths)):
+            path = self.save_paths[0]
+            self.save_paths.rotate(-1)  # Cycle through the recordings forever
+            try:
+                loaded = GameSaver.load(path)
+            except (OSError, ValueError) as e:
+                print(f"[grid] Skipping {path}: {e}")
+                self.save_paths.remove(path)
+                continue
+            if loaded is None:
+                self.save_paths.remove(path)
+                continue
+            tile.start_replay(*loaded)
+            return True
+        return False
+
+    def _tile_finished(self, i: int) -> bool:
+        tile = self.tiles[i]
+        if self.live_feed is not None:
+            return tile.live_finished
+        return tile.move_index >= len(tile.moves)
+
+    def update(self, dt_ms: int) -> None:
+        """Advance every tile by one frame's worth of time."""
+        if self.live_feed is not None:
+            self.live_feed.poll()
+
+        for i, tile in enumerate(self.tiles):
+            if self._tile_finished(i):
+                self._tile_elapsed_ms[i] += dt_ms
+                # Live tiles switch as soon as another game is waiting; recordings after hold_ms
+                waiting = self.live_feed is not None and bool(self.live_feed.games)
+                if waiting or self._tile_elapsed_ms[i] >= self.hold_ms:
+                    self._next_game(i)
+                continue
+
+            if self.live_feed is not None:
+                tile.advance_live(dt_ms)
+                continue
+
+            self._tile_elapsed_ms[i] += dt_ms
+            if self._tile_elapsed_ms[i] >= self.move_interval_ms:
+                self._tile_elapsed_ms[i] = 0
+                tile.replay_to(tile.move_index)
+
+    # --- frame budget ---
+
+    def _record_frame_time(self, ms: float) -> None:
+        self._frame_times.append(ms)
+        if len(self._frame_times) < BUDGET_WINDOW:
+            return
+        average = sum(self._frame_times) / len(self._frame_times)
+        self._frame_times = []
+
+        if average > self.frame_budget_ms and self.quality < len(QUALITY_LEVELS) - 1:
+            self.set_quality(self.quality + 1)
+        elif average < self.frame_budget_ms / 2 and self.quality > self.base_quality:
+            self.set_quality(self.quality - 1)
+
+    def set_quality(self, level: int) -> None:
+        """Index into QUALITY_LEVELS; the next frame redraws every tile at that level."""
+        self.quality = level
+        for tile in self.tiles:
+            tile.set_render_quality(*QUALITY_LEVELS[level])
+
+    # --- draw & loop ---
+
+    def render(self) -> list[pygame.Rect]:
+        """Redraw changed tiles into the grid surface; returns the screen rects that changed."""
+        assert self.screen is not None
+        changed = []
+        for tile, rect in zip(self.tiles, self.tile_rects):
+            for dirty in tile.render_dirty():
+                assert tile.screen is not None
+                dest = dirty.move(rect.topleft)
+                self.screen.blit(tile.screen, dest, dirty)
+                changed.append(dest)
+        return changed
+
+    def step(self, dt_ms: int) -> list[pygame.Rect]:
+        """One frame: update all tiles and redraw what changed, keeping to the frame budget."""
+        start = time.perf_counter()
+        self.update(dt_ms)
+        changed = self.render()
+        self._record_frame_time((time.perf_counter() - start) * 1000.0)
+        return changed
+
+    def run(self) -> int:
+        pygame.init()
+        try:
+            clock = pygame.time.Clock()
+            self.init_display()
+            pygame.display.flip()
+
+            running = True
+            while running:
+                dt = clock.tick(60)
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        running = False
+                    elif event.type == pygame.KEYDOWN:
+                        if event.key == pygame.K_ESCAPE:
+                            running = False
+                        elif event.key == pygame.K_F11:
+                            self.fullscreen = not self.fullscreen
+                            self.init_display()
+                            pygame.display.flip()
+                    elif event.type == pygame.VIDEORESIZE:
+                        flags = pygame.RESIZABLE | (pygame.FULLSCREEN if self.fullscreen else 0)
+                        self.screen = pygame.display.set_mode(event.size, flags)
+                        self._layout_tiles()
+                        pygame.display.flip()
+
+                changed = self.step(dt)
+                if changed:
+                    pygame.display.update(changed)
+
+            return 0
+        finally:
+            pygame.quit()
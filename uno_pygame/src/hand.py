@@ -2,11 +2,29 @@
 from __future__ import annotations
 
 import math
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 
 import pygame
 from .card import CardSprite
 
+# Rotated card images shared by every Hand, keyed by (image, angle, smooth).
+# Bounded because each entry is a full RGBA surface; oldest entries are evicted first.
+ROTATION_CACHE_SIZE = 256
+_ROTATION_CACHE: Dict[Tuple[pygame.Surface, float, bool], pygame.Surface] = {}
+
+def rotated_image(image: pygame.Surface, angle: float, smooth: bool = True) -> pygame.Surface:
+    key = (image, round(angle, 2), smooth)
+    rotated = _ROTATION_CACHE.get(key)
+    if rotated is None:
+        if smooth:
+            rotated = pygame.transform.rotozoom(image, -angle, 1.0)
+        else:
+            rotated = pygame.transform.rotate(image, -angle)
+        if len(_ROTATION_CACHE) >= ROTATION_CACHE_SIZE:
+            del _ROTATION_CACHE[next(iter(_ROTATION_CACHE))]
+        _ROTATION_CACHE[key] = rotated
+    return rotated
+
 
 class Hand:
     """
@@ -32,6 +50,8 @@ class Hand:
         Pull outer cards inward (0..1). Higher => edges come in more.
     arc_power : float
         Curve exponent for vertical lift; <1 => stronger center lift.
+    rotate : bool
+        If False, cards are laid out along the fan but drawn upright (cheapest).
     """
 
     def __init__(
@@ -45,6 +65,7 @@ class Hand:
         scale_by_rotation: bool = True,
         edge_pull: float = 0.35,
         arc_power: float = 0.6,
+        rotate: bool = True,
     ) -> None:
         self.cards = cards
         self.center = center
@@ -55,6 +76,12 @@ class Hand:
         self.scale_by_rotation = bool(scale_by_rotation)
         self.edge_pull = float(edge_pull)
         self.arc_power = float(arc_power)
+        self.rotate = bool(rotate)
+
+        # Rotated surfaces + positions in draw order, valid while _cache_key matches
+        self._cache_key: Optional[tuple] = None
+        self._rendered: List[Tuple[pygame.Surface, Tuple[int, int]]] = []
+        self._bounds: Optional[pygame.Rect] = None
 
     # ---------- API ----------
 
@@ -64,11 +91,52 @@ class Hand:
     def set_center(self, center: Tuple[int, int]) -> None:
         self.center = center
 
+    def set_params(self, **params) -> None:
+        """ Update layout parameters (fan_angle_deg, spacing, ...) by name """
+        for name, value in params.items():
+            if not hasattr(self, name) or name.startswith("_"):
+                raise AttributeError(f"Hand has no parameter {name!r}")
+            setattr(self, name, value)
+
+    def state_key(self) -> tuple:
+        """ Everything the rendered hand depends on; equal keys mean identical output """
+        return (
+            tuple(card.image for card in self.cards),
+            tuple(self.center),
+            self.fan_angle_deg,
+            self.base_angle_deg,
+            self.spacing,
+            self.arc_height,
+            self.scale_by_rotation,
+            self.edge_pull,
+            self.arc_power,
+            self.rotate,
+        )
+
+    @property
+    def bounds(self) -> Optional[pygame.Rect]:
+        """ Screen area covered by the hand (None if empty) """
+        self._ensure_rendered()
+        return self._bounds
+
     def draw(self, surface: pygame.Surface, mouse_pos: Optional[Tuple[int, int]] = None) -> None:
         """
         Draw the hand. Does NOT modify CardSprites' images/rects; we render
-        rotated copies directly for this hand view.
+        rotated copies directly for this hand view. Layout and rotations are
+        cached until the cards or parameters change, so redrawing is blits only.
         """
+        self._ensure_rendered()
+        if self._rendered:
+            surface.blits(self._rendered, doreturn=False)
+
+    def _ensure_rendered(self) -> None:
+        key = self.state_key()
+        if key == self._cache_key:
+            return
+        self._cache_key = key
+        self._rendered = []
+        self._bounds = None
+
         if not self.cards:
             return
 
@@ -84,13 +152,14 @@ class Hand:
             cx, cy = positions[i]
             angle = angles[i] + self.base_angle_deg
 
-            if self.scale_by_rotation:
-                rotated = pygame.transform.rotozoom(card.image, -angle, 1.0)
+            if self.rotate:
+                rotated = rotated_image(card.image, angle, self.scale_by_rotation)
             else:
-                rotated = pygame.transform.rotate(card.image, -angle)
+                rotated = card.image
 
             rect = rotated.get_rect(center=(int(cx), int(cy)))
-            surface.blit(rotated, rect.topleft)
+            self._rendered.append((rotated, rect.topleft))
+            self._bounds = rect if self._bounds is None else self._bounds.union(rect)
 
     # ---------- Layout math ----------
 
@@ -0,0 +1,197 @@
+# uno_pygame/src/headless.py
+"""
+Render recorded games without a window, using the SDL dummy video driver.
+
+Each move of a saved game is replayed through UnoObserverUI and written either
+as numbered PNG frames or as a raw RGB24 stream (optionally piped into ffmpeg
+to get a video). Many games are rendered in parallel, one per worker process.
+
+    python -m uno_pygame.src.headless saved_games/*.yaml --out renders --format mp4
+"""
+from __future__ import annotations
+
+import os
+
+# Must be set before pygame initializes its display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import multiprocessing
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from typing import BinaryIO, Iterable, Optional
+
+import pygame  # pygame-ce
+from uno import Game, GameSaver, SavedMove
+
+from .pygame_ui import UnoObserverUI, ASSETS_ROOT
+
+FORMATS = ("png", "raw", "mp4")
+DEFAULT_SIZE = (1280, 720)
+DEFAULT_FPS = 4
+
+
+def iter_frames(
+    game: Game,
+    moves: list[SavedMove],
+    size: tuple[int, int] = DEFAULT_SIZE,
+    assets_root: Path = ASSETS_ROOT,
+    every: int = 1,
+) -> Iterable[pygame.Surface]:
+    """
+    Yield the rendered table before the first move and after every `every`-th move
+    (and always after the last). The same surface is reused for each frame.
+    """
+    pygame.init()
+    ui = UnoObserverUI(game, assets_root=assets_root, fullscreen=False)
+    ui.init_offscreen(size)
+    ui.moves = moves
+
+    yield ui.render()
+    for i in range(len(moves)):
+        ui.replay_to(i)
+        if (i + 1) % every == 0 or i == len(moves) - 1:
+            yield ui.render()
+
+
+def write_png_frames(frames: Iterable[pygame.Surface], out_dir: Path) -> int:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    count = 0
+    for count, frame in enumerate(frames, start=1):
+        pygame.image.save(frame, str(out_dir / f"frame_{count - 1:05d}.png"))
+    return count
+
+
+def write_raw_frames(frames: Iterable[pygame.Surface], stream: BinaryIO) -> int:
+    """Concatenated RGB24 frames, e.g. for `ffmpeg -f rawvideo -pix_fmt rgb24 -s WxH -i -`."""
+    count = 0
+    for count, frame in enumerate(frames, start=1):
+        stream.write(pygame.image.tobytes(frame, "RGB"))
+    return count
+
+
+def ffmpeg_command(size: tuple[int, int], fps: int, out_path: Path) -> list[str]:
+    w, h = size
+    return [
+        "ffmpeg", "-y", "-loglevel", "error",
+        "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{w}x{h}", "-r", str(fps), "-i", "-",
+        "-pix_fmt", "yuv420p", "-vcodec", "libx264", str(out_path),
+    ]
+
+
+def render_game(
+    save_path: Path,
+    out_root: Path,
+    fmt: str = "png",
+    size: tuple[int, int] = DEFAULT_SIZE,
+    every: int = 1,
+    fps: int = DEFAULT_FPS,
+    assets_root: Path = ASSETS_ROOT,
+) -> tuple[Path, int]:
+    """
+    Render one saved game. Output goes to out_root/<save name>/ for png, or
+    out_root/<save name>.rgb / .mp4. Returns (output path, frame count).
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}, expected one of {FORMATS}")
+
+    loaded = GameSaver.load(save_path)
+    if loaded is None:
+        raise ValueError(f"{save_path} has no deck to replay")
+    game, moves = loaded
+    frames = iter_frames(game, moves, size=size, assets_root=assets_root, every=every)
+
+    out_root.mkdir(parents=True, exist_ok=True)
+    if fmt == "png":
+        out_path = out_root / save_path.stem
+        return out_path, write_png_frames(frames, out_path)
+
+    if fmt == "raw":
+        out_path = out_root / f"{save_path.stem}.rgb"
+        with open(out_path, "wb") as f:
+            return out_path, write_raw_frames(frames, f)
+
+    if shutil.which("ffmpeg") is None:
+        raise RuntimeError("mp4 output needs ffmpeg on PATH; use --format raw or png instead")
+    out_path = out_root / f"{save_path.stem}.mp4"
+    proc = subprocess.Popen(ffmpeg_command(size, fps, out_path), stdin=subprocess.PIPE)
+    assert proc.stdin is not None
+    try:
+        count = write_raw_frames(frames, proc.stdin)
+    finally:
+        proc.stdin.close()
+        if proc.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed while writing {out_path}")
+    return out_path, count
+
+
+def _render_game_job(args: tuple) -> tuple[Path, int]:
+    save_path, out_root, kwargs = args
+    return render_game(save_path, out_root, **kwargs)
+
+
+def render_games(
+    save_paths: Iterable[Path],
+    out_root: Path,
+    processes: Optional[int] = None,
+    **kwargs,
+) -> list[tuple[Path, int]]:
+    """Render many saved games in parallel, one game per task. kwargs go to render_game."""
+    jobs = [(Path(p), out_root, kwargs) for p in save_paths]
+    if not jobs:
+        return []
+    if processes == 1 or len(jobs) == 1:
+        return [_render_game_job(job) for job in jobs]
+
+    with multiprocessing.get_context("spawn").Pool(processes) as pool:
+        return list(pool.imap_unordered(_render_game_job, jobs))
+
+
+class HighlightRenderer:
+    """
+    Renders saved games on a background process pool while training continues.
+    submit() never blocks on rendering; close() waits for everything submitted.
+    """
+
+    def __init__(self, out_root: Path, processes: int = 1, **kwargs) -> None:
+        self.out_root = out_root
+        self.kwargs = kwargs
+        self._pool = multiprocessing.get_context("spawn").Pool(processes)
+        self._pending = []
+
+    def submit(self, save_path: Path) -> None:
+        self._pending.append(
+            self._pool.apply_async(_render_game_job, ((Path(save_path), self.out_root, self.kwargs),))
+        )
+
+    def close(self) -> list[tuple[Path, int]]:
+        self._pool.close()
+        self._pool.join()
+        return [r.get() for r in self._pending]
+
+
+def main(argv: list[str]) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Render saved UNO games to frames or video without a window.")
+    parser.add_argument("saves", nargs="+", type=Path, help="saved game .yaml files")
+    parser.add_argument("--out", type=Path, default=Path("renders"))
+    parser.add_argument("--format", choices=FORMATS, default="png")
+    parser.add_argument("--size", type=int, nargs=2, default=DEFAULT_SIZE, metavar=("W", "H"))
+    parser.add_argument("--every", type=int, default=1, help="render every n-th move")
+    parser.add_argument("--fps", type=int, default=DEFAULT_FPS, help="frame rate for mp4 output")
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    results = render_games(
+        args.saves, args.out, processes=args.processes,
+        fmt=args.format, size=tuple(args.size), every=args.every, fps=args.fps,
+    )
+    for out_path, count in results:
+        print(f"[render] {out_path}: {count} frames")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,20 +1,31 @@
 # pygame_things/pygame_ui.py
+import math
 import pygame  # pygame-ce
 from pathlib import Path
 from typing import TYPE_CHECKING, TypedDict, Optional
 
-from .card import CardSprite
+from .card import CardSprite, get_atlas
 from .hand import Hand
-from uno import Game
+from uno import Game, SavedMove, play_saved_move
 
 if TYPE_CHECKING:
     # Ensure uno/__init__.py exports Card; otherwise: from uno.card import Card
-    from uno import Card
+    from uno import Card, LiveGameFeed
 
-ASSETS_ROOT = Path("uno_pygame/assets")
+ASSETS_ROOT = Path(__file__).resolve().parent.parent / "assets"  # independent of the working directory
 CARD_SCALE = 0.8          # card scaling for hands and last-played card
 DECK_SCALE = CARD_SCALE   # deck image scale; keep in sync with cards for visual parity
 
+_IMAGE_CACHE: dict[tuple[Path, bool], pygame.Surface] = {}
+
+def load_image(path: Path, alpha: bool = False) -> pygame.Surface:
+    """Load and convert an image once; shared by every observer (e.g. grid tiles)."""
+    key = (path, alpha)
+    if key not in _IMAGE_CACHE:
+        image = pygame.image.load(str(path))
+        _IMAGE_CACHE[key] = image.convert_alpha() if alpha else image.convert()
+    return _IMAGE_CACHE[key]
+
 # ---------- spacing helpers ----------
 
 def spacing_for_count(
@@ -48,7 +59,7 @@ class HandParams(TypedDict):
     arc_height: float
 
 
-def cards_to_faceup_sprites(cards: list["Card"], assets_root: Path) -> list[CardSprite]:
+def cards_to_faceup_sprites(cards: list["Card"], assets_root: Path, scale: float = CARD_SCALE) -> list[CardSprite]:
     """Convert uno.Game cards -> list of face-up CardSprites."""
     sprites: list[CardSprite] = []
     for c in cards:
@@ -59,14 +70,45 @@ def cards_to_faceup_sprites(cards: list["Card"], assets_root: Path) -> list[Card
                 position=(0, 0),
                 number_offset=(0, 0),
                 assets_root=assets_root,
-                scale=CARD_SCALE,
+                scale=scale,
             )
         )
     return sprites
 
 
-def layout_hands(screen: pygame.Surface, hands_cards: list[list[CardSprite]]) -> tuple[Hand, ...]:
-    """Build Hand objects for up to 4 players in order: bottom, left, top, right."""
+def seat_positions(
+    n_seats: int, w: int, h: int, edge_x: int, edge_y: int,
+) -> list[tuple[tuple[int, int], float]]:
+    """
+    (center, base angle) of each seat, spread evenly around an ellipse in turn order
+    starting at the bottom: bottom, left, top, right for 4 players. Seats sit
+    edge_x / edge_y in from the screen edges at the left/right and top/bottom.
+    """
+    rx, ry = w / 2 - edge_x, h / 2 - edge_y
+    seats = []
+    for i in range(n_seats):
+        angle = 360.0 * i / n_seats
+        if angle > 180.0:
+            angle -= 360.0  # Keep right-hand seats negative, as Hand expects (-90 = right)
+        rad = math.radians(angle)
+        center = (round(w / 2 - rx * math.sin(rad)), round(h / 2 + ry * math.cos(rad)))
+        seats.append((center, angle))
+    return seats
+
+
+def layout_hands(
+    screen: pygame.Surface,
+    hands_cards: list[list[CardSprite]],
+    existing: tuple[Hand, ...] = (),
+    scale: float = 1.0,
+) -> tuple[Hand, ...]:
+    """
+    Build Hand objects for any number of players, seated around the table in
+    turn order (see seat_positions); 4 players sit bottom, left, top, right.
+    If `existing` has one Hand per player they are updated in place instead,
+    so hands whose cards and layout did not change keep their render cache.
+    `scale` shrinks the pixel margins/spacing along with the cards (e.g. for grid tiles).
+    """
     w, h = screen.get_width(), screen.get_height()
 
     # Use first available card to read width (guards against empty hands)
@@ -78,23 +120,34 @@ def layout_hands(screen: pygame.Surface, hands_cards: list[list[CardSprite]]) ->
     if card_width is None:
         card_width = 100  # fallback
 
+    edge_y, edge_x = int(130 * scale), int(140 * scale)
+    seats = seat_positions(len(hands_cards), w, h, edge_x, edge_y)
+    centers = [center for center, _ in seats]
+    # More than 4 seats share the table's edge, so each hand gets a narrower span
+    span = int(w * min(1.0, 4 / max(len(hands_cards), 1)))
+
     def hand_params(idx: int, n_cards: int) -> HandParams:
-        base_angle = (0, 90, 180, -90)[idx]
+        base_angle = seats[idx][1]
         # Wider default fan for better visibility; scales with count
         fan = float(min(120.0, 90.0 + max(0, n_cards - 5) * 4.0))
+        horizontal = abs(math.cos(math.radians(base_angle))) >= abs(math.sin(math.radians(base_angle)))
         return {
             "fan_angle_deg": fan,
             "base_angle_deg": float(base_angle),
-            "spacing": spacing_for_count(n_cards, card_width, w),
-            "arc_height": 30.0 if base_angle in (0, 180) else 24.0,
+            "spacing": spacing_for_count(
+                n_cards, card_width, span,
+                min_spacing=int(80 * scale), max_spacing=int(156 * scale),
+                margin_px=None if scale == 1.0 else int(max(24, w // 40) * scale),
+            ),
+            "arc_height": (30.0 if horizontal else 24.0) * scale,
         }
 
-    centers = [
-        (w // 2, h - 130),   # bottom
-        (140,     h // 2),   # left
-        (w // 2,  130),      # top
-        (w - 140, h // 2),   # right
-    ]
+    if len(existing) == len(hands_cards):
+        for i, (hand, sprites) in enumerate(zip(existing, hands_cards)):
+            hand.set_cards(sprites)
+            hand.set_center(centers[i])
+            hand.set_params(**hand_params(i, len(sprites)))
+        return existing
 
     hands = [
         Hand(
@@ -124,12 +177,20 @@ class UnoObserverUI:
         assets_root: Path = ASSETS_ROOT,
         fullscreen: bool = True,
         window_size: tuple[int, int] = (1080, 720),
+        card_scale: float = CARD_SCALE,
     ) -> None:
         self.game = game
         self.assets_root = assets_root
         self.fullscreen = fullscreen
         self.initial_window_size = window_size
 
+        # Cards (and the deck) are drawn at card_scale; margins shrink with it
+        self.set_card_scale(card_scale)
+
+        # Render quality for hands, lowered by the grid observer when over its frame budget
+        self.rotate_cards: bool = True
+        self.smooth_rotation: bool = True
+
         self.screen: Optional[pygame.Surface] = None
 
         # Background
@@ -148,9 +209,19 @@ class UnoObserverUI:
         # Hands
         self.hands: tuple[Hand, ...] = tuple()
 
-        self.moves: list[int | None] = []
+        self.moves: list[SavedMove] = []
         self.move_index: int = 0
 
+        # Only changed areas are redrawn; see mark_dirty/draw_dirty
+        self._full_redraw: bool = True
+        self._dirty_rects: list[pygame.Rect] = []
+
+        # Live spectating (see attach_live)
+        self.live_feed: Optional["LiveGameFeed"] = None
+        self.live_move_interval_ms: int = 150
+        self._live_game: Optional[dict] = None
+        self._live_elapsed_ms: int = 0
+
     # --- setup & rebuild ---
 
     def init_display(self) -> None:
@@ -158,24 +229,43 @@ class UnoObserverUI:
         size = (0, 0) if self.fullscreen else self.initial_window_size
         self.screen = pygame.display.set_mode(size, flags)
         pygame.display.set_caption("UNO Observer (pygame-ce)")
+        self._load_assets()
+
+    def init_offscreen(self, size: tuple[int, int]) -> None:
+        """
+        Render into a plain surface instead of a window (for headless use with the
+        SDL dummy video driver). A 1x1 display is still needed so images can be converted.
+        """
+        if pygame.display.get_surface() is None:
+            pygame.display.set_mode((1, 1))
+        self.screen = pygame.Surface(size).convert()
+        self._load_assets()
+
+    def _load_assets(self) -> None:
+        assert self.screen is not None
 
         # Background
-        self.background_src = pygame.image.load(str(self.assets_root / "background.png")).convert()
+        self.background_src = load_image(self.assets_root / "background.png")
         self.background = pygame.transform.smoothscale(self.background_src, self.screen.get_size())
 
         # Deck
-        self.deck_src = pygame.image.load(str(self.assets_root / "deck.png")).convert_alpha()
+        self.deck_src = load_image(self.assets_root / "deck.png", alpha=True)
         self._build_deck_image_and_layout()
 
+        # Compose every card face once up front; sprites are views into this atlas
+        get_atlas(self.assets_root, self.card_scale)
+
         # Build hands and last-played from game state
         self.refresh_hands()
         self.refresh_last_played()
+        self.mark_dirty()
 
     def _build_deck_image_and_layout(self) -> None:
         """Scale the deck to DECK_SCALE and position it slightly left of center."""
         assert self.screen is not None and self.deck_src is not None
         w0, h0 = self.deck_src.get_size()
-        new_size = (int(w0 * DECK_SCALE), int(h0 * DECK_SCALE))
+        deck_scale = DECK_SCALE * self.layout_scale
+        new_size = (int(w0 * deck_scale), int(h0 * deck_scale))
         self.deck_image = pygame.transform.smoothscale(self.deck_src, new_size)
 
         sw, sh = self.screen.get_size()
@@ -196,9 +286,28 @@ class UnoObserverUI:
         hands_cards: list[list[CardSprite]] = []
         for player in players:
             player_cards = list(self.game.get_cards(player))
-            sprites = cards_to_faceup_sprites(player_cards, self.assets_root)
+            sprites = cards_to_faceup_sprites(player_cards, self.assets_root, self.card_scale)
             hands_cards.append(sprites)
-        self.hands = layout_hands(self.screen, hands_cards)
+        self.hands = layout_hands(self.screen, hands_cards, self.hands, self.layout_scale)
+        self._apply_render_quality()
+
+    def set_card_scale(self, card_scale: float) -> None:
+        """Takes effect at the next init_display/init_offscreen."""
+        self.card_scale = card_scale
+        self.layout_scale = card_scale / CARD_SCALE
+
+    def set_render_quality(self, rotate: bool, smooth: bool = True) -> None:
+        """Trade looks for speed: smooth rotation > plain rotation > no rotation."""
+        if (rotate, smooth) == (self.rotate_cards, self.smooth_rotation):
+            return
+        self.rotate_cards = rotate
+        self.smooth_rotation = smooth
+        self._apply_render_quality()
+        self.mark_dirty()
+
+    def _apply_render_quality(self) -> None:
+        for hand in self.hands:
+            hand.set_params(rotate=self.rotate_cards, scale_by_rotation=self.smooth_rotation)
 
     def refresh_last_played(self) -> None:
         """Build/replace the last-played CardSprite from game state and position it."""
@@ -211,7 +320,7 @@ class UnoObserverUI:
                 position=(0, 0),
                 number_offset=(0, 0),
                 assets_root=self.assets_root,
-                scale=CARD_SCALE,
+                scale=self.card_scale,
             )
         else:
             self.last_sprite = None
@@ -249,7 +358,8 @@ class UnoObserverUI:
             self._build_deck_image_and_layout()
 
         # Re-layout hands using existing sprite objects
-        self.hands = layout_hands(self.screen, [h.cards for h in self.hands])
+        self.hands = layout_hands(self.screen, [h.cards for h in self.hands], self.hands, self.layout_scale)
+        self.mark_dirty()
 
     def toggle_fullscreen(self) -> None:
         self.fullscreen = not self.fullscreen
@@ -260,24 +370,145 @@ class UnoObserverUI:
         if index > len(self.moves):
             return # all moves used
 
-        move = self.moves[index]
-        player = self.game.players[self.game.whos_turn]
+        play_saved_move(self.game, self.moves[index])
 
-        card_to_play = player.cards[move] if move is not None else None
+        self.move_index = index + 1
 
-        if card_to_play is None:
-            self.game.play(None)  # Draw
-        else:
-            self.game.play(card_to_play, replay=True)
+        self.refresh_from_game()
 
-        self.move_index = index + 1
+    def refresh_from_game(self) -> None:
+        """Rebuild hands and last-played from the game and mark only the changed areas dirty."""
+        before = [(hand.state_key(), hand.bounds) for hand in self.hands]
+        last_before = self.last_rect.copy() if self.last_rect else None
 
         self.refresh_hands()
         self.refresh_last_played()
 
+        if len(before) != len(self.hands):
+            self.mark_dirty()
+            return
+
+        # A None area here means nothing was drawn (empty hand, no card yet),
+        # not "redraw everything", so it is skipped rather than passed on
+        changed = [last_before, self.last_rect]
+        for hand, (key, old_bounds) in zip(self.hands, before):
+            if hand.state_key() != key:
+                changed += [old_bounds, hand.bounds]
+        for rect in changed:
+            if rect is not None:
+                self.mark_dirty(rect)
+
+    # --- live spectating ---
+
+    def attach_live(self, feed: "LiveGameFeed", move_interval_ms: int = 150) -> None:
+        """Follow games published by a training process, animating one move per interval."""
+        self.live_feed = feed
+        self.live_move_interval_ms = move_interval_ms
+
+    def update_live(self, dt_ms: int) -> None:
+        assert self.live_feed is not None
+        self.live_feed.poll()
+
+        if self.live_finished and self.live_feed.games:
+            self.start_live_game(self.live_feed.games.popleft())
+            return
+        self.advance_live(dt_ms)
+
+    @property
+    def live_finished(self) -> bool:
+        """True when there is no live game or every move of a finished one has been shown."""
+        return self._live_game is None or (self._live_game["over"] and not self._live_game["moves"])
+
+    def advance_live(self, dt_ms: int) -> None:
+        """Play the next received move of the current live game once the move interval has passed."""
+        if self._live_game is None:
+            return
+
+        self._live_elapsed_ms += dt_ms
+        moves = self._live_game["moves"]
+        if moves and self._live_elapsed_ms >= self.live_move_interval_ms:
+            self._live_elapsed_ms = 0
+            move, color = moves.popleft()
+            player = self.game.players[self.game.whos_turn]
+            if move is None:
+                self.game.play(None)  # Draw
+            elif color is not None:
+                self.game.play(player.cards[move], color_input=color)
+            else:
+                self.game.play(player.cards[move], replay=True)
+            self.refresh_from_game()
+
+    def start_live_game(self, live_game: dict) -> None:
+        from uno import RuleSet, new_game_from_deck
+
+        self._live_game = live_game
+        self._live_elapsed_ms = 0
+        rules = RuleSet.from_dict(live_game.get("rules"))
+        self.start_replay(new_game_from_deck(live_game["deck"], live_game["player_count"], rules), [])
+
+    def start_replay(self, game: Game, moves: list[SavedMove]) -> None:
+        """Swap in another game at its starting position (e.g. from GameSaver.load)."""
+        self.game = game
+        self.moves = moves
+        self.move_index = 0
+        self.refresh_hands()
+        self.refresh_last_played()
+        self.mark_dirty()
+
     # --- draw & loop ---
 
+    def mark_dirty(self, rect: Optional[pygame.Rect] = None) -> None:
+        """Queue an area for redraw; with no rect the whole screen is redrawn."""
+        if rect is None:
+            self._full_redraw = True
+        elif rect.width and rect.height:
+            self._dirty_rects.append(rect.copy())
+
+    def draw_dirty(self) -> None:
+        """Redraw and present only what changed since the last frame (nothing when idle)."""
+        if self._full_redraw:
+            self.draw()
+            return
+        rects = self.render_dirty()
+        if rects:
+            pygame.display.update(rects)
+
+    def render_dirty(self) -> list[pygame.Rect]:
+        """Redraw what changed into the screen surface without presenting; returns the updated rects."""
+        assert self.screen is not None
+        screen_rect = self.screen.get_rect()
+        if self._full_redraw:
+            self.render()
+            return [screen_rect]
+        if not self._dirty_rects:
+            return []
+
+        rects = [r.clip(screen_rect) for r in self._dirty_rects]
+        for rect in rects:
+            # Everything is re-blitted clipped to the rect, so overlaps stay correctly layered
+            self.screen.set_clip(rect)
+            self._draw_scene()
+        self.screen.set_clip(None)
+
+        self._dirty_rects = []
+        return rects
+
     def draw(self) -> None:
+        """Redraw and present the whole screen."""
+        self._draw_scene()
+        pygame.display.flip()
+        self._full_redraw = False
+        self._dirty_rects = []
+
+    def render(self) -> pygame.Surface:
+        """Draw the current state to the screen surface without presenting it."""
+        self._draw_scene()
+        self._full_redraw = False
+        self._dirty_rects = []
+        assert self.screen is not None
+        return self.screen
+
+    def _draw_scene(self) -> None:
         assert self.screen is not None and self.background is not None
         self.screen.blit(self.background, (0, 0))
 
@@ -293,8 +524,6 @@ class UnoObserverUI:
         for hand in self.hands:
             hand.draw(self.screen)
 
-        pygame.display.flip()
-
     def run(self) -> int:
         pygame.init()
         try:
@@ -304,6 +533,8 @@ class UnoObserverUI:
             running = True
             while running:
                 _dt = clock.tick(60)
+                if self.live_feed is not None:
+                    self.update_live(_dt)
                 for event in pygame.event.get():
                     if event.type == pygame.QUIT:
                         running = False
@@ -319,8 +550,8 @@ class UnoObserverUI:
                         self.handle_resize(event.size)
 
                 # If the Game state changes elsewhere, you can call:
-                # self.refresh_last_played(); self.refresh_hands()
-                self.draw()
+                # self.refresh_from_game()
+                self.draw_dirty()
 
             return 0
         finally:
@@ -0,0 +1,48 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import pytest
+
+from uno import Game, RuleSet
+from uno_pygame.src.pygame_ui import ASSETS_ROOT, cards_to_faceup_sprites, layout_hands, seat_positions
+
+SIZE = (1280, 720)
+
+@pytest.fixture(scope="module")
+def screen():
+    pygame.init()
+    pygame.display.set_mode((1, 1))  # Needed to convert the card images
+    yield pygame.Surface(SIZE)
+    pygame.quit()
+
+def test_four_seats_keep_their_places():
+    w, h = SIZE
+    seats = seat_positions(4, w, h, 140, 130)
+    assert [center for center, _ in seats] == [(w // 2, h - 130), (140, h // 2), (w // 2, 130), (w - 140, h // 2)]
+    assert [angle for _, angle in seats] == [0, 90, 180, -90]
+
+@pytest.mark.parametrize("player_count", [2, 3, 5, 6, 10])
+def test_seats_spread_evenly(player_count):
+    w, h = SIZE
+    seats = seat_positions(player_count, w, h, 140, 130)
+    centers = [center for center, _ in seats]
+    assert len(set(centers)) == player_count
+    assert all(140 <= x <= w - 140 and 130 <= y <= h - 130 for x, y in centers)
+    steps = {round((b - a) % 360, 6) for (_, a), (_, b) in zip(seats, seats[1:] + seats[:1])}
+    assert steps == {round(360 / player_count, 6)}
+
+@pytest.mark.parametrize("player_count", [5, 6])
+def test_layout_hands_seats_every_player(screen, player_count):
+    game = Game(rules=RuleSet(player_count=player_count))
+    game.start_game()
+    hands_cards = [cards_to_faceup_sprites(player.cards, ASSETS_ROOT) for player in game.players]
+
+    hands = layout_hands(screen, hands_cards)
+    assert len(hands) == player_count
+    assert len({hand.center for hand in hands}) == player_count
+    assert all(hand.bounds is not None for hand in hands)
+
+    # Relaying out the same players updates the hands in place
+    assert layout_hands(screen, hands_cards, hands) is hands